@@ -0,0 +1,80 @@
+"""Measure build time, size on disk, load time and query latency of the local BM25 index.
+
+Usage (from data_engineering_pipeline/):
+    python -m benchmarks.bench_bm25 [--docs 5000] [--from-snapshot data/snapshots/corpus.arrow]
+
+Without a snapshot, a synthetic corpus with a Zipf vocabulary and post-sized texts
+is generated. Queries are two to four words sampled from the same vocabulary.
+"""
+import argparse
+import os
+import tempfile
+import time
+import numpy as np
+from src.search.bm25_index import BM25Index, documents_from_snapshot
+
+
+def synthetic_documents(n_docs: int, words_per_doc: int, vocabulary_size: int, rng):
+    vocabulary = np.array([f"w{i}" for i in range(vocabulary_size)])
+    popularity = 1.0 / np.arange(1, vocabulary_size + 1)
+    popularity /= popularity.sum()
+    for i in range(n_docs):
+        words = vocabulary[rng.choice(vocabulary_size, size=words_per_doc, p=popularity)]
+        yield {
+            "url": f"https://example.org/blog/post-{i}/",
+            "title": " ".join(words[:8]),
+            "combined_text": " ".join(words),
+            "blog_tags": [" ".join(words[j:j + 2]) for j in range(0, 6, 2)],
+        }
+
+
+def directory_size(path: str) -> int:
+    return sum(os.path.getsize(os.path.join(path, name)) for name in os.listdir(path))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--docs", type=int, default=5000)
+    parser.add_argument("--words", type=int, default=800)
+    parser.add_argument("--vocabulary", type=int, default=30000)
+    parser.add_argument("--queries", type=int, default=500)
+    parser.add_argument("--from-snapshot", metavar="PATH", help="index a real corpus snapshot instead")
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    if args.from_snapshot:
+        documents = list(documents_from_snapshot(args.from_snapshot))
+    else:
+        documents = list(synthetic_documents(args.docs, args.words, args.vocabulary, rng))
+
+    start = time.perf_counter()
+    index = BM25Index.build(documents)
+    build_time = time.perf_counter() - start
+
+    with tempfile.TemporaryDirectory() as tmp:
+        index.save(tmp)
+        size = directory_size(tmp)
+        start = time.perf_counter()
+        loaded = BM25Index.load(tmp)
+        load_time = time.perf_counter() - start
+
+        terms = loaded.vocabulary
+        weights = 1.0 / np.arange(1, len(terms) + 1)
+        weights /= weights.sum()
+        queries = [" ".join(terms[t] for t in rng.choice(len(terms), size=rng.integers(2, 5), p=weights))
+                   for _ in range(args.queries)]
+        latencies = []
+        for query in queries:
+            start = time.perf_counter()
+            loaded.search(query, 5)
+            latencies.append(time.perf_counter() - start)
+        latencies = np.array(latencies) * 1000
+
+    print(f"{len(documents)} documents, {len(index.vocabulary)} terms")
+    print(f"build {build_time:.2f} s   size on disk {size / 2 ** 20:.1f} MiB   load (mmap) {load_time * 1000:.1f} ms")
+    print(f"query latency over {len(queries)} queries: p50 {np.percentile(latencies, 50):.2f} ms"
+          f"  p95 {np.percentile(latencies, 95):.2f} ms  max {latencies.max():.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
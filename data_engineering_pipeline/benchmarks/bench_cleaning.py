@@ -0,0 +1,70 @@
+"""Benchmark the compiled paragraph cleaner against the original per-paragraph loops.
+
+Usage (from data_engineering_pipeline/):
+    python -m benchmarks.bench_cleaning [--paragraphs 200000] [--repeat 3]
+"""
+import argparse
+import random
+import timeit
+from typing import List
+from src.config import REPLACEMENTS, EXCLUDE_STARTSWITH
+from src.utils.cleaning import ParagraphCleaner
+
+WORDS = ("salt sodium blood pressure heart kidney diet plant potassium study trial the of and in "
+         "to a that for is with as were was on by than risk intake").split()
+SPECIAL_WORDS = ["\u201cheart\u201d", "plant\u2019s", "diet\u2014and", "study\u2026", "blood\u00a0pressure"]
+
+
+def legacy_clean(paragraphs: List[str], prefixes: List[str]) -> List[str]:
+    """The original replace_strange_chars + any(startswith) implementation."""
+    cleaned = []
+    for para in paragraphs:
+        text = para.strip()
+        for old, new in REPLACEMENTS.items():
+            text = text.replace(old, new)
+        if text and not any(text.startswith(prefix) for prefix in prefixes):
+            cleaned.append(text)
+    return cleaned
+
+
+def synthetic_corpus(n: int, seed: int = 0) -> List[str]:
+    rng = random.Random(seed)
+    paragraphs = []
+    for _ in range(n):
+        if rng.random() < 0.1:
+            paragraphs.append(rng.choice(EXCLUDE_STARTSWITH) + " the rest of the footer")
+        else:
+            words = [rng.choice(WORDS) for _ in range(rng.randint(20, 80))]
+            words[rng.randrange(len(words))] = rng.choice(SPECIAL_WORDS)
+            paragraphs.append("  " + " ".join(words) + "\u00a0")
+    return paragraphs
+
+
+def learned_like_prefixes(n: int, seed: int = 1) -> List[str]:
+    """Stands in for rules learned from the corpus: multi-word footer/boilerplate openings."""
+    rng = random.Random(seed)
+    return [" ".join(rng.choice(WORDS).capitalize() for _ in range(4)) for _ in range(n)]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--paragraphs", type=int, default=200000)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--learned", type=int, default=200, help="number of extra learned-style prefixes")
+    args = parser.parse_args()
+
+    corpus = synthetic_corpus(args.paragraphs)
+    print(f"{args.paragraphs} paragraphs")
+    for label, prefixes in [("static rules", EXCLUDE_STARTSWITH),
+                            (f"static + {args.learned} learned", EXCLUDE_STARTSWITH + learned_like_prefixes(args.learned))]:
+        cleaner = ParagraphCleaner(prefixes)
+        assert cleaner.clean(corpus) == legacy_clean(corpus, prefixes), "compiled cleaner output differs from legacy"
+        legacy = min(timeit.repeat(lambda: legacy_clean(corpus, prefixes), number=1, repeat=args.repeat))
+        compiled = min(timeit.repeat(lambda: cleaner.clean(corpus), number=1, repeat=args.repeat))
+        print(f"[{label}] legacy: {legacy:.3f}s ({args.paragraphs / legacy:,.0f} paragraphs/s), "
+              f"compiled: {compiled:.3f}s ({args.paragraphs / compiled:,.0f} paragraphs/s), "
+              f"speedup: {legacy / compiled:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
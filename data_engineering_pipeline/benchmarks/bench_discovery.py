@@ -0,0 +1,46 @@
+"""Benchmark sitemap discovery against pagination crawling on a local fixture site.
+
+Usage (from data_engineering_pipeline/):
+    python -m benchmarks.bench_discovery [--posts 2000] [--per-page 10] [--latency 0.02]
+
+Both modes use the production Fetcher (adaptive pacing included); the fixture adds
+`--latency` seconds to every response to stand in for the network.
+"""
+import argparse
+import logging
+import time
+from src.scraper.rate_limiter import Fetcher
+from src.scraper.sitemap import extract_sitemap_urls
+from src.scraper.url_extractor import extract_all_urls
+from src.testing.stub_site import StubSite
+
+
+def run(label, discover, site):
+    site.hits.clear()
+    start = time.perf_counter()
+    urls = discover()
+    elapsed = time.perf_counter() - start
+    requests_made = sum(site.hits.values())
+    print(f"{label:<10} {len(urls):>6} posts  {requests_made:>5} requests  {elapsed:7.2f}s")
+    return set(urls)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--posts", type=int, default=2000)
+    parser.add_argument("--per-page", type=int, default=10)
+    parser.add_argument("--latency", type=float, default=0.02)
+    args = parser.parse_args()
+    logging.getLogger().setLevel(logging.WARNING)
+
+    site = StubSite(n_posts=args.posts, posts_per_page=args.per_page, sitemap=True, latency=args.latency).start()
+    try:
+        from_sitemap = run("sitemap", lambda: extract_sitemap_urls(root=site.root, fetcher=Fetcher()), site)
+        from_pages = run("pagination", lambda: extract_all_urls(root=site.root, fetcher=Fetcher()), site)
+        assert from_sitemap == from_pages, "sitemap and pagination discovered different posts"
+    finally:
+        site.stop()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,102 @@
+"""Compare the PyTorch and ONNX (fp32 and int8) embedding backends on CPU.
+
+Usage (from data_engineering_pipeline/):
+    python -m src.search.embedding                     # export once
+    python -m benchmarks.bench_embedding [--from-snapshot data/snapshots/corpus.arrow]
+
+Reports passage throughput (vectors/s), single-query latency, and the cosine
+similarity of each ONNX variant to the PyTorch embeddings. Exits with status 1 if
+the lowest similarity of the int8 model falls below ONNX_MIN_COSINE.
+"""
+import argparse
+import sys
+import time
+import numpy as np
+from src.config import EMBEDDING_BATCH_SIZE, EMBEDDING_MODEL_NAME, ONNX_MIN_COSINE, ONNX_MODEL_DIR
+from src.search.embedding import OnnxEncoder
+
+QUERIES = [
+    "healthier salt substitutes",
+    "does sugar cause diabetes",
+    "plant based protein sources",
+    "how much fiber per day",
+    "blood pressure and sodium intake",
+    "is coffee good for the heart",
+    "vitamin B12 for vegans",
+    "best foods for gut bacteria",
+]
+
+PASSAGE = ("Reducing sodium intake lowers blood pressure, and potassium-rich foods such as beans, "
+           "greens and fruit help the body get rid of excess salt. ")
+
+
+def passages(args) -> list:
+    if args.from_snapshot:
+        from src.db.snapshot import read_snapshot
+        texts = read_snapshot(args.from_snapshot)["combined_text"].to_pylist()
+        return texts[:args.passages]
+    rng = np.random.default_rng(0)
+    return [PASSAGE * int(n) for n in rng.integers(1, 12, size=args.passages)]
+
+
+def throughput(encoder, texts, batch_size: int) -> float:
+    encoder.encode(texts[:batch_size], batch_size=batch_size)  # warm-up
+    start = time.perf_counter()
+    encoder.encode(texts, batch_size=batch_size)
+    return len(texts) / (time.perf_counter() - start)
+
+
+def query_latency(encoder, repeats: int) -> np.ndarray:
+    for query in QUERIES:
+        encoder.encode(query)  # warm-up
+    latencies = []
+    for _ in range(repeats):
+        for query in QUERIES:
+            start = time.perf_counter()
+            encoder.encode(query)
+            latencies.append(time.perf_counter() - start)
+    return np.array(latencies) * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--model", default=EMBEDDING_MODEL_NAME, help="reference sentence-transformers model")
+    parser.add_argument("--onnx-dir", default=ONNX_MODEL_DIR)
+    parser.add_argument("--from-snapshot", metavar="PATH", help="embed real posts from a corpus snapshot")
+    parser.add_argument("--passages", type=int, default=256)
+    parser.add_argument("--batch-size", type=int, default=EMBEDDING_BATCH_SIZE)
+    parser.add_argument("--repeats", type=int, default=10)
+    parser.add_argument("--min-cosine", type=float, default=ONNX_MIN_COSINE)
+    args = parser.parse_args()
+
+    from sentence_transformers import SentenceTransformer
+    texts = passages(args) + QUERIES
+    encoders = {
+        "torch": SentenceTransformer(args.model, device="cpu"),
+        "onnx-fp32": OnnxEncoder(args.onnx_dir, quantized=False),
+        "onnx-int8": OnnxEncoder(args.onnx_dir, quantized=True),
+    }
+    reference = np.asarray(encoders["torch"].encode(texts, batch_size=args.batch_size))
+    reference /= np.linalg.norm(reference, axis=1, keepdims=True)
+
+    print(f"{len(texts)} texts, batch size {args.batch_size}")
+    print(f"{'backend':<11}{'vectors/s':>11}{'query p50 ms':>14}{'query p95 ms':>14}{'cos min':>9}{'cos mean':>10}")
+    lowest_int8 = None
+    for name, encoder in encoders.items():
+        rate = throughput(encoder, texts, args.batch_size)
+        latencies = query_latency(encoder, args.repeats)
+        vectors = np.asarray(encoder.encode(texts, batch_size=args.batch_size))
+        cosine = np.sum(vectors * reference, axis=1) / np.linalg.norm(vectors, axis=1)
+        if name == "onnx-int8":
+            lowest_int8 = cosine.min()
+        print(f"{name:<11}{rate:>11.1f}{np.percentile(latencies, 50):>14.2f}{np.percentile(latencies, 95):>14.2f}"
+              f"{cosine.min():>9.4f}{cosine.mean():>10.4f}")
+
+    if lowest_int8 < args.min_cosine:
+        print(f"FAIL: int8 embeddings drop to cosine {lowest_int8:.4f} < {args.min_cosine}")
+        sys.exit(1)
+    print(f"OK: int8 embeddings stay above cosine {args.min_cosine}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,227 @@
+"""Load-test the hybrid search path: throughput, latency percentiles, errors and time split.
+
+Usage (from data_engineering_pipeline/):
+    python -m benchmarks.bench_load [--log queries.txt] [--concurrency 8] [--rate 10 20 40]
+                                    [--target hybrid_search|sample_hybrid_search] [--es-url URL]
+                                    [--category nutrition] [--tag salt] [--created-after 2022-01-01]
+
+Queries from the log (one per line; a built-in list by default) are sent to the
+target script's run_hybrid_search from --concurrency worker threads. With --rate,
+arrivals follow a Poisson process at that many queries/second (open loop), and
+latency is measured from the scheduled arrival, so queueing under overload is
+counted; several rates give one row each. Without --rate every worker sends
+queries back to back (closed loop).
+
+The model is whatever EMBEDDING_BACKEND selects. Without --es-url the searches go
+to a local Elasticsearch stand-in (src/testing/stub_elasticsearch.py) running in its own
+process, over a synthetic corpus (or --snapshot with its BM25 index), so the harness
+works offline. Calls to model.encode and es_client.search are timed to split each
+query's time between queueing, embedding, Elasticsearch and the rest; a query counts
+as an error if either call raises, even when the search function swallows it.
+
+The filter options send every query through the filtered (pre-filtered kNN) path.
+The stand-in cannot apply filters and rejects such searches, so they need --es-url.
+"""
+import argparse
+import importlib
+import logging
+import multiprocessing
+import queue
+import threading
+import time
+from typing import List, Optional
+import numpy as np
+from elasticsearch import Elasticsearch
+from src.config import BM25_INDEX_PATH, INDEX_ALIAS
+from src.search.filters import add_filter_arguments, build_filter_clauses, filters_from_args
+
+QUERIES = [
+    "healthier salt substitutes",
+    "does sugar cause diabetes",
+    "plant based protein sources",
+    "how much fiber per day",
+    "blood pressure and sodium intake",
+    "is coffee good for the heart",
+    "vitamin B12 for vegans",
+    "best foods for gut bacteria",
+    "eggs and cholesterol",
+    "processed meat cancer risk",
+]
+
+
+class TimedCalls:
+    """Proxy that times (and counts failures of) one method of the wrapped object, per thread."""
+
+    def __init__(self, target, method: str):
+        self._target = target
+        self._method = method
+        self._local = threading.local()
+
+    def __getattr__(self, name):
+        attribute = getattr(self._target, name)
+        if name != self._method:
+            return attribute
+
+        def timed(*args, **kwargs):
+            start = time.perf_counter()
+            try:
+                return attribute(*args, **kwargs)
+            except Exception:
+                self._local.errors = getattr(self._local, "errors", 0) + 1
+                raise
+            finally:
+                self._local.elapsed = getattr(self._local, "elapsed", 0.0) + time.perf_counter() - start
+        return timed
+
+    def take(self):
+        """Returns and resets (seconds spent, failed calls) for the calling thread."""
+        elapsed, errors = getattr(self._local, "elapsed", 0.0), getattr(self._local, "errors", 0)
+        self._local.elapsed, self._local.errors = 0.0, 0
+        return elapsed, errors
+
+
+def serve_stub(connection, n_docs: int, dim: int, words: List[str], latency: float,
+               snapshot: Optional[str], bm25_index: Optional[str]):
+    from src.testing.stub_elasticsearch import StubElasticsearch, synthetic_searcher
+    if snapshot:
+        from src.db.snapshot import read_snapshot
+        from src.search.bm25_index import BM25Index
+        from src.search.local_hybrid import LocalHybridSearcher
+        searcher = LocalHybridSearcher(BM25Index.load(bm25_index), read_snapshot(snapshot))
+    else:
+        searcher = synthetic_searcher(n_docs, dim, words)
+    stub = StubElasticsearch(searcher, latency).start()
+    connection.send(stub.url)
+    connection.recv()  # blocks until the harness is done
+    stub.stop()
+
+
+def run_load(search, queries: List[str], concurrency: int, rate: float, model: TimedCalls,
+             es_client: TimedCalls, seed: int = 0):
+    """Sends every query once; returns per-query (latency, service, embedding, elasticsearch, error) rows.
+
+    Latency runs from the scheduled arrival (open loop) or the start of the call (closed
+    loop); service time only covers the call, so their difference is time spent queueing.
+    """
+    jobs = queue.Queue()
+    rows = []
+    rows_lock = threading.Lock()
+
+    def worker():
+        while True:
+            job = jobs.get()
+            if job is None:
+                return
+            query, scheduled = job
+            start = time.perf_counter()
+            failed = False
+            try:
+                search(query)
+            except Exception:
+                failed = True
+            end = time.perf_counter()
+            embed_time, embed_errors = model.take()
+            es_time, es_errors = es_client.take()
+            with rows_lock:
+                rows.append((end - (scheduled if scheduled is not None else start), end - start,
+                             embed_time, es_time, failed or embed_errors > 0 or es_errors > 0))
+
+    threads = [threading.Thread(target=worker, daemon=True) for _ in range(concurrency)]
+    for thread in threads:
+        thread.start()
+    began = time.perf_counter()
+    if rate > 0:
+        offsets = np.cumsum(np.random.default_rng(seed).exponential(1.0 / rate, size=len(queries)))
+        for query, offset in zip(queries, offsets):
+            delay = began + offset - time.perf_counter()
+            if delay > 0:
+                time.sleep(delay)
+            jobs.put((query, began + offset))
+    else:
+        for query in queries:
+            jobs.put((query, None))
+    for _ in threads:
+        jobs.put(None)
+    for thread in threads:
+        thread.join()
+    return np.array(rows, dtype=np.float64), time.perf_counter() - began
+
+
+def report(label: str, rows: np.ndarray, wall: float) -> str:
+    latencies, service, embed, es = (rows[:, :4] * 1000).T
+    p50, p90, p99 = np.percentile(latencies, [50, 90, 99])
+    return (f"{label:>9} {len(rows) / wall:8.1f} {p50:8.1f} {p90:8.1f} {p99:8.1f} {latencies.max():8.1f}"
+            f" {rows[:, 4].mean():7.1%} {(latencies - service).mean():8.1f} {embed.mean():8.1f} {es.mean():8.1f}"
+            f" {(service - embed - es).mean():8.1f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--log", help="query log, one query per line")
+    parser.add_argument("--queries", type=int, default=500, help="queries per run (the log is cycled)")
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--rate", type=float, nargs="+", default=[0.0],
+                        help="arrival rates in queries/s; 0 means closed loop")
+    parser.add_argument("--target", choices=["hybrid_search", "sample_hybrid_search"], default="hybrid_search")
+    parser.add_argument("--k", type=int, default=5)
+    parser.add_argument("--es-url", help="a real Elasticsearch to test against instead of the local stand-in")
+    parser.add_argument("--index", default=INDEX_ALIAS)
+    parser.add_argument("--docs", type=int, default=5000, help="stand-in corpus size")
+    parser.add_argument("--es-latency-ms", type=float, default=0.0, help="extra delay per stand-in request")
+    parser.add_argument("--snapshot", help="serve this corpus snapshot from the stand-in")
+    parser.add_argument("--bm25-index", default=BM25_INDEX_PATH, help="BM25 index built from --snapshot")
+    add_filter_arguments(parser)
+    args = parser.parse_args()
+    filters = filters_from_args(args)
+    filtered = bool(build_filter_clauses(filters))
+    if filtered and args.es_url is None:
+        parser.error("filtered searches need --es-url; the local stand-in cannot apply filters")
+
+    if args.log:
+        with open(args.log, "r", encoding="utf-8") as f:
+            log = [line.strip() for line in f if line.strip()]
+    else:
+        log = QUERIES
+    queries = [log[i % len(log)] for i in range(args.queries)]
+
+    module = importlib.import_module(args.target)  # loads the configured embedding model
+    logging.getLogger().setLevel(logging.WARNING)
+    logging.getLogger("elastic_transport").setLevel(logging.WARNING)
+
+    stub_process, connection = None, None
+    es_url = args.es_url
+    if es_url is None:
+        connection, child = multiprocessing.Pipe()
+        dim = len(module.model.encode("dimension probe"))
+        words = sorted({word.lower() for query in log for word in query.split()})
+        stub_process = multiprocessing.Process(
+            target=serve_stub, daemon=True,
+            args=(child, args.docs, dim, words, args.es_latency_ms / 1000, args.snapshot, args.bm25_index))
+        stub_process.start()
+        es_url = connection.recv()
+
+    model = TimedCalls(module.model, "encode")
+    es_client = TimedCalls(Elasticsearch(es_url), "search")
+    module.model, module.es_client = model, es_client
+
+    def search(query: str):
+        return module.run_hybrid_search(query, args.index, k=args.k, filters=filters)
+
+    try:
+        search(queries[0])  # warm-up: model, connection pool
+        model.take(), es_client.take()
+        print(f"{args.target}.run_hybrid_search against {'stand-in ' if args.es_url is None else ''}{es_url}, "
+              f"{len(queries)} queries per run, concurrency {args.concurrency}{', filtered' if filtered else ''}")
+        print(f"{'rate':>9} {'q/s':>8} {'p50 ms':>8} {'p90 ms':>8} {'p99 ms':>8} {'max ms':>8}"
+              f" {'errors':>7} {'queue ms':>8} {'embed ms':>8} {'es ms':>8} {'other ms':>8}")
+        for rate in args.rate:
+            rows, wall = run_load(search, queries, args.concurrency, rate, model, es_client)
+            print(report(f"{rate:g}/s" if rate > 0 else "closed", rows, wall))
+    finally:
+        if connection is not None:
+            connection.send("stop")
+            stub_process.join(timeout=5)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,60 @@
+"""Benchmark reparsing the raw HTML archive, reported as pages/second.
+
+Usage (from data_engineering_pipeline/):
+    python -m benchmarks.bench_reparse [--pages 500] [--workers 4] [--archive data/html_archive]
+
+Without --archive a synthetic archive of blog-like pages is generated in a temp directory.
+"""
+import argparse
+import logging
+import tempfile
+from typing import Dict
+from src.main import reparse
+from src.scraper.html_archive import HtmlArchive
+
+PAGE_TEMPLATE = """<html><head><title>Post {i}</title></head><body>
+<article class="post-{i} category-nutrition tag-salt tag-sodium-intake">
+<h1 class="entry-title">Post number {i}</h1>
+<time datetime="2023-01-{day:02d}T10:00:00+00:00"></time><time datetime="2023-02-{day:02d}T10:00:00+00:00"></time>
+{paragraphs}
+<p>KEY TAKEAWAYS</p><ul><li>First takeaway {i}</li><li>Second takeaway {i}</li></ul>
+<p class="p1">Written By Someone</p>
+</article></body></html>"""
+
+
+class NullHandler:
+    """Discards documents so the benchmark measures parsing only."""
+
+    def upsert_blog_post(self, blog_content: Dict):
+        pass
+
+
+def build_synthetic_archive(directory: str, n_pages: int) -> HtmlArchive:
+    archive = HtmlArchive(directory)
+    for i in range(n_pages):
+        paragraphs = "\n".join(
+            f"<p class=\"p1\">Paragraph {j} of post {i} talks about salt, sodium and blood pressure.</p>"
+            for j in range(30)
+        )
+        html = PAGE_TEMPLATE.format(i=i, day=i % 28 + 1, paragraphs=paragraphs)
+        archive.append(f"https://example.org/blog/post-{i}/", html.encode("utf-8"))
+    return archive
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--pages", type=int, default=500)
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 4])
+    parser.add_argument("--archive", help="existing archive directory to reparse")
+    args = parser.parse_args()
+    logging.getLogger().setLevel(logging.WARNING)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        archive = HtmlArchive(args.archive) if args.archive else build_synthetic_archive(tmp, args.pages)
+        for workers in args.workers:
+            rate = reparse(NullHandler(), archive, workers=workers)
+            print(f"workers={workers}: {len(archive)} pages, {rate:.1f} pages/s")
+
+
+if __name__ == "__main__":
+    main()
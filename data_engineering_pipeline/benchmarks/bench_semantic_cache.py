@@ -0,0 +1,103 @@
+"""Replay a query log against a search backend with and without the semantic query cache.
+
+Usage (from data_engineering_pipeline/):
+    python -m benchmarks.bench_semantic_cache [--queries 2000] [--rtt-ms 20]
+
+Without a query log, a synthetic one is generated: a Zipf-distributed set of search
+intents, each asked in several phrasings whose embeddings are noisy copies of the
+intent's embedding. With --log (one query per line) the queries are embedded with
+all-mpnet-base-v2, which requires sentence-transformers. The backend is an exact
+kNN over a synthetic corpus plus --rtt-ms of simulated network time per request.
+For cache hits, the cached results are compared with what the backend would return.
+"""
+import argparse
+import time
+import numpy as np
+from src.config import EMBEDDING_DIM
+from src.search.semantic_cache import SemanticQueryCache
+
+
+def synthetic_log(n_queries: int, n_intents: int, phrasings: int, noise: float, rng) -> np.ndarray:
+    intents = rng.standard_normal((n_intents, EMBEDDING_DIM)).astype(np.float32)
+    intents /= np.linalg.norm(intents, axis=1, keepdims=True)
+    jitter = rng.standard_normal((n_intents, phrasings, EMBEDDING_DIM)).astype(np.float32) * noise / np.sqrt(EMBEDDING_DIM)
+    variants = intents[:, None, :] + jitter
+    variants /= np.linalg.norm(variants, axis=2, keepdims=True)
+    popularity = 1.0 / np.arange(1, n_intents + 1)
+    chosen = rng.choice(n_intents, size=n_queries, p=popularity / popularity.sum())
+    return variants[chosen, rng.integers(0, phrasings, size=n_queries)]
+
+
+def embed_log(path: str) -> np.ndarray:
+    from sentence_transformers import SentenceTransformer
+    with open(path, "r", encoding="utf-8") as f:
+        queries = [line.strip() for line in f if line.strip()]
+    return SentenceTransformer("all-mpnet-base-v2").encode(queries, normalize_embeddings=True)
+
+
+class BruteForceBackend:
+    def __init__(self, n_docs: int, k: int, rtt: float, rng):
+        self.corpus = rng.standard_normal((n_docs, EMBEDDING_DIM)).astype(np.float32)
+        self.corpus /= np.linalg.norm(self.corpus, axis=1, keepdims=True)
+        self.k = k
+        self.rtt = rtt
+
+    def exact(self, vector: np.ndarray) -> np.ndarray:
+        scores = self.corpus @ vector
+        top = np.argpartition(scores, -self.k)[-self.k:]
+        return top[np.argsort(scores[top])[::-1]]
+
+    def search(self, vector: np.ndarray) -> np.ndarray:
+        if self.rtt:
+            time.sleep(self.rtt)
+        return self.exact(vector)
+
+
+def replay(vectors: np.ndarray, backend: BruteForceBackend, cache=None):
+    latencies, agreement = [], []
+    for vector in vectors:
+        start = time.perf_counter()
+        results = cache.get(vector) if cache is not None else None
+        hit = results is not None
+        if not hit:
+            results = backend.search(vector)
+            if cache is not None:
+                cache.put(vector, results)
+        latencies.append(time.perf_counter() - start)
+        if hit:
+            fresh = backend.exact(vector)
+            agreement.append(len(set(results.tolist()) & set(fresh.tolist())) / backend.k)
+    return np.array(latencies), agreement
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--log", help="query log with one query per line (needs sentence-transformers)")
+    parser.add_argument("--queries", type=int, default=2000)
+    parser.add_argument("--intents", type=int, default=400)
+    parser.add_argument("--phrasings", type=int, default=6)
+    parser.add_argument("--noise", type=float, default=0.2, help="paraphrase noise; 0.2 gives cosine ~0.96 between phrasings")
+    parser.add_argument("--docs", type=int, default=10000)
+    parser.add_argument("--k", type=int, default=5)
+    parser.add_argument("--rtt-ms", type=float, default=20.0, help="simulated network and Elasticsearch time per search")
+    parser.add_argument("--thresholds", type=float, nargs="+", default=[0.9, 0.95, 0.98])
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    vectors = embed_log(args.log) if args.log else synthetic_log(args.queries, args.intents, args.phrasings, args.noise, rng)
+    backend = BruteForceBackend(args.docs, args.k, args.rtt_ms / 1000, rng)
+
+    baseline, _ = replay(vectors, backend)
+    print(f"{len(vectors)} queries, {args.docs} documents, k={args.k}, rtt={args.rtt_ms:.0f} ms")
+    print(f"no cache:        mean {baseline.mean() * 1000:7.2f} ms  p95 {np.percentile(baseline, 95) * 1000:7.2f} ms")
+    for threshold in args.thresholds:
+        cache = SemanticQueryCache(threshold=threshold)
+        latencies, agreement = replay(vectors, backend, cache)
+        saved = baseline.sum() - latencies.sum()
+        print(f"threshold {threshold:.2f}: mean {latencies.mean() * 1000:7.2f} ms  p95 {np.percentile(latencies, 95) * 1000:7.2f} ms"
+              f"  hit rate {cache.hit_rate:6.1%}  saved {saved:6.1f} s ({saved / baseline.sum():5.1%})"
+              f"  top-{args.k} agreement on hits {np.mean(agreement) if agreement else float('nan'):.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,97 @@
+"""Compare corpus load time and memory: Mongo-style documents vs Parquet vs memory-mapped Arrow.
+
+Usage (from data_engineering_pipeline/):
+    python -m benchmarks.bench_snapshot [--docs 20000]
+
+The "mongo" path decodes a BSON dump of the processed documents (what list(find())
+does after the network) and builds the pandas DataFrame with list-valued vector
+columns, as the indexing scripts do today. Each loader runs in a fresh process so
+its peak RSS can be measured.
+"""
+import argparse
+import multiprocessing
+import os
+import resource
+import tempfile
+import time
+import bson
+import numpy as np
+import pandas as pd
+from src.config import EMBEDDING_DIM
+from src.db.snapshot import read_snapshot, vector_matrix, write_snapshot
+
+
+def synthetic_frame(n_docs: int) -> pd.DataFrame:
+    rng = np.random.default_rng(0)
+    return pd.DataFrame({
+        "url": [f"https://example.org/blog/post-{i}/" for i in range(n_docs)],
+        "title": [f"Post {i}" for i in range(n_docs)],
+        "combined_text": ["Salt, sodium and blood pressure. " * 60] * n_docs,
+        "title_vector": list(rng.standard_normal((n_docs, EMBEDDING_DIM), dtype=np.float32)),
+        "combined_text_vector": list(rng.standard_normal((n_docs, EMBEDDING_DIM), dtype=np.float32)),
+        "category": ["nutrition"] * n_docs,
+        "created": ["2023-01-01T00:00:00+00:00"] * n_docs,
+    })
+
+
+def load_mongo(path: str):
+    with open(path, "rb") as f:
+        docs = bson.decode_all(f.read())
+    df = pd.DataFrame(docs)
+    return np.array(df["combined_text_vector"].tolist(), dtype=np.float32)
+
+
+def load_snapshot(path: str):
+    return vector_matrix(read_snapshot(path), "combined_text_vector")
+
+
+def measure(loader, path, results):
+    baseline = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    start = time.perf_counter()
+    matrix = loader(path)
+    checksum = float(matrix.sum())  # touch every value so mmapped pages are really read
+    elapsed = time.perf_counter() - start
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    results.put((elapsed, (peak - baseline) / 1024, checksum))
+
+
+def run(loader, path):
+    results = multiprocessing.Queue()
+    process = multiprocessing.Process(target=measure, args=(loader, path, results))
+    process.start()
+    result = results.get()
+    process.join()
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--docs", type=int, default=20000)
+    args = parser.parse_args()
+
+    df = synthetic_frame(args.docs)
+    with tempfile.TemporaryDirectory() as tmp:
+        paths = {
+            "mongo": os.path.join(tmp, "corpus.bson"),
+            "parquet": os.path.join(tmp, "corpus.parquet"),
+            "arrow-mmap": os.path.join(tmp, "corpus.arrow"),
+        }
+        with open(paths["mongo"], "wb") as f:
+            for record in df.to_dict("records"):
+                record["title_vector"] = record["title_vector"].tolist()
+                record["combined_text_vector"] = record["combined_text_vector"].tolist()
+                f.write(bson.encode(record))
+        write_snapshot(df, paths["parquet"])
+        write_snapshot(df, paths["arrow-mmap"])
+        del df
+
+        print(f"{args.docs} documents, {EMBEDDING_DIM}-dim vectors")
+        for name, path in paths.items():
+            loader = load_mongo if name == "mongo" else load_snapshot
+            elapsed, peak_mb, _ = run(loader, path)
+            size_mb = os.path.getsize(path) / 2 ** 20
+            print(f"{name:<11} file {size_mb:8.1f} MB  load {elapsed:7.3f}s  peak RSS +{peak_mb:8.1f} MB")
+
+
+if __name__ == "__main__":
+    main()
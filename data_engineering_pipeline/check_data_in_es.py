@@ -1,12 +1,14 @@
+import sys
 from elasticsearch import Elasticsearch
 import json
 import logging
+from src.config import INDEX_ALIAS, ELASTICSEARCH_URL
 
 # Setup logging
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 
 # Elasticsearch connection
-es_client = Elasticsearch('http://localhost:9200')
+es_client = Elasticsearch(ELASTICSEARCH_URL)
 
 def get_document_count(index_name: str) -> int:
     """Get the total number of documents in the Elasticsearch index."""
@@ -21,12 +23,12 @@ def get_sample_document(index_name: str) -> dict:
     return None
 
 def main():
-    index_name = "blog_posts_index"  # Make sure this matches your index name
+    index_name = INDEX_ALIAS  # alias swapped by `hybrid_search.py --rebuild`
     
     # Check if the index exists
     if not es_client.indices.exists(index=index_name):
         logging.error(f"Index '{index_name}' does not exist in Elasticsearch.")
-        return
+        sys.exit(1)
 
     # Get document count
     doc_count = get_document_count(index_name)
@@ -39,6 +41,7 @@ def main():
         print(json.dumps(sample_doc, indent=2))
     else:
         logging.info("No documents found in Elasticsearch.")
+        sys.exit(1)
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
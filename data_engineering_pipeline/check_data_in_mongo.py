@@ -1,31 +1,26 @@
+import sys
 from pymongo import MongoClient
+from src.config import MONGODB_URI, DATABASE_NAME, COLLECTION_NAME
 
 
-# MongoDB connection settings
-username = "root"
-password = "root"
-host = "localhost"
-port = 27017
-database_name = "web_scraper_db"  # Replace with your database name
-collection_name = "blog_posts"  # Replace with your collection name
-
 # Create MongoDB client
-client = MongoClient(f"mongodb://{username}:{password}@{host}:{port}/")
+client = MongoClient(MONGODB_URI)
 
 # Access the database
-db = client[database_name]
+db = client[DATABASE_NAME]
 
 # Access the collection
-collection = db[collection_name]
+collection = db[COLLECTION_NAME]
 
 # Fetch one document from the collection
 document = collection.find_one()
 
-# Print the document
+# Close the connection
+client.close()
+
+# Print the document; a non-zero exit status lets the pipeline's validate stage fail
 if document:
     print(document)
 else:
     print("No document found.")
-
-# Close the connection
-client.close()
+    sys.exit(1)
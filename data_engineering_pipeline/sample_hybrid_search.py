@@ -1,33 +1,55 @@
+import argparse
 import logging
+from typing import Any, Dict, Optional
 from elasticsearch import Elasticsearch
-from sentence_transformers import SentenceTransformer
+from src.config import INDEX_ALIAS, BM25_INDEX_PATH, SNAPSHOT_PATH, ELASTICSEARCH_URL
+from src.db.snapshot import read_snapshot
+from src.search.bm25_index import BM25Index
+from src.search.local_hybrid import LocalHybridSearcher
+from src.search.filters import build_filter_clauses, add_filter_arguments, filters_from_args
+from src.search.index_manager import alias_version
+from src.search.semantic_cache import SemanticQueryCache, cache_context
+from src.search.embedding import load_encoder
 
 # Setup logging
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 
 # Elasticsearch connection
-es_client = Elasticsearch('http://localhost:9200')
+es_client = Elasticsearch(ELASTICSEARCH_URL)
 
-# Load SentenceTransformer model
-model = SentenceTransformer("all-mpnet-base-v2")
+# Load the embedding model (EMBEDDING_BACKEND selects PyTorch or the int8 ONNX export)
+model = load_encoder()
 
-def run_hybrid_search(query: str, index_name: str, k: int = 5):
+def run_hybrid_search(query: str, index_name: str, k: int = 5, filters: Optional[Dict[str, Any]] = None,
+                      cache: Optional[SemanticQueryCache] = None):
     """Run hybrid search in Elasticsearch using RRF to combine full-text and kNN results."""
     query_vector = model.encode(query).tolist()
+    context = cache_context(index_name, k, filters)
+    if cache is not None:
+        cached = cache.get(query_vector, context)
+        if cached is not None:
+            return cached
+    filter_clauses = build_filter_clauses(filters)
     
     search_body = {
         "query": {
-            "multi_match": {
-                "query": query,
-                "fields": ["combined_text^3", "title", "blog_tags"],
-                "type": "best_fields"
+            "bool": {
+                "must": {
+                    "multi_match": {
+                        "query": query,
+                        "fields": ["combined_text^3", "title", "blog_tags"],
+                        "type": "best_fields"
+                    }
+                },
+                "filter": filter_clauses
             }
         },
         "knn": {
             "field": "combined_text_vector",
             "query_vector": query_vector,
             "k": k,
-            "num_candidates": 100
+            "num_candidates": 100,
+            "filter": filter_clauses
         },
         "rank": {
             "rrf": {}
@@ -37,20 +59,42 @@ def run_hybrid_search(query: str, index_name: str, k: int = 5):
     
     try:
         response = es_client.search(index=index_name, body=search_body)
-        return response["hits"]["hits"]
+        hits = response["hits"]["hits"]
+        if cache is not None:
+            cache.put(query_vector, hits, context)
+        return hits
     except Exception as e:
         logging.error(f"Search error: {str(e)}")
         return []
 
 def main():
-    index_name = "blog_posts_index"  # Make sure this matches your actual index name
+    parser = argparse.ArgumentParser(description="Interactive hybrid search over the blog posts.")
+    add_filter_arguments(parser)
+    parser.add_argument("--cache", action="store_true",
+                        help="reuse the results of a recent, near-identical query instead of querying Elasticsearch")
+    parser.add_argument("--offline", action="store_true",
+                        help="search the local BM25 index and corpus snapshot instead of Elasticsearch")
+    args = parser.parse_args()
+    filters = filters_from_args(args)
+    index_name = INDEX_ALIAS  # alias swapped by `hybrid_search.py --rebuild`
+    # Results are dropped as soon as the alias points to a rebuilt index
+    cache = None if not args.cache or args.offline else SemanticQueryCache(version_fn=lambda: alias_version(es_client, index_name))
+    local_searcher = None
+    if args.offline:
+        if any(filters.values()):
+            logging.warning("Filters are not supported in offline mode and are ignored")
+        # Build them with `python -m src.search.bm25_index build` and `hybrid_search.py --export-snapshot`
+        local_searcher = LocalHybridSearcher(BM25Index.load(BM25_INDEX_PATH), read_snapshot(SNAPSHOT_PATH))
     
     while True:
         query = input("Enter your search query (or 'quit' to exit): ")
         if query.lower() == 'quit':
             break
         
-        search_results = run_hybrid_search(query, index_name, k=5)
+        if local_searcher is not None:
+            search_results = local_searcher.search(query, model.encode(query), k=5, fusion="rrf")
+        else:
+            search_results = run_hybrid_search(query, index_name, k=5, filters=filters, cache=cache)
         
         if search_results:
             logging.info(f"Top {len(search_results)} results for query '{query}':")
@@ -64,6 +108,8 @@ def main():
         else:
             logging.info("No results found or an error occurred.")
     
+    if cache is not None:
+        logging.info(f"Semantic cache hit rate: {cache.hit_rate:.1%} ({cache.hits} of {cache.hits + cache.misses} queries)")
     logging.info("Search session ended.")
 
 if __name__ == "__main__":
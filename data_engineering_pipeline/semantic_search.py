@@ -1,24 +1,31 @@
 from elasticsearch import Elasticsearch
-from sentence_transformers import SentenceTransformer
+import argparse
 import logging
+from typing import Any, Dict, Optional
+from src.config import INDEX_ALIAS, ELASTICSEARCH_URL
+from src.search.filters import build_filter_clauses, add_filter_arguments, filters_from_args
+from src.search.embedding import load_encoder
 
 # Setup logging
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 
 # Elasticsearch connection
-es_client = Elasticsearch('http://localhost:9200')
+es_client = Elasticsearch(ELASTICSEARCH_URL)
 
-# Load SentenceTransformer model
-model = SentenceTransformer("all-mpnet-base-v2")
+# Load the embedding model (EMBEDDING_BACKEND selects PyTorch or the int8 ONNX export)
+model = load_encoder()
 
-def run_semantic_search(query: str, index_name: str, k: int = 5):
-    """Run semantic search in Elasticsearch based on user input."""
+def run_semantic_search(query: str, index_name: str, k: int = 5, filters: Optional[Dict[str, Any]] = None):
+    """Run semantic search in Elasticsearch based on user input.
+
+    Only documents matching `filters` are scored, so filtering never shrinks the top k.
+    """
     query_vector = model.encode(query).tolist()
     search_query = {
         "size": k,
         "query": {
             "script_score": {
-                "query": {"match_all": {}},
+                "query": {"bool": {"filter": build_filter_clauses(filters)}},
                 "script": {
                     "source": "cosineSimilarity(params.query_vector, 'embedding') + 1.0",
                     "params": {"query_vector": query_vector}
@@ -31,14 +38,17 @@ def run_semantic_search(query: str, index_name: str, k: int = 5):
     return results['hits']['hits']
 
 def main():
-    index_name = "blog_posts_index"  # Make sure this matches your index name
+    parser = argparse.ArgumentParser(description="Interactive semantic search over the blog posts.")
+    add_filter_arguments(parser)
+    filters = filters_from_args(parser.parse_args())
+    index_name = INDEX_ALIAS  # alias swapped by `hybrid_search.py --rebuild`
     
     while True:
         query = input("Enter your search query (or 'quit' to exit): ")
         if query.lower() == 'quit':
             break
         
-        results = run_semantic_search(query, index_name)
+        results = run_semantic_search(query, index_name, filters=filters)
         
         print(f"\nTop 5 results for query '{query}':")
         for hit in results:
@@ -4,10 +4,11 @@ from pymongo import MongoClient
 from src.config import MONGODB_URI, DATABASE_NAME, COLLECTION_NAME
 
 class MongoHandler:
-    def __init__(self):
-        self.client = MongoClient(MONGODB_URI)
-        self.db = self.client[DATABASE_NAME]
-        self.collection = self.db[COLLECTION_NAME]
+    def __init__(self, uri: str = MONGODB_URI, database_name: str = DATABASE_NAME,
+                 collection_name: str = COLLECTION_NAME):
+        self.client = MongoClient(uri)
+        self.db = self.client[database_name]
+        self.collection = self.db[collection_name]
 
     def save_blog_post(self, blog_content: Dict):
         """Saves the blog content to MongoDB."""
@@ -17,6 +18,14 @@ class MongoHandler:
         except Exception as e:
             logging.error(f"Error saving blog post to MongoDB: {e}")
 
+    def upsert_blog_post(self, blog_content: Dict):
+        """Replaces the stored blog post with the same URL, inserting it if absent."""
+        try:
+            self.collection.replace_one({"url": blog_content["url"]}, blog_content, upsert=True)
+            logging.debug(f"Upserted document for URL: {blog_content['url']}")
+        except Exception as e:
+            logging.error(f"Error upserting blog post to MongoDB: {e}")
+
     def get_sample_document(self):
         """Retrieves a sample document from the collection."""
         return self.collection.find_one()
@@ -0,0 +1,87 @@
+import logging
+import os
+from typing import Any, Dict, Iterator, List
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+from src.config import EMBEDDING_DIM
+
+# Columns holding embeddings; stored as fixed_size_list<float32>[EMBEDDING_DIM].
+VECTOR_COLUMNS = ["title_vector", "combined_text_vector"]
+
+
+def _vector_array(values: List, dim: int = EMBEDDING_DIM) -> pa.FixedSizeListArray:
+    if not values:
+        return pa.FixedSizeListArray.from_arrays(pa.array([], type=pa.float32()), dim)
+    flat = np.asarray(np.stack([np.asarray(v, dtype=np.float32) for v in values]), dtype=np.float32)
+    if flat.shape[1] != dim:
+        raise ValueError(f"Expected {dim}-dimensional vectors, got {flat.shape[1]}")
+    return pa.FixedSizeListArray.from_arrays(pa.array(flat.ravel()), dim)
+
+
+def dataframe_to_table(df: pd.DataFrame) -> pa.Table:
+    """Converts the processed corpus DataFrame into an Arrow table with packed float32 vectors."""
+    columns = {}
+    for name in df.columns:
+        if name in VECTOR_COLUMNS:
+            columns[name] = _vector_array(df[name].tolist())
+        else:
+            columns[name] = pa.array(df[name].tolist())
+    return pa.table(columns)
+
+
+def write_snapshot(df: pd.DataFrame, path: str):
+    """Writes the corpus and its embeddings as Arrow IPC (.arrow) or Parquet (.parquet).
+
+    Arrow IPC is uncompressed and can be memory-mapped without copying; Parquet is
+    smaller and suited for sharing or archiving.
+    """
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    table = dataframe_to_table(df)
+    if path.endswith(".parquet"):
+        pq.write_table(table, path)
+    else:
+        with pa.OSFile(path, "wb") as sink, pa.ipc.new_file(sink, table.schema) as writer:
+            writer.write_table(table)
+    logging.info(f"Wrote snapshot of {table.num_rows} documents to {path}")
+
+
+def read_snapshot(path: str) -> pa.Table:
+    """Reads a snapshot; Arrow IPC files are memory-mapped, so columns are not copied into RAM."""
+    if path.endswith(".parquet"):
+        return pq.read_table(path)
+    return pa.ipc.open_file(pa.memory_map(path, "r")).read_all()
+
+
+def vector_matrix(table: pa.Table, column: str) -> np.ndarray:
+    """Returns a vector column as an (n, dim) float32 array, without copying when possible."""
+    array = table[column].combine_chunks()  # a no-op view for single-chunk IPC files
+    dim = array.type.list_size
+    # flatten() honours slice offsets, unlike .values, and is itself a zero-copy view.
+    return array.flatten().to_numpy(zero_copy_only=False).reshape(-1, dim)
+
+
+def table_to_dataframe(table: pa.Table) -> pd.DataFrame:
+    """Rebuilds the DataFrame layout used by the indexing scripts (vectors as lists)."""
+    columns = {name: table[name].to_pylist() for name in table.column_names if name not in VECTOR_COLUMNS}
+    for name in VECTOR_COLUMNS:
+        if name in table.column_names:
+            columns[name] = list(vector_matrix(table, name))
+    return pd.DataFrame(columns)
+
+
+def iter_documents(table: pa.Table, batch_size: int = 1000) -> Iterator[Dict[str, Any]]:
+    """Streams snapshot rows as Elasticsearch source documents."""
+    for batch in table.to_batches(max_chunksize=batch_size):
+        scalars = {name: batch.column(name).to_pylist()
+                   for name in batch.schema.names if name not in VECTOR_COLUMNS}
+        vectors = {name: batch.column(name).flatten().to_numpy(zero_copy_only=False)
+                   .reshape(batch.num_rows, -1)
+                   for name in batch.schema.names if name in VECTOR_COLUMNS}
+        for i in range(batch.num_rows):
+            doc = {name: values[i] for name, values in scalars.items()}
+            doc.update({name: matrix[i].tolist() for name, matrix in vectors.items()})
+            yield doc
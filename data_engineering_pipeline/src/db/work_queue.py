@@ -0,0 +1,116 @@
+import logging
+from datetime import datetime, timedelta, timezone
+from typing import Dict, Optional
+from pymongo import ASCENDING, ReturnDocument
+from pymongo.collection import Collection
+from pymongo.errors import BulkWriteError
+from src.config import QUEUE_LEASE_SECONDS, QUEUE_MAX_ATTEMPTS
+
+PENDING, LEASED, DONE, FAILED = "pending", "leased", "done", "failed"
+
+
+def _now() -> datetime:
+    return datetime.now(timezone.utc)
+
+
+class WorkQueue:
+    """A crawl queue in a MongoDB collection shared by any number of workers.
+
+    Workers claim one URL at a time with an atomic find_one_and_update that sets a
+    lease. If a worker crashes, its lease runs out and the URL becomes claimable
+    again. Completing or failing a URL only takes effect while the caller still
+    owns the lease.
+    """
+
+    def __init__(self, collection: Collection, max_attempts: int = QUEUE_MAX_ATTEMPTS):
+        self.collection = collection
+        self.max_attempts = max_attempts
+        self.collection.create_index([("state", ASCENDING), ("lease_expires", ASCENDING)])
+
+    def enqueue(self, lastmods: Dict[str, Optional[str]]) -> int:
+        """Adds URLs (with optional lastmod) to the queue. Returns how many were new.
+
+        Known URLs whose lastmod changed are queued again.
+        """
+        if not lastmods:
+            return 0
+        known = {doc["_id"]: doc.get("lastmod")
+                 for doc in self.collection.find({"_id": {"$in": list(lastmods)}}, {"lastmod": 1})}
+        now = _now()
+        new_docs = [{"_id": url, "state": PENDING, "attempts": 0, "lastmod": lastmod, "enqueued_at": now}
+                    for url, lastmod in lastmods.items() if url not in known]
+        added = 0
+        if new_docs:
+            try:
+                added = len(self.collection.insert_many(new_docs, ordered=False).inserted_ids)
+            except BulkWriteError as e:
+                # Another process enqueued some of the same URLs in the meantime.
+                added = e.details["nInserted"]
+        requeued = 0
+        for url, lastmod in lastmods.items():
+            if url in known and lastmod and known[url] != lastmod:
+                requeued += self.collection.update_one(
+                    {"_id": url, "state": {"$ne": LEASED}},
+                    {"$set": {"state": PENDING, "attempts": 0, "lastmod": lastmod}},
+                ).modified_count
+        logging.info(f"Queue: {added} new URLs, {requeued} changed since last crawl")
+        return added
+
+    def _claimable(self, now: datetime) -> Dict:
+        return {"$or": [
+            {"state": PENDING},
+            {"state": LEASED, "lease_expires": {"$lt": now}, "attempts": {"$lt": self.max_attempts}},
+            {"state": FAILED, "attempts": {"$lt": self.max_attempts}},
+        ]}
+
+    def claim(self, worker_id: str, lease_seconds: float = QUEUE_LEASE_SECONDS) -> Optional[Dict]:
+        """Atomically leases the next available URL to a worker, or returns None."""
+        now = _now()
+        job = self.collection.find_one_and_update(
+            self._claimable(now),
+            {
+                "$set": {"state": LEASED, "lease_owner": worker_id,
+                         "lease_expires": now + timedelta(seconds=lease_seconds)},
+                "$inc": {"attempts": 1},
+            },
+            return_document=ReturnDocument.AFTER,
+        )
+        if job is not None and job["attempts"] > 1:
+            logging.info(f"Worker {worker_id} reclaimed {job['_id']} (attempt {job['attempts']})")
+        return job
+
+    def _finish(self, url: str, worker_id: str, update: Dict) -> bool:
+        result = self.collection.update_one({"_id": url, "state": LEASED, "lease_owner": worker_id}, {"$set": update})
+        if result.modified_count == 0:
+            logging.warning(f"Worker {worker_id} lost the lease on {url} before finishing it")
+        return result.modified_count == 1
+
+    def complete(self, url: str, worker_id: str) -> bool:
+        return self._finish(url, worker_id, {"state": DONE, "finished_at": _now()})
+
+    def fail(self, url: str, worker_id: str, error: str) -> bool:
+        return self._finish(url, worker_id, {"state": FAILED, "last_error": error, "finished_at": _now()})
+
+    def fail_exhausted_leases(self) -> int:
+        """Marks URLs whose last allowed lease ran out as failed, so they stop blocking the drain.
+
+        A URL that keeps killing or hanging its worker would otherwise be retried forever.
+        """
+        result = self.collection.update_many(
+            {"state": LEASED, "lease_expires": {"$lt": _now()}, "attempts": {"$gte": self.max_attempts}},
+            {"$set": {"state": FAILED, "last_error": "lease expired", "finished_at": _now()}},
+        )
+        if result.modified_count:
+            logging.warning(f"Gave up on {result.modified_count} URL(s) after {self.max_attempts} expired leases")
+        return result.modified_count
+
+    def has_outstanding(self) -> bool:
+        """True while any URL is claimable now or leased to a worker that may still finish or crash."""
+        self.fail_exhausted_leases()
+        query = self._claimable(_now())
+        query["$or"].append({"state": LEASED})
+        return self.collection.count_documents(query, limit=1) > 0
+
+    def counts(self) -> Dict[str, int]:
+        return {row["_id"]: row["count"]
+                for row in self.collection.aggregate([{"$group": {"_id": "$state", "count": {"$sum": 1}}}])}
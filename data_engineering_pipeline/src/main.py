@@ -1,41 +1,218 @@
+import argparse
 import logging
+import os
+import socket
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
 from bs4 import BeautifulSoup
 from tqdm import tqdm
 from src.scraper.url_extractor import extract_all_urls, clean_urls, get_webpage_content
 from src.scraper.content_scraper import extract_blog_data
+from src.scraper.html_archive import HtmlArchive
+from src.scraper.frontier import CrawlFrontier
+from src.scraper.rate_limiter import Fetcher
+from src.scraper.sitemap import extract_sitemap_urls
 from src.db.mongo_handler import MongoHandler
-from src.config import ROOT_URL
+from src.db.work_queue import WorkQueue
+from src.config import (
+    ROOT_URL,
+    ARCHIVE_DIR,
+    ARCHIVE_CODEC,
+    REPARSE_WORKERS,
+    REPARSE_BATCH_SIZE,
+    FRONTIER_PATH,
+    DISCOVERY_MODE,
+    QUEUE_COLLECTION_NAME,
+    QUEUE_LEASE_SECONDS,
+    QUEUE_POLL_INTERVAL,
+)
 
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 
-def main():
-    # Extract URLs of all blog posts
+def parse_page(record: Tuple[str, bytes]) -> Dict:
+    """Parses one archived page into a blog post document."""
+    url, content = record
+    soup = BeautifulSoup(content, "html.parser")
+    return extract_blog_data(soup, url)
+
+def parse_pages(records: List[Tuple[str, bytes]]) -> List[Dict]:
+    """Parses a batch of archived pages; one batch is one task for the process pool."""
+    return [parse_page(record) for record in records]
+
+def parallel_parse(executor: ProcessPoolExecutor, records: Iterable[Tuple[str, bytes]], workers: int,
+                   batch_size: int = REPARSE_BATCH_SIZE) -> Iterator[Dict]:
+    """Parses records on the pool in input order, streaming them from the archive.
+
+    At most two batches per worker are in flight, so memory stays bounded however
+    large the archive is (Executor.map would read every record up front).
+    """
+    records = iter(records)
+    pending = deque()
+    for batch in iter(lambda: list(islice(records, batch_size)), []):
+        if len(pending) >= 2 * workers:
+            yield from pending.popleft().result()
+        pending.append(executor.submit(parse_pages, batch))
+    while pending:
+        yield from pending.popleft().result()
+
+def discover(frontier: CrawlFrontier, root: str = ROOT_URL, fetcher: Optional[Fetcher] = None,
+             mode: str = DISCOVERY_MODE):
+    """Adds blog post URLs to the frontier from the sitemaps or by paginating the listing."""
+    if mode == "sitemap":
+        # Sitemaps take a handful of requests, so they are re-read on every run to pick up
+        # new posts and requeue the ones whose lastmod changed.
+        logging.info("Extracting blog post URLs from sitemaps")
+        lastmods = extract_sitemap_urls(root=root, fetcher=fetcher)
+        if lastmods is not None:
+            frontier.add_urls(lastmods, lastmods=lastmods)
+            frontier.mark_discovery_complete()
+            return
+        logging.info("Falling back to pagination crawling")
+
+    # Extract URLs of all blog posts, unless a previous run already did
+    if frontier.discovery_complete:
+        logging.info("Resuming crawl from the persisted frontier")
+        return
     logging.info("Extracting blog post URLs")
-    urls_list = extract_all_urls(root=ROOT_URL)
-    blog_post_urls = clean_urls(urls_list)
+    urls_list = extract_all_urls(root=root, fetcher=fetcher)
+    frontier.add_urls(clean_urls(urls_list, root=root))
+    frontier.mark_discovery_complete()
 
-    # Initialize MongoDB handler
-    mongo_handler = MongoHandler()
+def crawl(mongo_handler: MongoHandler, archive: HtmlArchive, frontier: CrawlFrontier,
+          root: str = ROOT_URL, fetcher: Optional[Fetcher] = None, discovery: str = DISCOVERY_MODE):
+    """Fetches every pending blog post, archives the raw response and saves the parsed content.
+
+    Progress is tracked in the frontier, so calling this again after an interruption
+    only fetches what is left.
+    """
+    discover(frontier, root=root, fetcher=fetcher, mode=discovery)
 
     # Extract content of each blog post and save to MongoDB
-    logging.info("Extracting blog post content")
+    blog_post_urls = frontier.pending()
+    logging.info(f"Extracting blog post content for {len(blog_post_urls)} pending URLs")
     for url in tqdm(blog_post_urls):
-        response = get_webpage_content(url)
+        frontier.mark_in_flight(url)
+        response = get_webpage_content(url, fetcher=fetcher)
         if response is None:
             logging.warning(f"Failed to fetch URL: {url}")
+            frontier.mark_failed(url, "fetch failed")
             continue
 
-        soup = BeautifulSoup(response.content, "html.parser")
-        blog_content = extract_blog_data(soup, url)
-        
-        mongo_handler.save_blog_post(blog_content)
+        archive.append(url, response.content, status=response.status_code)
+        blog_content = parse_page((url, response.content))
+
+        # Upsert so posts refetched after a crash are not stored twice
+        mongo_handler.upsert_blog_post(blog_content)
+        frontier.mark_done(url)
+
+    frontier.checkpoint()
+    logging.info(f"Scraping and saving complete: {frontier.counts()}")
+
+def enqueue(queue: WorkQueue, root: str = ROOT_URL, fetcher: Optional[Fetcher] = None,
+            mode: str = DISCOVERY_MODE) -> int:
+    """Discovers blog post URLs and adds them to the shared work queue."""
+    lastmods = extract_sitemap_urls(root=root, fetcher=fetcher) if mode == "sitemap" else None
+    if lastmods is None:
+        lastmods = dict.fromkeys(clean_urls(extract_all_urls(root=root, fetcher=fetcher), root=root))
+    return queue.enqueue(lastmods)
 
-    logging.info("Scraping and saving complete")
+def run_worker(mongo_handler: MongoHandler, archive: HtmlArchive, queue: WorkQueue, worker_id: str,
+               fetcher: Optional[Fetcher] = None, lease_seconds: float = QUEUE_LEASE_SECONDS,
+               poll_interval: float = QUEUE_POLL_INTERVAL) -> int:
+    """Claims URLs from the shared queue until it is drained. Returns the number of posts saved.
+
+    Any number of workers, on any machine, can run this against the same queue.
+    """
+    processed = 0
+    while True:
+        job = queue.claim(worker_id, lease_seconds=lease_seconds)
+        if job is None:
+            # Other workers may still crash and release their leases, so only stop once nothing is left.
+            if not queue.has_outstanding():
+                break
+            time.sleep(poll_interval)
+            continue
+
+        url = job["_id"]
+        response = get_webpage_content(url, fetcher=fetcher)
+        if response is None:
+            logging.warning(f"Failed to fetch URL: {url}")
+            queue.fail(url, worker_id, "fetch failed")
+            continue
+
+        archive.append(url, response.content, status=response.status_code)
+        mongo_handler.upsert_blog_post(parse_page((url, response.content)))
+        queue.complete(url, worker_id)
+        processed += 1
+
+    logging.info(f"Worker {worker_id} finished after saving {processed} posts: {queue.counts()}")
+    return processed
+
+def reparse(mongo_handler: MongoHandler, archive: HtmlArchive, workers: int = REPARSE_WORKERS) -> float:
+    """Re-runs the parser over the archived pages without touching the network.
+
+    Returns the throughput in pages per second.
+    """
+    logging.info(f"Reparsing {len(archive)} archived pages with {workers} worker(s)")
+    start = time.perf_counter()
+    n_pages = 0
+    if workers > 1:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            for blog_content in tqdm(parallel_parse(executor, archive.iter_records(), workers),
+                                     total=len(archive)):
+                mongo_handler.upsert_blog_post(blog_content)
+                n_pages += 1
+    else:
+        for record in tqdm(archive.iter_records(), total=len(archive)):
+            mongo_handler.upsert_blog_post(parse_page(record))
+            n_pages += 1
+    elapsed = time.perf_counter() - start
+    pages_per_second = n_pages / elapsed if elapsed > 0 else 0.0
+    logging.info(f"Reparsed {n_pages} pages in {elapsed:.2f}s ({pages_per_second:.1f} pages/s)")
+    return pages_per_second
+
+def main():
+    parser = argparse.ArgumentParser(description="Scrape blog posts into MongoDB.")
+    parser.add_argument("--reparse", action="store_true",
+                        help="rebuild documents from the raw HTML archive instead of crawling")
+    parser.add_argument("--workers", type=int, default=REPARSE_WORKERS,
+                        help="number of parser processes used by --reparse")
+    parser.add_argument("--fresh", action="store_true",
+                        help="discard the persisted frontier and crawl from scratch")
+    parser.add_argument("--discovery", choices=["sitemap", "pagination"], default=DISCOVERY_MODE,
+                        help="how blog post URLs are found; sitemap falls back to pagination")
+    parser.add_argument("--enqueue", action="store_true",
+                        help="discover URLs into the shared MongoDB work queue for --worker processes")
+    parser.add_argument("--worker", action="store_true",
+                        help="claim and scrape URLs from the shared MongoDB work queue until it is drained")
+    args = parser.parse_args()
+
+    # Initialize MongoDB handler and the raw HTML archive
+    mongo_handler = MongoHandler()
+    archive = HtmlArchive(ARCHIVE_DIR, codec=ARCHIVE_CODEC)
+
+    if args.reparse:
+        reparse(mongo_handler, archive, workers=args.workers)
+    elif args.enqueue or args.worker:
+        queue = WorkQueue(mongo_handler.db[QUEUE_COLLECTION_NAME])
+        if args.enqueue:
+            enqueue(queue, mode=args.discovery)
+        if args.worker:
+            run_worker(mongo_handler, archive, queue, worker_id=f"{socket.gethostname()}-{os.getpid()}")
+    else:
+        frontier = CrawlFrontier(FRONTIER_PATH)
+        if args.fresh:
+            frontier.reset()
+        crawl(mongo_handler, archive, frontier, discovery=args.discovery)
+        frontier.close()
 
     # Test MongoDB connection
     total_documents = mongo_handler.count_documents()
     logging.info(f"Total documents in collection: {total_documents}")
-    
+
     if total_documents > 0:
         sample_document = mongo_handler.get_sample_document()
         logging.info(f"Sample document: {sample_document}")
@@ -44,4 +221,4 @@ def main():
     mongo_handler.close_connection()
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
@@ -0,0 +1,361 @@
+import argparse
+import hashlib
+import json
+import logging
+import os
+import subprocess
+import sys
+import threading
+import time
+from abc import ABC, abstractmethod
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from typing import Callable, Dict, List, Optional
+from src.config import (
+    BM25_INDEX_PATH,
+    COLLECTION_NAME,
+    EMBEDDING_BACKEND,
+    DATABASE_NAME,
+    ELASTICSEARCH_URL,
+    INDEX_ALIAS,
+    MONGODB_URI,
+    PIPELINE_JOBS,
+    PIPELINE_STATE_PATH,
+    PROJECT_DIR,
+    ROOT_URL,
+    SNAPSHOT_PATH,
+)
+
+RAN, WOULD_RUN, SKIPPED, FAILED, BLOCKED = "ran", "would run", "skipped", "failed", "blocked"
+
+
+def _digest(parts) -> str:
+    h = hashlib.sha256()
+    for part in parts:
+        h.update(part if isinstance(part, bytes) else str(part).encode("utf-8"))
+        h.update(b"\x00")
+    return h.hexdigest()
+
+
+class Artifact(ABC):
+    """Something a stage reads or writes, identified by a content fingerprint.
+
+    `fingerprint` returns None when the content cannot be determined, which makes
+    every stage reading the artifact run.
+    """
+
+    def __init__(self, name: str):
+        self.name = name
+
+    @abstractmethod
+    def fingerprint(self) -> Optional[str]:
+        ...
+
+    def __repr__(self) -> str:
+        return self.name
+
+
+class FileArtifact(Artifact):
+    """A file or directory tree (e.g. source code, a snapshot), hashed by content."""
+
+    def __init__(self, path: str):
+        super().__init__(path)
+        self.path = path if os.path.isabs(path) else os.path.join(PROJECT_DIR, path)
+
+    def _files(self) -> List[str]:
+        if os.path.isfile(self.path):
+            return [self.path]
+        files = []
+        for directory, subdirectories, names in os.walk(self.path):
+            subdirectories[:] = sorted(d for d in subdirectories if d != "__pycache__")
+            files.extend(os.path.join(directory, name) for name in sorted(names) if not name.endswith(".pyc"))
+        return files
+
+    def fingerprint(self) -> Optional[str]:
+        if not os.path.exists(self.path):
+            return None
+        h = hashlib.sha256()
+        for path in self._files():
+            h.update(os.path.relpath(path, self.path).encode("utf-8") + b"\x00")
+            with open(path, "rb") as f:
+                for block in iter(lambda: f.read(1 << 20), b""):
+                    h.update(block)
+        return h.hexdigest()
+
+
+class ValueArtifact(Artifact):
+    """A setting read from the environment, e.g. the embedding backend."""
+
+    def __init__(self, name: str, value):
+        super().__init__(name)
+        self.value = value
+
+    def fingerprint(self) -> Optional[str]:
+        return _digest([self.value])
+
+
+class MongoCollectionArtifact(Artifact):
+    """The scraped posts. Uses the server's dbHash and falls back to hashing the documents."""
+
+    def __init__(self, uri: str = MONGODB_URI, database_name: str = DATABASE_NAME,
+                 collection_name: str = COLLECTION_NAME, collection=None):
+        super().__init__(f"mongo:{database_name}.{collection_name}")
+        self.uri = uri
+        self.database_name = database_name
+        self.collection_name = collection_name
+        self.collection = collection
+
+    def fingerprint(self) -> Optional[str]:
+        from pymongo import MongoClient
+        client = None
+        collection = self.collection
+        if collection is None:
+            client = MongoClient(self.uri, serverSelectionTimeoutMS=5000)
+            collection = client[self.database_name][self.collection_name]
+        try:
+            try:
+                result = collection.database.command("dbHash", collections=[self.collection_name])
+                return result["collections"].get(self.collection_name, "empty")
+            except Exception:
+                # dbHash is unavailable on some deployments and in mongomock
+                docs = collection.find({}, sort=[("url", 1)])
+                return _digest(json.dumps(doc, sort_keys=True, default=str) for doc in docs)
+        except Exception as e:
+            logging.warning(f"Could not fingerprint {self.name}: {e}")
+            return None
+        finally:
+            if client is not None:
+                client.close()
+
+
+class ElasticsearchAliasArtifact(Artifact):
+    """The search index: the concrete index behind the alias and its document count."""
+
+    def __init__(self, url: str = ELASTICSEARCH_URL, alias: str = INDEX_ALIAS):
+        super().__init__(f"es:{alias}")
+        self.url = url
+        self.alias = alias
+
+    def fingerprint(self) -> Optional[str]:
+        from elasticsearch import Elasticsearch
+        from src.search.index_manager import alias_version
+        try:
+            es_client = Elasticsearch(self.url)
+            if not es_client.indices.exists(index=self.alias):
+                return None
+            return _digest([alias_version(es_client, self.alias), es_client.count(index=self.alias)["count"]])
+        except Exception as e:
+            logging.warning(f"Could not fingerprint {self.name}: {e}")
+            return None
+
+
+class SitemapArtifact(Artifact):
+    """The remote blog, fingerprinted by the URLs and lastmod dates listed in its sitemaps."""
+
+    def __init__(self, root: str = ROOT_URL):
+        super().__init__(f"sitemap:{root}")
+        self.root = root
+
+    def fingerprint(self) -> Optional[str]:
+        from src.scraper.sitemap import extract_sitemap_urls
+        if not self.root:
+            return None
+        try:
+            lastmods = extract_sitemap_urls(self.root)
+        except Exception as e:
+            logging.warning(f"Could not fingerprint {self.name}: {e}")
+            return None
+        if lastmods is None or any(lastmod is None for lastmod in lastmods.values()):
+            return None  # without lastmod dates, changes to the site cannot be detected
+        return _digest(f"{url} {lastmod}" for url, lastmod in sorted(lastmods.items()))
+
+
+def command(*argv: str) -> Callable[[], None]:
+    """A stage action running a script of this project in a subprocess."""
+    def run():
+        subprocess.run([sys.executable, *argv], cwd=PROJECT_DIR, check=True)
+    return run
+
+
+class Stage:
+    def __init__(self, name: str, action: Callable[[], None], inputs: List[Artifact],
+                 outputs: Optional[List[Artifact]] = None):
+        self.name = name
+        self.action = action
+        self.inputs = inputs
+        self.outputs = outputs or []
+
+
+class StageResult:
+    def __init__(self, name: str, status: str, seconds: float = 0.0, error: Optional[str] = None):
+        self.name = name
+        self.status = status
+        self.seconds = seconds
+        self.error = error
+
+
+class Pipeline:
+    """Runs stages make-style: in dependency order, skipping up-to-date stages.
+
+    A stage depends on the stages producing any of its inputs. It is up to date when
+    the fingerprints of its inputs and outputs equal those recorded after its last
+    successful run. Stages whose dependencies are satisfied run concurrently, up to
+    `jobs` at a time.
+    """
+
+    def __init__(self, stages: List[Stage], state_path: str = PIPELINE_STATE_PATH, jobs: int = PIPELINE_JOBS):
+        self.stages = {stage.name: stage for stage in stages}
+        self.state_path = state_path
+        self.jobs = jobs
+        self._lock = threading.Lock()
+        producers = {artifact.name: stage.name for stage in stages for artifact in stage.outputs}
+        self.dependencies = {stage.name: sorted({producers[a.name] for a in stage.inputs
+                                                 if a.name in producers and producers[a.name] != stage.name})
+                             for stage in stages}
+        self.state = self._load_state()
+
+    def _load_state(self) -> Dict[str, Dict]:
+        if not os.path.exists(self.state_path):
+            return {}
+        with open(self.state_path, "r", encoding="utf-8") as f:
+            return json.load(f)
+
+    def _save_state(self):
+        directory = os.path.dirname(self.state_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        tmp_path = self.state_path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(self.state, f, indent=2, sort_keys=True)
+        os.replace(tmp_path, self.state_path)
+
+    def with_dependencies(self, targets: List[str]) -> List[str]:
+        """The targets and every stage they depend on, directly or not."""
+        selected, pending = set(), list(targets)
+        while pending:
+            name = pending.pop()
+            if name not in self.stages:
+                raise ValueError(f"Unknown stage: {name}")
+            if name not in selected:
+                selected.add(name)
+                pending.extend(self.dependencies[name])
+        return [name for name in self.stages if name in selected]
+
+    @staticmethod
+    def _fingerprints(artifacts: List[Artifact]) -> Dict[str, Optional[str]]:
+        return {artifact.name: artifact.fingerprint() for artifact in artifacts}
+
+    def is_up_to_date(self, stage: Stage, inputs: Dict[str, Optional[str]]) -> bool:
+        recorded = self.state.get(stage.name)
+        if recorded is None or None in inputs.values() or recorded["inputs"] != inputs:
+            return False
+        outputs = self._fingerprints(stage.outputs)
+        return None not in outputs.values() and recorded["outputs"] == outputs
+
+    def _run_stage(self, stage: Stage, force: bool, dry_run: bool, upstream_ran: bool) -> StageResult:
+        inputs = self._fingerprints(stage.inputs)
+        # In a dry run nothing upstream really changes, so a stage after one that would run would run too
+        if not force and not (dry_run and upstream_ran) and self.is_up_to_date(stage, inputs):
+            logging.info(f"[{stage.name}] up to date, skipping")
+            return StageResult(stage.name, SKIPPED)
+        if dry_run:
+            logging.info(f"[{stage.name}] would run")
+            return StageResult(stage.name, WOULD_RUN)
+        logging.info(f"[{stage.name}] running")
+        start = time.perf_counter()
+        try:
+            stage.action()
+        except Exception as e:
+            logging.error(f"[{stage.name}] failed: {e}")
+            return StageResult(stage.name, FAILED, time.perf_counter() - start, str(e))
+        seconds = time.perf_counter() - start
+        with self._lock:
+            self.state[stage.name] = {"inputs": inputs, "outputs": self._fingerprints(stage.outputs),
+                                      "seconds": round(seconds, 3), "finished_at": time.time()}
+            self._save_state()
+        logging.info(f"[{stage.name}] done in {seconds:.2f}s")
+        return StageResult(stage.name, RAN, seconds)
+
+    def run(self, targets: Optional[List[str]] = None, force: bool = False,
+            dry_run: bool = False) -> List[StageResult]:
+        """Runs the targets (all stages by default) and returns per-stage results in stage order."""
+        selected = self.with_dependencies(targets or list(self.stages))
+        results: Dict[str, StageResult] = {}
+        running = {}
+        with ThreadPoolExecutor(max_workers=self.jobs) as executor:
+            while len(results) < len(selected):
+                for name in selected:
+                    if name in results or name in running.values():
+                        continue
+                    dependencies = [results.get(dep) for dep in self.dependencies[name]]
+                    if any(r is not None and r.status in (FAILED, BLOCKED) for r in dependencies):
+                        logging.warning(f"[{name}] not run because a stage it depends on failed")
+                        results[name] = StageResult(name, BLOCKED)
+                    elif all(r is not None for r in dependencies):
+                        upstream_ran = any(r.status in (RAN, WOULD_RUN) for r in dependencies)
+                        future = executor.submit(self._run_stage, self.stages[name], force, dry_run, upstream_ran)
+                        running[future] = name
+                if not running:
+                    if len(results) < len(selected):
+                        raise ValueError("Stage dependencies form a cycle")
+                    break
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in done:
+                    results[running.pop(future)] = future.result()
+        return [results[name] for name in selected]
+
+
+def report(results: List[StageResult], wall_seconds: float) -> str:
+    lines = [f"{'stage':<16}{'status':<10}{'seconds':>10}"]
+    for result in results:
+        lines.append(f"{result.name:<16}{result.status:<10}{result.seconds:>10.2f}"
+                     + (f"  {result.error}" if result.error else ""))
+    lines.append(f"{'total (wall)':<26}{wall_seconds:>10.2f}")
+    return "\n".join(lines)
+
+
+def default_stages() -> List[Stage]:
+    """scrape -> (validate-mongo, index) ; index -> (validate-es, bm25)."""
+    posts = MongoCollectionArtifact()
+    search_index = ElasticsearchAliasArtifact()
+    snapshot = FileArtifact(SNAPSHOT_PATH)
+    config = FileArtifact("src/config.py")
+    return [
+        Stage("scrape", command("-m", "src.main"),
+              inputs=[SitemapArtifact(), config, FileArtifact("src/main.py"), FileArtifact("src/scraper"),
+                      FileArtifact("src/utils")],
+              outputs=[posts]),
+        Stage("validate-mongo", command("check_data_in_mongo.py"),
+              inputs=[posts, FileArtifact("check_data_in_mongo.py")]),
+        Stage("index", command("hybrid_search.py", "--rebuild", "--export-snapshot", SNAPSHOT_PATH),
+              inputs=[posts, config, FileArtifact("hybrid_search.py"), FileArtifact("src/search"),
+                      FileArtifact("src/db"), FileArtifact("src/utils"),
+                      ValueArtifact("EMBEDDING_BACKEND", EMBEDDING_BACKEND)],
+              outputs=[search_index, snapshot]),
+        Stage("validate-es", command("check_data_in_es.py"),
+              inputs=[search_index, FileArtifact("check_data_in_es.py")]),
+        Stage("bm25", command("-m", "src.search.bm25_index", "build", "--from-snapshot", SNAPSHOT_PATH,
+                              "--path", BM25_INDEX_PATH),
+              inputs=[snapshot, FileArtifact("src/search/bm25_index.py")],
+              outputs=[FileArtifact(BM25_INDEX_PATH)]),
+    ]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run the scrape, index and validate stages, skipping up-to-date ones.")
+    parser.add_argument("stages", nargs="*", help="stages to run with their dependencies (default: all)")
+    parser.add_argument("--force", action="store_true", help="run the selected stages even if they are up to date")
+    parser.add_argument("--dry-run", action="store_true", help="only report which stages would run")
+    parser.add_argument("--jobs", type=int, default=PIPELINE_JOBS, help="stages to run concurrently")
+    parser.add_argument("--state", default=PIPELINE_STATE_PATH, help="where fingerprints of past runs are kept")
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+
+    pipeline = Pipeline(default_stages(), state_path=args.state, jobs=args.jobs)
+    start = time.perf_counter()
+    results = pipeline.run(args.stages, force=args.force, dry_run=args.dry_run)
+    print(report(results, time.perf_counter() - start))
+    sys.exit(1 if any(result.status in (FAILED, BLOCKED) for result in results) else 0)
+
+
+if __name__ == "__main__":
+    main()
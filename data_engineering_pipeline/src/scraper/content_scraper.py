@@ -1,7 +1,7 @@
 from typing import Dict, List
 from bs4 import BeautifulSoup
 from src.utils.helpers import replace_strange_chars
-from src.config import EXCLUDE_STARTSWITH
+from src.utils.cleaning import default_cleaner
 import logging
 
 def get_meta_data(soup: BeautifulSoup) -> Dict[str, str]:
@@ -35,13 +35,7 @@ def get_meta_data(soup: BeautifulSoup) -> Dict[str, str]:
 def get_paragraphs(soup: BeautifulSoup) -> List[str]:
     """Extracts and cleans paragraphs from the blog content, excluding certain phrases."""
     paragraphs_html = soup.find_all("p", class_="p1") or soup.find_all("p")
-    paragraphs_raw = [replace_strange_chars(para_html.get_text().strip()) for para_html in paragraphs_html]
-
-    paragraphs_clean = [
-        para_raw
-        for para_raw in paragraphs_raw
-        if para_raw and not any(para_raw.startswith(prefix) for prefix in EXCLUDE_STARTSWITH)
-    ]
+    paragraphs_clean = default_cleaner().clean([para_html.get_text() for para_html in paragraphs_html])
     logging.info(f"Extracted {len(paragraphs_clean)} clean paragraphs")
     return paragraphs_clean
 
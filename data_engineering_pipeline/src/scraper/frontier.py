@@ -0,0 +1,143 @@
+import logging
+import os
+import sqlite3
+import time
+from typing import Dict, Iterable, List, Optional, Tuple
+from src.config import FRONTIER_CHECKPOINT_EVERY, FRONTIER_MAX_ATTEMPTS
+
+DISCOVERED, IN_FLIGHT, DONE, FAILED = "discovered", "in_flight", "done", "failed"
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS urls (
+    url TEXT PRIMARY KEY,
+    state TEXT NOT NULL,
+    attempts INTEGER NOT NULL DEFAULT 0,
+    last_error TEXT,
+    lastmod TEXT,
+    updated_at REAL
+);
+CREATE INDEX IF NOT EXISTS urls_state ON urls (state);
+CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT);
+"""
+
+
+class CrawlFrontier:
+    """Crawl state persisted in SQLite so an interrupted run can pick up where it stopped.
+
+    State changes are buffered in memory and written in one transaction every
+    `checkpoint_every` updates. A hard kill therefore loses at most one batch,
+    whose URLs are simply fetched again on the next run. URLs found in flight
+    when the frontier is reopened were interrupted and go back to `discovered`.
+    """
+
+    def __init__(self, path: str, checkpoint_every: int = FRONTIER_CHECKPOINT_EVERY,
+                 max_attempts: int = FRONTIER_MAX_ATTEMPTS):
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self.path = path
+        self.checkpoint_every = checkpoint_every
+        self.max_attempts = max_attempts
+        self.conn = sqlite3.connect(path)
+        self.conn.executescript(SCHEMA)
+        columns = {row[1] for row in self.conn.execute("PRAGMA table_info(urls)")}
+        if "lastmod" not in columns:  # frontier files written before sitemap discovery
+            self.conn.execute("ALTER TABLE urls ADD COLUMN lastmod TEXT")
+        self._pending: Dict[str, Tuple[str, int, Optional[str]]] = {}
+        with self.conn:
+            recovered = self.conn.execute(
+                "UPDATE urls SET state = ? WHERE state = ?", (DISCOVERED, IN_FLIGHT)
+            ).rowcount
+        if recovered:
+            logging.info(f"Recovered {recovered} interrupted URLs from {path}")
+
+    @property
+    def discovery_complete(self) -> bool:
+        row = self.conn.execute("SELECT value FROM meta WHERE key = 'discovery_complete'").fetchone()
+        return row is not None and row[0] == "1"
+
+    def mark_discovery_complete(self):
+        with self.conn:
+            self.conn.execute("INSERT OR REPLACE INTO meta (key, value) VALUES ('discovery_complete', '1')")
+
+    def reset(self):
+        """Forgets all crawl state so the next run starts from discovery."""
+        self._pending.clear()
+        with self.conn:
+            self.conn.execute("DELETE FROM urls")
+            self.conn.execute("DELETE FROM meta")
+
+    def add_urls(self, urls: Iterable[str], lastmods: Optional[Dict[str, Optional[str]]] = None) -> int:
+        """Adds newly discovered URLs, ignoring ones already known. Returns how many were new.
+
+        With `lastmods`, known URLs whose lastmod changed are queued again with a fresh
+        attempt count, while unchanged ones keep their state and are skipped.
+        """
+        lastmods = lastmods or {}
+        now = time.time()
+        with self.conn:
+            before = self.conn.total_changes
+            self.conn.executemany(
+                "INSERT OR IGNORE INTO urls (url, state, lastmod, updated_at) VALUES (?, ?, ?, ?)",
+                [(url, DISCOVERED, lastmods.get(url), now) for url in urls],
+            )
+            added = self.conn.total_changes - before
+            before = self.conn.total_changes
+            self.conn.executemany(
+                "UPDATE urls SET state = ?, attempts = 0, lastmod = ?, updated_at = ? "
+                "WHERE url = ? AND lastmod IS NOT ?",
+                [(DISCOVERED, lastmod, now, url, lastmod) for url, lastmod in lastmods.items() if lastmod],
+            )
+            changed = self.conn.total_changes - before
+        logging.info(f"Frontier: {added} new URLs, {changed} changed since last crawl")
+        return added
+
+    def get_attempts(self, url: str) -> int:
+        if url in self._pending:
+            return self._pending[url][1]
+        row = self.conn.execute("SELECT attempts FROM urls WHERE url = ?", (url,)).fetchone()
+        return row[0] if row else 0
+
+    def pending(self) -> List[str]:
+        """URLs still to fetch: never attempted, interrupted, or failed with attempts left."""
+        self.checkpoint()
+        rows = self.conn.execute(
+            "SELECT url FROM urls WHERE state = ? OR (state = ? AND attempts < ?) ORDER BY rowid",
+            (DISCOVERED, FAILED, self.max_attempts),
+        )
+        return [row[0] for row in rows]
+
+    def _update(self, url: str, state: str, attempts: int, error: Optional[str] = None):
+        self._pending[url] = (state, attempts, error)
+        if len(self._pending) >= self.checkpoint_every:
+            self.checkpoint()
+
+    def mark_in_flight(self, url: str):
+        self._update(url, IN_FLIGHT, self.get_attempts(url) + 1)
+
+    def mark_done(self, url: str):
+        self._update(url, DONE, self.get_attempts(url))
+
+    def mark_failed(self, url: str, error: str):
+        self._update(url, FAILED, self.get_attempts(url), error)
+
+    def checkpoint(self):
+        """Writes buffered state changes in a single transaction."""
+        if not self._pending:
+            return
+        now = time.time()
+        with self.conn:
+            self.conn.executemany(
+                "UPDATE urls SET state = ?, attempts = ?, last_error = ?, updated_at = ? WHERE url = ?",
+                [(state, attempts, error, now, url) for url, (state, attempts, error) in self._pending.items()],
+            )
+        logging.debug(f"Frontier checkpoint: {len(self._pending)} updates")
+        self._pending.clear()
+
+    def counts(self) -> Dict[str, int]:
+        self.checkpoint()
+        return dict(self.conn.execute("SELECT state, COUNT(*) FROM urls GROUP BY state").fetchall())
+
+    def close(self):
+        self.checkpoint()
+        self.conn.close()
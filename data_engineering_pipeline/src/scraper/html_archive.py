@@ -0,0 +1,130 @@
+import gzip
+import json
+import logging
+import os
+import time
+from typing import Dict, Iterator, Optional, Tuple
+
+try:
+    import zstandard
+except ImportError:  # zstd is optional, gzip is always available
+    zstandard = None
+
+try:
+    import fcntl
+except ImportError:  # no advisory locks on Windows; the archive is then single-writer
+    fcntl = None
+
+DATA_FILE = "records.bin"
+INDEX_FILE = "index.jsonl"
+
+
+def _compress(data: bytes, codec: str) -> bytes:
+    if codec == "zstd":
+        return zstandard.ZstdCompressor(level=3).compress(data)
+    return gzip.compress(data, compresslevel=6)
+
+
+def _decompress(data: bytes, codec: str) -> bytes:
+    if codec == "zstd":
+        if zstandard is None:
+            raise ImportError("This archive record is zstd-compressed, reading it requires zstandard: "
+                              "pip install zstandard")
+        return zstandard.ZstdDecompressor().decompress(data)
+    return gzip.decompress(data)
+
+
+class HtmlArchive:
+    """Append-only store of raw HTTP responses, WARC-like.
+
+    Every record is compressed on its own and appended to a single data file, while
+    an offset index (one JSON line per record) allows random access and sequential
+    streaming without decompressing unrelated records. Re-fetching a URL appends a
+    new record; readers always see the latest one.
+    """
+
+    def __init__(self, directory: str, codec: str = "gzip"):
+        if codec == "zstd" and zstandard is None:
+            logging.warning("zstandard is not installed, falling back to gzip for the HTML archive")
+            codec = "gzip"
+        if codec not in ("gzip", "zstd"):
+            raise ValueError(f"Unsupported archive codec: {codec}")
+        self.codec = codec
+        self.directory = directory
+        os.makedirs(directory, exist_ok=True)
+        self.data_path = os.path.join(directory, DATA_FILE)
+        self.index_path = os.path.join(directory, INDEX_FILE)
+        self._index = self._load_index()
+
+    def _load_index(self) -> Dict[str, Dict]:
+        """Loads the offset index, keeping the latest entry per URL."""
+        index = {}
+        if not os.path.exists(self.index_path):
+            return index
+        with open(self.index_path, "r", encoding="utf-8") as f:
+            for line in f:
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    entry = json.loads(line)
+                except json.JSONDecodeError:
+                    # A crash mid-write can leave a truncated last line; the record is simply lost.
+                    logging.warning(f"Skipping corrupt archive index line in {self.index_path}")
+                    continue
+                index[entry["url"]] = entry
+        return index
+
+    def __len__(self) -> int:
+        return len(self._index)
+
+    def __contains__(self, url: str) -> bool:
+        return url in self._index
+
+    def append(self, url: str, content: bytes, status: int = 200, fetched_at: Optional[float] = None) -> Dict:
+        """Compresses and appends a raw response, then records its offset in the index.
+
+        An exclusive lock on the data file is held for the whole append, so several
+        crawler processes can share one archive.
+        """
+        payload = _compress(content, self.codec)
+        with open(self.data_path, "ab") as data_file:
+            if fcntl is not None:
+                fcntl.flock(data_file, fcntl.LOCK_EX)
+            data_file.seek(0, os.SEEK_END)
+            offset = data_file.tell()
+            data_file.write(payload)
+            data_file.flush()
+            entry = {
+                "url": url,
+                "offset": offset,
+                "length": len(payload),
+                "codec": self.codec,
+                "status": status,
+                "fetched_at": fetched_at if fetched_at is not None else time.time(),
+                "raw_length": len(content),
+            }
+            # The index line is written after the data so a crash never indexes a partial record.
+            with open(self.index_path, "a", encoding="utf-8") as index_file:
+                index_file.write(json.dumps(entry) + "\n")
+        self._index[url] = entry
+        return entry
+
+    def get(self, url: str) -> Optional[bytes]:
+        """Returns the latest raw content stored for a URL, or None."""
+        entry = self._index.get(url)
+        if entry is None:
+            return None
+        with open(self.data_path, "rb") as data_file:
+            data_file.seek(entry["offset"])
+            return _decompress(data_file.read(entry["length"]), entry["codec"])
+
+    def iter_records(self) -> Iterator[Tuple[str, bytes]]:
+        """Streams (url, raw content) for the latest record of every URL in file order."""
+        entries = sorted(self._index.values(), key=lambda e: e["offset"])
+        if not entries:
+            return
+        with open(self.data_path, "rb") as data_file:
+            for entry in entries:
+                data_file.seek(entry["offset"])
+                yield entry["url"], _decompress(data_file.read(entry["length"]), entry["codec"])
@@ -0,0 +1,198 @@
+import logging
+import random
+import threading
+import time
+from email.utils import parsedate_to_datetime
+from typing import Dict, Optional
+from urllib.parse import urlparse
+import requests
+from src.config import (
+    USER_AGENT,
+    REQUEST_TIMEOUT,
+    WAIT_TIME,
+    MIN_WAIT_TIME,
+    MAX_WAIT_TIME,
+    RATE_INCREASE,
+    RATE_DECREASE_FACTOR,
+    TARGET_LATENCY,
+    MAX_RETRIES,
+    BACKOFF_BASE,
+    BACKOFF_MAX,
+    CIRCUIT_FAILURE_THRESHOLD,
+    CIRCUIT_COOLDOWN,
+)
+
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """Parses a Retry-After header given either as seconds or as an HTTP date."""
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+
+class AdaptiveRateLimiter:
+    """Paces requests to one host with additive-increase/multiplicative-decrease.
+
+    Every fast successful response raises the allowed rate by a constant; throttling,
+    server errors and slow responses halve it. A Retry-After from the server blocks
+    all requests to the host until it has passed.
+    """
+
+    def __init__(self, initial_interval: float = WAIT_TIME, min_interval: float = MIN_WAIT_TIME,
+                 max_interval: float = MAX_WAIT_TIME, increase: float = RATE_INCREASE,
+                 decrease_factor: float = RATE_DECREASE_FACTOR, target_latency: float = TARGET_LATENCY):
+        self.max_rate = 1.0 / min_interval
+        self.min_rate = 1.0 / max_interval
+        self.rate = min(max(1.0 / initial_interval, self.min_rate), self.max_rate)
+        self.increase = increase
+        self.decrease_factor = decrease_factor
+        self.target_latency = target_latency
+        self._next_allowed = 0.0
+        self._lock = threading.Lock()
+
+    @property
+    def interval(self) -> float:
+        return 1.0 / self.rate
+
+    def acquire(self):
+        """Blocks until the next request to the host is allowed."""
+        with self._lock:
+            now = time.monotonic()
+            start = max(now, self._next_allowed)
+            self._next_allowed = start + self.interval
+        if start > now:
+            time.sleep(start - now)
+
+    def on_success(self, latency: float):
+        with self._lock:
+            if latency > self.target_latency:
+                self.rate = max(self.rate * self.decrease_factor, self.min_rate)
+            else:
+                self.rate = min(self.rate + self.increase, self.max_rate)
+
+    def on_throttle(self, retry_after: Optional[float] = None):
+        with self._lock:
+            self.rate = max(self.rate * self.decrease_factor, self.min_rate)
+            if retry_after:
+                self._next_allowed = max(self._next_allowed, time.monotonic() + retry_after)
+        logging.info(f"Backing off: rate now {self.rate:.2f} req/s"
+                     + (f", Retry-After {retry_after:.1f}s" if retry_after else ""))
+
+
+class CircuitBreaker:
+    """Stops requests to a host after repeated failures, probing again after a cooldown."""
+
+    CLOSED, OPEN, HALF_OPEN = "closed", "open", "half-open"
+
+    def __init__(self, failure_threshold: int = CIRCUIT_FAILURE_THRESHOLD, cooldown: float = CIRCUIT_COOLDOWN):
+        self.failure_threshold = failure_threshold
+        self.cooldown = cooldown
+        self.state = self.CLOSED
+        self.failures = 0
+        self._opened_at = 0.0
+        self._lock = threading.Lock()
+
+    def allow(self) -> bool:
+        with self._lock:
+            if self.state == self.OPEN and time.monotonic() - self._opened_at >= self.cooldown:
+                self.state = self.HALF_OPEN
+                return True  # a single probe request
+            return self.state == self.CLOSED
+
+    def record_success(self):
+        with self._lock:
+            self.state = self.CLOSED
+            self.failures = 0
+
+    def record_throttle(self):
+        """A 429 is not a host failure, but it is a failed probe: reopen for another cooldown."""
+        with self._lock:
+            if self.state == self.HALF_OPEN:
+                self.state = self.OPEN
+                self._opened_at = time.monotonic()
+
+    def record_failure(self):
+        with self._lock:
+            self.failures += 1
+            if self.state == self.HALF_OPEN or self.failures >= self.failure_threshold:
+                if self.state != self.OPEN:
+                    logging.warning(f"Circuit opened after {self.failures} consecutive failures")
+                self.state = self.OPEN
+                self._opened_at = time.monotonic()
+
+
+class Fetcher:
+    """HTTP fetcher with per-host adaptive pacing, jittered retries and circuit breaking."""
+
+    def __init__(self, max_retries: int = MAX_RETRIES, backoff_base: float = BACKOFF_BASE,
+                 backoff_max: float = BACKOFF_MAX, timeout: float = REQUEST_TIMEOUT,
+                 limiter_kwargs: Optional[Dict] = None, breaker_kwargs: Optional[Dict] = None):
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.timeout = timeout
+        self.limiter_kwargs = limiter_kwargs or {}
+        self.breaker_kwargs = breaker_kwargs or {}
+        self.session = requests.Session()
+        self.session.headers["User-Agent"] = USER_AGENT
+        self.limiters: Dict[str, AdaptiveRateLimiter] = {}
+        self.breakers: Dict[str, CircuitBreaker] = {}
+        self._lock = threading.Lock()
+
+    def _host_state(self, url: str):
+        host = urlparse(url).netloc
+        with self._lock:
+            if host not in self.limiters:
+                self.limiters[host] = AdaptiveRateLimiter(**self.limiter_kwargs)
+                self.breakers[host] = CircuitBreaker(**self.breaker_kwargs)
+            return self.limiters[host], self.breakers[host]
+
+    def _backoff(self, attempt: int) -> float:
+        # "Full jitter": uniform in [0, base * 2**attempt], capped.
+        return random.uniform(0, min(self.backoff_max, self.backoff_base * 2 ** attempt))
+
+    def fetch(self, url: str) -> Optional[requests.Response]:
+        """Fetches a URL, retrying transient failures.
+
+        Returns the final response (which may still carry an error status once
+        retries are exhausted or for non-retryable 4xx), or None if no response
+        was received or the host's circuit is open.
+        """
+        limiter, breaker = self._host_state(url)
+        response = None
+        for attempt in range(self.max_retries + 1):
+            if not breaker.allow():
+                logging.warning(f"Circuit open for {urlparse(url).netloc}, skipping {url}")
+                return None
+            limiter.acquire()
+            start = time.monotonic()
+            try:
+                response = self.session.get(url, timeout=self.timeout)
+            except requests.exceptions.RequestException as e:
+                logging.warning(f"Attempt {attempt + 1} for {url} failed: {e}")
+                response = None
+                breaker.record_failure()
+                limiter.on_throttle()
+            else:
+                status = response.status_code
+                if status == 429:
+                    breaker.record_throttle()
+                    limiter.on_throttle(parse_retry_after(response.headers.get("Retry-After")))
+                elif status >= 500:
+                    breaker.record_failure()
+                    limiter.on_throttle(parse_retry_after(response.headers.get("Retry-After")))
+                else:
+                    breaker.record_success()
+                    limiter.on_success(time.monotonic() - start)
+                    return response
+                logging.warning(f"Attempt {attempt + 1} for {url} returned {status}")
+            if attempt < self.max_retries:
+                time.sleep(self._backoff(attempt))
+        return response
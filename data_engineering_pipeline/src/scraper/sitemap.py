@@ -0,0 +1,98 @@
+import gzip
+import io
+import logging
+from typing import Dict, Iterator, List, Optional, Tuple
+from urllib.parse import urljoin, urlparse
+import xml.etree.ElementTree as ET
+from src.config import ROOT_URL, SITEMAP_PATHS
+from src.scraper.rate_limiter import Fetcher
+from src.scraper.url_extractor import default_fetcher, filter_links, clean_urls
+
+GZIP_MAGIC = b"\x1f\x8b"
+
+
+SITEMAP_NS = "{http://www.sitemaps.org/schemas/sitemap/0.9}"
+ENTRY_TAGS = {SITEMAP_NS + "url": "url", SITEMAP_NS + "sitemap": "sitemap", "url": "url", "sitemap": "sitemap"}
+
+
+def _child_text(elem: ET.Element, name: str) -> Optional[str]:
+    # Only direct children in the sitemap namespace (or none, for sloppy generators),
+    # so extensions such as <image:loc> do not shadow the page's own <loc>.
+    for child in elem:
+        if child.tag in (SITEMAP_NS + name, name):
+            return (child.text or "").strip() or None
+    return None
+
+
+def iter_sitemap_entries(content: bytes) -> Iterator[Tuple[str, str, Optional[str]]]:
+    """Streams (kind, loc, lastmod) from a sitemap or sitemap index, gunzipping if needed.
+
+    `kind` is "sitemap" for entries of a sitemap index and "url" for pages. Elements
+    are cleared as soon as they are read, so memory does not grow with the file.
+    """
+    stream = io.BytesIO(content)
+    if content[:2] == GZIP_MAGIC:
+        stream = gzip.GzipFile(fileobj=stream)
+    for _, elem in ET.iterparse(stream, events=("end",)):
+        kind = ENTRY_TAGS.get(elem.tag)
+        if kind is None:
+            continue
+        loc = _child_text(elem, "loc")
+        if loc:
+            yield kind, loc, _child_text(elem, "lastmod")
+        elem.clear()
+
+
+def find_sitemaps(root: str, fetcher: Fetcher) -> List[str]:
+    """Finds sitemap URLs from robots.txt, falling back to the conventional locations."""
+    parsed = urlparse(root)
+    site = f"{parsed.scheme}://{parsed.netloc}/"
+    response = fetcher.fetch(urljoin(site, "robots.txt"))
+    if response is not None and response.ok:
+        declared = [line.split(":", 1)[1].strip() for line in response.text.splitlines()
+                    if line.lower().startswith("sitemap:")]
+        if declared:
+            return declared
+    for path in SITEMAP_PATHS:
+        url = urljoin(site, path)
+        response = fetcher.fetch(url)
+        if response is not None and response.ok:
+            return [url]
+    return []
+
+
+def extract_sitemap_urls(root: str = ROOT_URL, fetcher: Optional[Fetcher] = None) -> Optional[Dict[str, Optional[str]]]:
+    """Discovers blog post URLs and their lastmod from the site's sitemaps.
+
+    Returns None when the site has no sitemap, so callers can fall back to
+    pagination crawling.
+    """
+    fetcher = fetcher or default_fetcher
+    queue = find_sitemaps(root, fetcher)
+    if not queue:
+        logging.info("No sitemap found")
+        return None
+
+    lastmods: Dict[str, Optional[str]] = {}
+    seen = set()
+    while queue:
+        sitemap_url = queue.pop(0)
+        if sitemap_url in seen:
+            continue
+        seen.add(sitemap_url)
+        response = fetcher.fetch(sitemap_url)
+        if response is None or not response.ok:
+            logging.warning(f"Could not fetch sitemap {sitemap_url}")
+            continue
+        try:
+            for kind, loc, lastmod in iter_sitemap_entries(response.content):
+                if kind == "sitemap":
+                    queue.append(loc)
+                else:
+                    lastmods[loc] = lastmod
+        except (ET.ParseError, OSError, EOFError) as e:
+            logging.error(f"Could not parse sitemap {sitemap_url}: {e}")
+
+    post_urls = [url for url in clean_urls(filter_links(sorted(lastmods), root), root=root) if url != root]
+    logging.info(f"Sitemaps listed {len(lastmods)} URLs, {len(post_urls)} blog posts")
+    return {url: lastmods[url] for url in post_urls}
@@ -1,21 +1,27 @@
-import time
 import logging
 from typing import List, Optional
 from bs4 import BeautifulSoup
 import requests
-from src.config import ROOT_URL, USER_AGENT, REQUEST_TIMEOUT, WAIT_TIME
+from src.config import ROOT_URL, MAX_PAGE_FAILURES
+from src.scraper.rate_limiter import Fetcher
 
-def get_webpage_content(url: str) -> Optional[requests.Response]:
-    """Fetches the HTML content of a webpage."""
+# Shared so pacing and circuit state carry across all requests to a host.
+default_fetcher = Fetcher()
+
+def get_webpage_content(url: str, fetcher: Optional[Fetcher] = None) -> Optional[requests.Response]:
+    """Fetches the HTML content of a webpage, retrying transient failures."""
     logging.debug(f"Fetching URL: {url}")
+    response = (fetcher or default_fetcher).fetch(url)
+    if response is None:
+        logging.error(f"Error fetching URL {url}: no response")
+        return None
     try:
-        response = requests.get(url, headers={"User-Agent": USER_AGENT}, timeout=REQUEST_TIMEOUT)
         response.raise_for_status()
-        logging.info(f"Successfully fetched URL: {url}")
-        return response
-    except requests.exceptions.RequestException as e:
+    except requests.exceptions.HTTPError as e:
         logging.error(f"Error fetching URL {url}: {e}")
         return None
+    logging.info(f"Successfully fetched URL: {url}")
+    return response
 
 def filter_links(links: List[str], root: str) -> List[str]:
     """Filters links by ensuring they start with the root URL and are not pagination links."""
@@ -27,12 +33,14 @@ def filter_links(links: List[str], root: str) -> List[str]:
     logging.info(f"Filtered down to {len(filtered_links)} links")
     return filtered_links
 
-def extract_all_urls(root: str = ROOT_URL, page_stop: Optional[int] = None) -> List[str]:
+def extract_all_urls(root: str = ROOT_URL, page_stop: Optional[int] = None,
+                     fetcher: Optional[Fetcher] = None) -> List[str]:
     """Extracts all blog post URLs from paginated web pages."""
+    fetcher = fetcher or default_fetcher
     i_page = 0
+    failed_pages = 0
     url_list = []
     while True:
-        time.sleep(WAIT_TIME)  # wait a bit to avoid being blocked
         i_page += 1
 
         if page_stop is not None and i_page > page_stop:
@@ -42,9 +50,19 @@ def extract_all_urls(root: str = ROOT_URL, page_stop: Optional[int] = None) -> L
         page_url = root if i_page == 1 else f"{root}page/{i_page}/"
         logging.debug(f"Page URL: {page_url}")
 
-        response = get_webpage_content(page_url)
-        if response is None:
+        response = fetcher.fetch(page_url)
+        if response is not None and response.status_code == 404:
+            logging.info(f"Page {i_page} does not exist, stopping.")
             break
+        if response is None or not response.ok:
+            # A page that keeps failing after retries is skipped rather than ending discovery.
+            failed_pages += 1
+            logging.warning(f"Skipping page {i_page} after repeated failures ({failed_pages} in a row)")
+            if failed_pages >= MAX_PAGE_FAILURES:
+                logging.error(f"{failed_pages} consecutive pages failed, stopping discovery.")
+                break
+            continue
+        failed_pages = 0
 
         soup = BeautifulSoup(response.content, "html.parser")
         links = sorted({link["href"] for link in soup.find_all("a", href=True)})
@@ -61,11 +79,11 @@ def extract_all_urls(root: str = ROOT_URL, page_stop: Optional[int] = None) -> L
     logging.info(f"Extracted {len(url_list)} URLs")
     return list(set(url_list))  # Remove duplicates
 
-def clean_urls(urls: List[str]) -> List[str]:
+def clean_urls(urls: List[str], root: str = ROOT_URL) -> List[str]:
     """Removes URLs that are not blog posts."""
     cleaned_urls = [
         url for url in urls
-        if not url.replace(ROOT_URL, "").replace("/", "").isdigit()
+        if not url.replace(root, "").replace("/", "").isdigit()
     ]
     logging.info(f"Number of unique blog posts after cleanup: {len(cleaned_urls)}")
     return cleaned_urls
\ No newline at end of file
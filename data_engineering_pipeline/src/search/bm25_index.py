@@ -0,0 +1,207 @@
+import argparse
+import json
+import logging
+import math
+import os
+import re
+import time
+from array import array
+from collections import Counter
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+import numpy as np
+from src.config import BM25_B, BM25_FIELD_BOOSTS, BM25_INDEX_PATH, BM25_K1, SNAPSHOT_PATH
+
+TOKEN_PATTERN = re.compile(r"\w+")
+META_FILE = "meta.json"
+
+
+def tokenize(text: str) -> List[str]:
+    """Lowercased word tokens, close to Elasticsearch's standard analyzer."""
+    return TOKEN_PATTERN.findall(text.lower())
+
+
+def _field_text(value: Any) -> str:
+    if value is None:
+        return ""
+    if isinstance(value, (list, tuple)):
+        return " ".join(str(v) for v in value)
+    return str(value)
+
+
+class BM25Index:
+    """In-process inverted index with BM25 scoring over several boosted fields.
+
+    Postings are stored per field in CSR layout: `offsets[t]:offsets[t + 1]` slices
+    `docs` and `tfs` for term t, so a whole field is three flat arrays plus the
+    document lengths. Saved indices are loaded with np.load(mmap_mode="r"), so only
+    the postings of queried terms are paged in. Scoring follows Lucene's BM25 and a
+    `best_fields` multi_match: a document's score is its best boosted field score.
+    """
+
+    def __init__(self, vocabulary: List[str], doc_ids: List[str], fields: Dict[str, Dict[str, np.ndarray]],
+                 boosts: Dict[str, float], k1: float = BM25_K1, b: float = BM25_B):
+        self.vocabulary = vocabulary
+        self.term_ids = {term: i for i, term in enumerate(vocabulary)}
+        self.doc_ids = doc_ids
+        self.fields = fields
+        self.boosts = boosts
+        self.k1 = k1
+        self.b = b
+        # The length normalisation only depends on the document, so it is computed once per field
+        self._norms = {}
+        for field, arrays in fields.items():
+            lengths = np.asarray(arrays["lengths"], dtype=np.float32)
+            avgdl = float(lengths.mean()) if len(lengths) and lengths.mean() > 0 else 1.0
+            self._norms[field] = (k1 * (1 - b + b * lengths / avgdl)).astype(np.float32)
+
+    def __len__(self) -> int:
+        return len(self.doc_ids)
+
+    @classmethod
+    def build(cls, documents: Iterable[Dict[str, Any]], boosts: Optional[Dict[str, float]] = None,
+              id_field: str = "url", k1: float = BM25_K1, b: float = BM25_B) -> "BM25Index":
+        """Builds the index from source documents (as indexed into Elasticsearch)."""
+        boosts = dict(boosts or BM25_FIELD_BOOSTS)
+        vocabulary: Dict[str, int] = {}
+        doc_ids = []
+        terms = {field: array("i") for field in boosts}
+        docs = {field: array("i") for field in boosts}
+        tfs = {field: array("f") for field in boosts}
+        lengths = {field: array("f") for field in boosts}
+        for doc_index, doc in enumerate(documents):
+            doc_ids.append(doc[id_field])
+            for field in boosts:
+                tokens = tokenize(_field_text(doc.get(field)))
+                lengths[field].append(len(tokens))
+                for term, tf in Counter(tokens).items():
+                    terms[field].append(vocabulary.setdefault(term, len(vocabulary)))
+                    docs[field].append(doc_index)
+                    tfs[field].append(tf)
+
+        fields = {}
+        for field in boosts:
+            term_array = np.frombuffer(terms[field], dtype=np.int32)
+            # Stable sort by term keeps each postings list in document order
+            order = np.argsort(term_array, kind="stable")
+            offsets = np.zeros(len(vocabulary) + 1, dtype=np.int64)
+            np.cumsum(np.bincount(term_array, minlength=len(vocabulary)), out=offsets[1:])
+            fields[field] = {
+                "offsets": offsets,
+                "docs": np.frombuffer(docs[field], dtype=np.int32)[order],
+                "tfs": np.frombuffer(tfs[field], dtype=np.float32)[order],
+                "lengths": np.frombuffer(lengths[field], dtype=np.float32).copy(),
+            }
+        return cls(sorted(vocabulary, key=vocabulary.get), doc_ids, fields, boosts, k1, b)
+
+    def save(self, path: str):
+        """Writes one .npy file per array plus a JSON file with the vocabulary and settings."""
+        os.makedirs(path, exist_ok=True)
+        for field, arrays in self.fields.items():
+            for name, values in arrays.items():
+                np.save(os.path.join(path, f"{field}.{name}.npy"), values)
+        meta = {"vocabulary": self.vocabulary, "doc_ids": self.doc_ids, "boosts": self.boosts,
+                "k1": self.k1, "b": self.b}
+        with open(os.path.join(path, META_FILE), "w", encoding="utf-8") as f:
+            json.dump(meta, f)
+        logging.info(f"Saved BM25 index of {len(self)} documents and {len(self.vocabulary)} terms to {path}")
+
+    @classmethod
+    def load(cls, path: str) -> "BM25Index":
+        """Loads a saved index with its postings memory-mapped."""
+        with open(os.path.join(path, META_FILE), "r", encoding="utf-8") as f:
+            meta = json.load(f)
+        fields = {field: {name: np.load(os.path.join(path, f"{field}.{name}.npy"), mmap_mode="r")
+                          for name in ("offsets", "docs", "tfs", "lengths")}
+                  for field in meta["boosts"]}
+        return cls(meta["vocabulary"], meta["doc_ids"], fields, meta["boosts"], meta["k1"], meta["b"])
+
+    def _field_scores(self, field: str, term_ids: List[int]) -> np.ndarray:
+        arrays = self.fields[field]
+        offsets, norms = arrays["offsets"], self._norms[field]
+        n_docs = len(self.doc_ids)
+        scores = np.zeros(n_docs, dtype=np.float32)
+        for term_id in term_ids:
+            start, end = int(offsets[term_id]), int(offsets[term_id + 1])
+            if start == end:
+                continue
+            docs = arrays["docs"][start:end]
+            tfs = arrays["tfs"][start:end]
+            df = end - start
+            idf = math.log(1 + (n_docs - df + 0.5) / (df + 0.5))
+            # A document appears at most once per postings list, so fancy-index addition is safe
+            scores[docs] += idf * tfs / (tfs + norms[docs])
+        return scores
+
+    def scores(self, query: str) -> np.ndarray:
+        """Scores every document for a query; zero means no query term matched."""
+        term_ids = [self.term_ids[token] for token in tokenize(query) if token in self.term_ids]
+        best = np.zeros(len(self.doc_ids), dtype=np.float32)
+        for field, boost in self.boosts.items():
+            np.maximum(best, boost * self._field_scores(field, term_ids), out=best)
+        return best
+
+    def search(self, query: str, k: int = 5) -> List[Tuple[str, float]]:
+        """Returns the top k (document id, score) pairs for a query."""
+        scores = self.scores(query)
+        matched = np.flatnonzero(scores)
+        if len(matched) > k:
+            matched = matched[np.argpartition(scores[matched], -k)[-k:]]
+        ranked = matched[np.argsort(scores[matched])[::-1]]
+        return [(self.doc_ids[i], float(scores[i])) for i in ranked]
+
+
+def documents_from_mongo() -> List[Dict[str, Any]]:
+    """Reads the corpus from MongoDB and builds the fields the search indices use."""
+    from src.db.mongo_handler import MongoHandler
+    from src.utils.dedup import deduplicate_corpus
+    handler = MongoHandler()
+    try:
+        data = list(handler.collection.find({}, {"url": 1, "title": 1, "paragraphs": 1,
+                                                 "key_takeaways": 1, "blog_tags": 1}))
+    finally:
+        handler.close_connection()
+    paragraphs, _ = deduplicate_corpus([doc.get('paragraphs', []) for doc in data])
+    return [{
+        "url": doc["url"],
+        "title": doc["title"],
+        "combined_text": " ".join(doc_paragraphs + doc.get('key_takeaways', [])),
+        "blog_tags": [" ".join(tag) for tag in doc.get('blog_tags', [])],
+    } for doc, doc_paragraphs in zip(data, paragraphs)]
+
+
+def documents_from_snapshot(path: str) -> Iterable[Dict[str, Any]]:
+    from src.db.snapshot import read_snapshot
+    table = read_snapshot(path)
+    return table.select([name for name in ["url", *BM25_FIELD_BOOSTS] if name in table.column_names]).to_pylist()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Build or query the local BM25 index.")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    build_parser = subparsers.add_parser("build", help="build the index from MongoDB or a corpus snapshot")
+    build_parser.add_argument("--from-snapshot", nargs="?", const=SNAPSHOT_PATH, metavar="PATH")
+    build_parser.add_argument("--path", default=BM25_INDEX_PATH)
+    query_parser = subparsers.add_parser("query", help="run a keyword query against a saved index")
+    query_parser.add_argument("query")
+    query_parser.add_argument("--path", default=BM25_INDEX_PATH)
+    query_parser.add_argument("-k", type=int, default=5)
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+
+    if args.command == "build":
+        documents = documents_from_snapshot(args.from_snapshot) if args.from_snapshot else documents_from_mongo()
+        start = time.perf_counter()
+        index = BM25Index.build(documents)
+        logging.info(f"Built BM25 index of {len(index)} documents in {time.perf_counter() - start:.2f}s")
+        index.save(args.path)
+    else:
+        index = BM25Index.load(args.path)
+        start = time.perf_counter()
+        results = index.search(args.query, args.k)
+        logging.info(f"Query took {(time.perf_counter() - start) * 1000:.2f} ms")
+        for url, score in results:
+            print(f"{score:8.3f}  {url}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,164 @@
+import argparse
+import json
+import logging
+import os
+from typing import List, Union
+import numpy as np
+from src.config import EMBEDDING_BACKEND, EMBEDDING_BATCH_SIZE, EMBEDDING_MODEL_NAME, ONNX_MODEL_DIR
+
+try:
+    import onnxruntime
+except ImportError:  # the ONNX backend is optional; the default PyTorch backend does not need it
+    onnxruntime = None
+
+try:
+    from tokenizers import Tokenizer
+except ImportError:
+    Tokenizer = None
+
+FP32_FILE = "model.onnx"
+INT8_FILE = "model.int8.onnx"
+TOKENIZER_FILE = "tokenizer.json"
+SETTINGS_FILE = "settings.json"
+
+
+def mean_pooling(token_embeddings: np.ndarray, attention_mask: np.ndarray) -> np.ndarray:
+    """Averages token embeddings over the non-padding tokens, like sentence-transformers' Pooling."""
+    mask = attention_mask[..., None].astype(token_embeddings.dtype)
+    return (token_embeddings * mask).sum(axis=1) / np.clip(mask.sum(axis=1), 1e-9, None)
+
+
+def l2_normalize(embeddings: np.ndarray) -> np.ndarray:
+    return embeddings / np.clip(np.linalg.norm(embeddings, axis=1, keepdims=True), 1e-12, None)
+
+
+class OnnxEncoder:
+    """Runs an exported sentence-transformers model on onnxruntime.
+
+    Tokenisation, mean pooling and normalisation mirror SentenceTransformer.encode, so
+    the vectors can be used interchangeably with the PyTorch model; `encode` has the
+    same call shape (a string gives one vector, a list gives a matrix). By default the
+    dynamically int8-quantised model is used.
+    """
+
+    def __init__(self, model_dir: str = ONNX_MODEL_DIR, quantized: bool = True, threads: int = 0):
+        if onnxruntime is None or Tokenizer is None:
+            raise ImportError("The ONNX embedding backend requires onnxruntime and tokenizers: "
+                              "pip install onnxruntime tokenizers")
+        with open(os.path.join(model_dir, SETTINGS_FILE), "r", encoding="utf-8") as f:
+            settings = json.load(f)
+        self.dimension = settings["dimension"]
+        self.normalize = settings["normalize"]
+        self.tokenizer = Tokenizer.from_file(os.path.join(model_dir, TOKENIZER_FILE))
+        self.tokenizer.enable_truncation(max_length=settings["max_seq_length"])
+        self.tokenizer.enable_padding(pad_id=settings["pad_token_id"], pad_token=settings["pad_token"])
+        options = onnxruntime.SessionOptions()
+        options.graph_optimization_level = onnxruntime.GraphOptimizationLevel.ORT_ENABLE_ALL
+        options.intra_op_num_threads = threads  # 0 lets onnxruntime use all physical cores
+        model_path = os.path.join(model_dir, INT8_FILE if quantized else FP32_FILE)
+        self.session = onnxruntime.InferenceSession(model_path, options, providers=["CPUExecutionProvider"])
+        logging.info(f"Loaded ONNX embedding model {model_path}")
+
+    def _encode_batch(self, texts: List[str]) -> np.ndarray:
+        encodings = self.tokenizer.encode_batch(texts)
+        input_ids = np.array([e.ids for e in encodings], dtype=np.int64)
+        attention_mask = np.array([e.attention_mask for e in encodings], dtype=np.int64)
+        token_embeddings = self.session.run(None, {"input_ids": input_ids, "attention_mask": attention_mask})[0]
+        embeddings = mean_pooling(token_embeddings, attention_mask)
+        return l2_normalize(embeddings) if self.normalize else embeddings
+
+    def encode(self, sentences: Union[str, List[str]], batch_size: int = EMBEDDING_BATCH_SIZE) -> np.ndarray:
+        single = isinstance(sentences, str)
+        texts = [sentences] if single else list(sentences)
+        if not texts:
+            return np.zeros((0, self.dimension), dtype=np.float32)
+        # Batch texts of similar length together to keep padding low, as sentence-transformers does
+        order = np.argsort([-len(text) for text in texts], kind="stable")
+        batches = [self._encode_batch([texts[i] for i in order[start:start + batch_size]])
+                   for start in range(0, len(texts), batch_size)]
+        embeddings = np.concatenate(batches).astype(np.float32)[np.argsort(order)]
+        return embeddings[0] if single else embeddings
+
+
+def load_encoder(backend: str = EMBEDDING_BACKEND):
+    """Returns the embedding model for the configured backend ("torch" or "onnx")."""
+    if backend == "onnx":
+        return OnnxEncoder(ONNX_MODEL_DIR)
+    if backend == "torch":
+        from sentence_transformers import SentenceTransformer
+        return SentenceTransformer(EMBEDDING_MODEL_NAME)
+    raise ValueError(f"Unknown embedding backend: {backend}")
+
+
+def _pooling_mode(pooling) -> str:
+    config = pooling.get_config_dict()
+    if "pooling_mode" in config:
+        return config["pooling_mode"]
+    # Older sentence-transformers releases store one flag per mode
+    return "+".join(key[len("pooling_mode_"):] for key, value in config.items()
+                    if key.startswith("pooling_mode_") and value is True)
+
+
+def export_onnx(model_name: str = EMBEDDING_MODEL_NAME, output_dir: str = ONNX_MODEL_DIR, quantize: bool = True):
+    """Exports a sentence-transformers model to ONNX and quantises its weights to int8.
+
+    Only the transformer is exported; pooling and normalisation run in numpy, so the
+    model must use mean pooling.
+    """
+    import torch
+    from onnxruntime.quantization import QuantType, quantize_dynamic
+    from sentence_transformers import SentenceTransformer, models
+
+    model = SentenceTransformer(model_name, device="cpu")
+    pooling_mode = _pooling_mode(next(module for module in model if isinstance(module, models.Pooling)))
+    if pooling_mode not in ("mean", "mean_tokens"):
+        raise ValueError(f"{model_name} uses {pooling_mode} pooling, only mean pooling is supported")
+    transformer = model[0].auto_model.eval()
+
+    class TokenEmbeddings(torch.nn.Module):
+        def __init__(self):
+            super().__init__()
+            self.transformer = transformer
+
+        def forward(self, input_ids, attention_mask):
+            return self.transformer(input_ids=input_ids, attention_mask=attention_mask).last_hidden_state
+
+    os.makedirs(output_dir, exist_ok=True)
+    fp32_path = os.path.join(output_dir, FP32_FILE)
+    sample = model.tokenizer(["An example sentence to trace the model with."], return_tensors="pt")
+    with torch.no_grad():
+        torch.onnx.export(
+            TokenEmbeddings(), (sample["input_ids"], sample["attention_mask"]), fp32_path,
+            input_names=["input_ids", "attention_mask"], output_names=["token_embeddings"],
+            dynamic_axes={"input_ids": {0: "batch", 1: "sequence"}, "attention_mask": {0: "batch", 1: "sequence"},
+                          "token_embeddings": {0: "batch", 1: "sequence"}},
+            opset_version=17, dynamo=False,
+        )
+    model.tokenizer.backend_tokenizer.save(os.path.join(output_dir, TOKENIZER_FILE))
+    settings = {
+        "model_name": model_name,
+        "dimension": model.get_sentence_embedding_dimension(),
+        "max_seq_length": model.max_seq_length,
+        "normalize": any(isinstance(module, models.Normalize) for module in model),
+        "pad_token": model.tokenizer.pad_token,
+        "pad_token_id": model.tokenizer.pad_token_id,
+    }
+    with open(os.path.join(output_dir, SETTINGS_FILE), "w", encoding="utf-8") as f:
+        json.dump(settings, f, indent=2)
+    if quantize:
+        quantize_dynamic(fp32_path, os.path.join(output_dir, INT8_FILE), weight_type=QuantType.QInt8)
+    logging.info(f"Exported {model_name} to {output_dir}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Export the embedding model to ONNX with int8 weights.")
+    parser.add_argument("--model", default=EMBEDDING_MODEL_NAME, help="sentence-transformers model name or path")
+    parser.add_argument("--output", default=ONNX_MODEL_DIR)
+    parser.add_argument("--no-quantize", action="store_true", help="only write the float32 model")
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+    export_onnx(args.model, args.output, quantize=not args.no_quantize)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,53 @@
+import argparse
+from typing import Any, Dict, List, Optional
+
+KEYWORD_FIELDS = ("category", "blog_tags", "url")
+# Categories and tags are stored as the lowercase words of the site's CSS class slugs
+# ("category-nutrition", "tag-sodium-intake" -> "nutrition", "sodium intake").
+LOWERCASE_FIELDS = ("category", "blog_tags")
+DATE_FIELDS = ("created", "updated")
+RANGE_OPERATORS = ("gt", "gte", "lt", "lte")
+
+
+def build_filter_clauses(filters: Optional[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """Translates structured filters into Elasticsearch filter clauses.
+
+    Keyword fields take a value or a list of values (any may match); category and tag
+    values are lowercased to match how they are indexed. Date fields take
+    a dict of range operators, e.g. {"created": {"gte": "2022-01-01"}}. The clauses are
+    meant to be used as pre-filters: inside the `knn` section and in the `filter` of
+    the lexical bool query, so both legs only ever see matching documents.
+    """
+    clauses = []
+    for field, value in (filters or {}).items():
+        if value is None or value == [] or value == {}:
+            continue
+        if field in KEYWORD_FIELDS:
+            values = list(value) if isinstance(value, (list, tuple, set)) else [value]
+            if field in LOWERCASE_FIELDS:
+                values = [str(v).strip().lower() for v in values]
+            clauses.append({"terms": {field: values}})
+        elif field in DATE_FIELDS:
+            if not isinstance(value, dict) or not set(value) <= set(RANGE_OPERATORS):
+                raise ValueError(f"Filter on {field} must be a dict with keys among {RANGE_OPERATORS}")
+            clauses.append({"range": {field: dict(value)}})
+        else:
+            raise ValueError(f"Unsupported filter field: {field}")
+    return clauses
+
+
+def add_filter_arguments(parser: argparse.ArgumentParser):
+    """Adds the command line options shared by the search scripts."""
+    parser.add_argument("--category", action="append", help="only return posts in this category (repeatable)")
+    parser.add_argument("--tag", action="append", dest="blog_tags", help="only return posts with this tag (repeatable)")
+    parser.add_argument("--created-after", help="only return posts created on or after this date (YYYY-MM-DD)")
+    parser.add_argument("--created-before", help="only return posts created before this date (YYYY-MM-DD)")
+
+
+def filters_from_args(args: argparse.Namespace) -> Dict[str, Any]:
+    created = {}
+    if args.created_after:
+        created["gte"] = args.created_after
+    if args.created_before:
+        created["lt"] = args.created_before
+    return {"category": args.category, "blog_tags": args.blog_tags, "created": created}
@@ -0,0 +1,146 @@
+import logging
+from datetime import datetime, timezone
+from typing import Any, Dict, Iterable, List, Optional
+from elasticsearch import Elasticsearch, helpers
+from src.config import (
+    INDEX_RETENTION,
+    INDEX_REFRESH_INTERVAL,
+    INDEX_REPLICAS,
+    BULK_CHUNK_SIZE,
+    BULK_MAX_CHUNK_BYTES,
+    BULK_THREAD_COUNT,
+    BULK_MAX_FAILURES,
+)
+
+# Settings applied while a fresh index is being bulk loaded: no periodic refreshes
+# and no replicas to copy every segment to.
+BULK_LOAD_SETTINGS = {"refresh_interval": "-1", "number_of_replicas": 0}
+
+
+def versioned_index_name(alias: str, now: Optional[datetime] = None) -> str:
+    """Builds a timestamped concrete index name for the given alias."""
+    now = now or datetime.now(timezone.utc)
+    return f"{alias}_v{now.strftime('%Y%m%d%H%M%S%f')}"
+
+
+def list_versioned_indices(es_client: Elasticsearch, alias: str) -> List[str]:
+    """Lists the concrete versioned indices behind an alias, oldest first."""
+    response = es_client.indices.get(index=f"{alias}_v*", allow_no_indices=True, expand_wildcards="open")
+    return sorted(response.keys())
+
+
+def get_alias_indices(es_client: Elasticsearch, alias: str) -> List[str]:
+    """Returns the concrete indices the alias currently points to."""
+    if not es_client.indices.exists_alias(name=alias):
+        return []
+    return sorted(es_client.indices.get_alias(name=alias).keys())
+
+
+def alias_version(es_client: Elasticsearch, alias: str) -> str:
+    """Identifies the data behind an alias; it changes whenever the alias is swapped."""
+    return ",".join(get_alias_indices(es_client, alias)) or alias
+
+
+def create_versioned_index(es_client: Elasticsearch, alias: str, mappings: Dict[str, Any],
+                           number_of_shards: int = 1) -> str:
+    """Creates a new versioned index tuned for bulk loading and returns its name."""
+    index_name = versioned_index_name(alias)
+    es_client.indices.create(
+        index=index_name,
+        settings={"number_of_shards": number_of_shards, **BULK_LOAD_SETTINGS},
+        mappings=mappings,
+    )
+    logging.info(f"Created versioned Elasticsearch index: {index_name}")
+    return index_name
+
+
+def bulk_index(es_client: Elasticsearch, index_name: str, documents: Iterable[Dict[str, Any]],
+               chunk_size: int = BULK_CHUNK_SIZE, thread_count: int = BULK_THREAD_COUNT,
+               max_failures: int = BULK_MAX_FAILURES) -> int:
+    """Indexes documents with parallel bulk workers and returns the number indexed.
+
+    Raises helpers.BulkIndexError, like helpers.bulk, once more than `max_failures`
+    documents have been rejected.
+    """
+    actions = ({"_index": index_name, "_source": doc} for doc in documents)
+    indexed = 0
+    errors: List[Dict[str, Any]] = []
+    for ok, info in helpers.parallel_bulk(
+        es_client,
+        actions,
+        thread_count=thread_count,
+        chunk_size=chunk_size,
+        max_chunk_bytes=BULK_MAX_CHUNK_BYTES,
+        raise_on_error=False,
+    ):
+        if ok:
+            indexed += 1
+        else:
+            errors.append(info)
+            logging.error(f"Failed to index document into {index_name}: {info}")
+            if len(errors) > max_failures:
+                raise helpers.BulkIndexError(f"{len(errors)} document(s) failed to index into {index_name}", errors)
+    if errors:
+        logging.warning(f"{len(errors)} document(s) failed to index into {index_name}, within the allowed "
+                        f"{max_failures}")
+    logging.info(f"Bulk indexed {indexed} documents into {index_name}")
+    return indexed
+
+
+def finalize_index(es_client: Elasticsearch, index_name: str):
+    """Restores search-time settings on a bulk loaded index and compacts it."""
+    es_client.indices.put_settings(
+        index=index_name,
+        settings={"refresh_interval": INDEX_REFRESH_INTERVAL, "number_of_replicas": INDEX_REPLICAS},
+    )
+    es_client.indices.refresh(index=index_name)
+    es_client.indices.forcemerge(index=index_name, max_num_segments=1)
+    logging.info(f"Finalized Elasticsearch index: {index_name}")
+
+
+def swap_alias(es_client: Elasticsearch, alias: str, index_name: str):
+    """Atomically points the alias at index_name.
+
+    A legacy concrete index that still carries the alias name is dropped in the
+    same request, so searchers never observe a missing alias.
+    """
+    actions = [{"remove": {"index": old, "alias": alias}}
+               for old in get_alias_indices(es_client, alias) if old != index_name]
+    if es_client.indices.exists(index=alias) and not es_client.indices.exists_alias(name=alias):
+        actions.append({"remove_index": {"index": alias}})
+    actions.append({"add": {"index": index_name, "alias": alias}})
+    es_client.indices.update_aliases(actions=actions)
+    logging.info(f"Alias {alias} now points to {index_name}")
+
+
+def garbage_collect_indices(es_client: Elasticsearch, alias: str, keep: int = INDEX_RETENTION) -> List[str]:
+    """Deletes all but the newest `keep` versioned indices, never touching the live one."""
+    live = set(get_alias_indices(es_client, alias))
+    versions = list_versioned_indices(es_client, alias)
+    retained = set(versions[-keep:]) if keep > 0 else set()
+    to_delete = [name for name in versions if name not in retained and name not in live]
+    for name in to_delete:
+        es_client.indices.delete(index=name)
+        logging.info(f"Deleted old Elasticsearch index: {name}")
+    return to_delete
+
+
+def rebuild_index(es_client: Elasticsearch, alias: str, mappings: Dict[str, Any],
+                  documents: Iterable[Dict[str, Any]], keep: int = INDEX_RETENTION,
+                  max_failures: int = BULK_MAX_FAILURES) -> str:
+    """Builds a new index version off to the side and swaps the alias once it is ready.
+
+    If more than `max_failures` documents are rejected, the new index is deleted and
+    the alias keeps pointing at the previous version.
+    """
+    index_name = create_versioned_index(es_client, alias, mappings)
+    try:
+        bulk_index(es_client, index_name, documents, max_failures=max_failures)
+        finalize_index(es_client, index_name)
+    except Exception:
+        logging.error(f"Rebuild of {index_name} failed, leaving alias {alias} untouched")
+        es_client.indices.delete(index=index_name, ignore_unavailable=True)
+        raise
+    swap_alias(es_client, alias, index_name)
+    garbage_collect_indices(es_client, alias, keep=keep)
+    return index_name
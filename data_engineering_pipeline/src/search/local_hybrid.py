@@ -0,0 +1,69 @@
+from typing import Any, Dict, List
+import numpy as np
+import pyarrow as pa
+from src.db.snapshot import VECTOR_COLUMNS, vector_matrix
+from src.search.bm25_index import BM25Index
+
+RRF_RANK_CONSTANT = 60  # Elasticsearch's default rank_constant
+
+
+class LocalHybridSearcher:
+    """Hybrid search without Elasticsearch: a BM25Index for the keyword leg and exact
+    kNN over the vectors of a corpus snapshot.
+
+    Results have the shape of Elasticsearch hits (`_score` and `_source`), so the
+    search scripts can print them unchanged. `fusion="linear"` adds the boosted scores
+    like run_hybrid_search in hybrid_search.py; `fusion="rrf"` ranks like the RRF query
+    in sample_hybrid_search.py.
+    """
+
+    def __init__(self, bm25: BM25Index, table: pa.Table, vector_column: str = "combined_text_vector"):
+        self.bm25 = bm25
+        self.table = table
+        self.vectors = vector_matrix(table, vector_column)
+        norms = np.linalg.norm(self.vectors, axis=1)
+        self._inverse_norms = np.divide(1.0, norms, out=np.zeros_like(norms), where=norms > 0)
+        rows = {url: i for i, url in enumerate(table["url"].to_pylist())}
+        # BM25 document i is snapshot row bm25_rows[i]
+        self.bm25_rows = np.array([rows[url] for url in bm25.doc_ids], dtype=np.int64)
+        self._source_columns = [name for name in table.column_names if name not in VECTOR_COLUMNS]
+
+    def _lexical_scores(self, query: str) -> np.ndarray:
+        scores = np.zeros(self.table.num_rows, dtype=np.float32)
+        scores[self.bm25_rows] = self.bm25.scores(query)
+        return scores
+
+    def _knn(self, query_vector, k: int):
+        query = np.asarray(query_vector, dtype=np.float32)
+        cosine = (self.vectors @ query) * self._inverse_norms / (np.linalg.norm(query) or 1.0)
+        top = _top(cosine, k)
+        return top, (1 + cosine[top]) / 2  # Elasticsearch's score for cosine similarity
+
+    def _hits(self, rows: np.ndarray, scores: np.ndarray) -> List[Dict[str, Any]]:
+        sources = self.table.select(self._source_columns).take(pa.array(rows, type=pa.int64())).to_pylist()
+        return [{"_score": float(score), "_source": source} for source, score in zip(sources, scores)]
+
+    def search(self, query: str, query_vector, k: int = 5, fusion: str = "linear",
+               knn_boost: float = 0.5, text_boost: float = 0.5) -> List[Dict[str, Any]]:
+        lexical = self._lexical_scores(query)
+        knn_rows, knn_scores = self._knn(query_vector, k)
+        if fusion == "rrf":
+            combined = np.zeros(self.table.num_rows, dtype=np.float64)
+            text_rows = _top(lexical, k, positive_only=True)
+            for ranked in (text_rows, knn_rows):
+                combined[ranked] += 1.0 / (RRF_RANK_CONSTANT + np.arange(1, len(ranked) + 1))
+        elif fusion == "linear":
+            combined = text_boost * lexical.astype(np.float64)
+            combined[knn_rows] += knn_boost * knn_scores
+        else:
+            raise ValueError(f"Unknown fusion method: {fusion}")
+        top = _top(combined, k, positive_only=True)
+        return self._hits(top, combined[top])
+
+
+def _top(scores: np.ndarray, k: int, positive_only: bool = False) -> np.ndarray:
+    """Indices of the k highest scores, best first."""
+    candidates = np.flatnonzero(scores > 0) if positive_only else np.arange(len(scores))
+    if len(candidates) > k:
+        candidates = candidates[np.argpartition(scores[candidates], -k)[-k:]]
+    return candidates[np.argsort(scores[candidates])[::-1]]
@@ -0,0 +1,127 @@
+import json
+import logging
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, List, Optional
+import numpy as np
+from src.config import (
+    EMBEDDING_DIM,
+    SEMANTIC_CACHE_SIZE,
+    SEMANTIC_CACHE_THRESHOLD,
+    SEMANTIC_CACHE_TTL,
+    SEMANTIC_CACHE_VERSION_CHECK,
+)
+
+
+def cache_context(index_name: str, k: int, filters: Optional[Dict[str, Any]] = None) -> str:
+    """Key for the query parameters besides the text; only queries with equal contexts share results."""
+    return json.dumps({"index": index_name, "k": k, "filters": filters or {}}, sort_keys=True, default=str)
+
+
+class SemanticQueryCache:
+    """Caches search results by query embedding rather than by query string.
+
+    Embeddings of recent queries are kept L2-normalised in a preallocated matrix, so a
+    lookup is a single matrix-vector product over at most `max_entries` rows. A query
+    whose cosine similarity to a cached one reaches `threshold` (with the same index,
+    k and filters) is served from the cache. Entries expire after `ttl` seconds, the least
+    recently used entry is evicted when the cache is full, and everything is dropped
+    when the index version (the concrete index behind the alias) changes.
+    """
+
+    def __init__(self, threshold: float = SEMANTIC_CACHE_THRESHOLD, max_entries: int = SEMANTIC_CACHE_SIZE,
+                 ttl: float = SEMANTIC_CACHE_TTL, dim: int = EMBEDDING_DIM,
+                 version_fn: Optional[Callable[[], str]] = None,
+                 version_check_interval: float = SEMANTIC_CACHE_VERSION_CHECK):
+        self.threshold = threshold
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.version_fn = version_fn
+        self.version_check_interval = version_check_interval
+        self._vectors = np.zeros((max_entries, dim), dtype=np.float32)
+        self._live = np.zeros(max_entries, dtype=bool)
+        self._expires = np.zeros(max_entries, dtype=np.float64)
+        self._contexts: List[Optional[str]] = [None] * max_entries
+        self._results: List[Any] = [None] * max_entries
+        self._lru: "OrderedDict[int, None]" = OrderedDict()  # slot -> None, least recently used first
+        self._free = list(range(max_entries - 1, -1, -1))
+        self._version: Optional[str] = None
+        self._version_checked_at = float("-inf")
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self) -> int:
+        return len(self._lru)
+
+    @property
+    def hit_rate(self) -> float:
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+    def clear(self):
+        self._live[:] = False
+        self._contexts = [None] * self.max_entries
+        self._results = [None] * self.max_entries
+        self._lru.clear()
+        self._free = list(range(self.max_entries - 1, -1, -1))
+
+    def set_version(self, version: str):
+        """Drops all entries if the index version differs from the one they were computed on."""
+        if self._version is not None and version != self._version and self._lru:
+            logging.info(f"Index version changed from {self._version} to {version}, clearing {len(self)} cached queries")
+            self.clear()
+        self._version = version
+
+    def _check_version(self, now: float):
+        if self.version_fn is None or now - self._version_checked_at < self.version_check_interval:
+            return
+        self._version_checked_at = now
+        self.set_version(self.version_fn())
+
+    def _release(self, slot: int):
+        self._live[slot] = False
+        self._contexts[slot] = None
+        self._results[slot] = None
+        self._lru.pop(slot, None)
+        self._free.append(slot)
+
+    @staticmethod
+    def _normalise(embedding) -> np.ndarray:
+        vector = np.asarray(embedding, dtype=np.float32).ravel()
+        norm = np.linalg.norm(vector)
+        return vector / norm if norm else vector
+
+    def get(self, embedding, context: str = "") -> Optional[Any]:
+        """Returns the results cached for the most similar query above the threshold, or None."""
+        now = time.monotonic()
+        self._check_version(now)
+        if self._lru:
+            expired = np.flatnonzero(self._live & (self._expires <= now))
+            for slot in expired:
+                self._release(int(slot))
+        if self._lru:
+            scores = self._vectors @ self._normalise(embedding)
+            scores[~self._live] = -np.inf
+            for slot in np.argsort(scores)[::-1]:
+                if scores[slot] < self.threshold:
+                    break
+                if self._contexts[slot] == context:
+                    self._lru.move_to_end(int(slot))
+                    self.hits += 1
+                    return self._results[slot]
+        self.misses += 1
+        return None
+
+    def put(self, embedding, results: Any, context: str = ""):
+        """Caches results for a query embedding, evicting the least recently used entry if full."""
+        if self._free:
+            slot = self._free.pop()
+        else:
+            slot, _ = self._lru.popitem(last=False)
+        self._vectors[slot] = self._normalise(embedding)
+        self._live[slot] = True
+        self._expires[slot] = time.monotonic() + self.ttl
+        self._contexts[slot] = context
+        self._results[slot] = results
+        self._lru[slot] = None
+        self._lru.move_to_end(slot)
@@ -0,0 +1,251 @@
+import fnmatch
+import json
+import threading
+import time
+from collections import Counter
+from datetime import datetime
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, List, Optional, Tuple
+from urllib.parse import parse_qs, unquote, urlparse
+import numpy as np
+import pyarrow as pa
+from src.search.bm25_index import BM25Index
+from src.search.local_hybrid import LocalHybridSearcher
+
+FILLER_WORDS = ["food", "diet", "study", "health", "risk", "people", "daily", "intake", "effect", "levels"]
+
+# Elasticsearch clients refuse servers that do not identify as Elasticsearch
+PRODUCT_HEADERS = {"X-Elastic-Product": "Elasticsearch", "Content-Type": "application/vnd.elasticsearch+json"}
+
+
+def synthetic_searcher(n_docs: int, dim: int, words: List[str], words_per_doc: int = 200,
+                       seed: int = 0) -> LocalHybridSearcher:
+    """A random corpus whose texts use the given words, with random `dim`-dimensional vectors."""
+    rng = np.random.default_rng(seed)
+    vocabulary = np.array(sorted(set(words) | set(FILLER_WORDS)))
+    documents = []
+    for i in range(n_docs):
+        text = " ".join(vocabulary[rng.integers(0, len(vocabulary), size=words_per_doc)])
+        documents.append({"url": f"https://example.org/blog/post-{i}/", "title": f"Post {i}",
+                          "combined_text": text, "blog_tags": []})
+    vectors = rng.standard_normal((n_docs, dim)).astype(np.float32)
+    table = pa.table({
+        "url": [doc["url"] for doc in documents],
+        "title": [doc["title"] for doc in documents],
+        "combined_text": [doc["combined_text"] for doc in documents],
+        "combined_text_vector": pa.FixedSizeListArray.from_arrays(pa.array(vectors.ravel()), dim),
+    })
+    return LocalHybridSearcher(BM25Index.build(documents), table)
+
+
+def _valid_date(value: Any) -> bool:
+    if value is None or isinstance(value, (int, float)):
+        return True
+    try:
+        datetime.fromisoformat(str(value).replace("Z", "+00:00"))
+        return True
+    except ValueError:
+        return False
+
+
+def _is_filtered(body: Dict[str, Any]) -> bool:
+    query = body.get("query", {})
+    return bool(query.get("bool", {}).get("filter") or body.get("knn", {}).get("filter"))
+
+
+class StubElasticsearch:
+    """A single-process stand-in for the parts of the Elasticsearch API this repo uses.
+
+    `_search` is answered by a LocalHybridSearcher, for the request shapes used by
+    hybrid_search.py (a bool/multi_match query plus a boosted `knn` section, scores
+    added) and sample_hybrid_search.py (the same with `rank.rrf`). The stand-in cannot
+    apply filters, so a body with a non-empty `bool.filter` or `knn.filter` is rejected
+    with a 400 rather than answered unfiltered.
+    `latency` adds a fixed delay per request to mimic the network and a loaded cluster.
+
+    Index management (create, settings, refresh, forcemerge, aliases, delete) and
+    `_bulk` only keep in-memory bookkeeping, so the index manager can be tested;
+    documents whose `date` fields do not parse are rejected like a mapping error.
+    """
+
+    def __init__(self, searcher: Optional[LocalHybridSearcher] = None, latency: float = 0.0):
+        self.searcher = searcher
+        self.latency = latency
+        self.hits = Counter()
+        self.indices: Dict[str, Dict[str, Any]] = {}
+        self._lock = threading.Lock()
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), self._make_handler())
+        self.url = f"http://127.0.0.1:{self.server.server_address[1]}"
+        self.thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+
+    def start(self) -> "StubElasticsearch":
+        self.thread.start()
+        return self
+
+    def stop(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+    def aliases(self, alias: str) -> List[str]:
+        return sorted(name for name, index in self.indices.items() if alias in index["aliases"])
+
+    def search(self, body: Dict[str, Any]) -> Dict[str, Any]:
+        start = time.perf_counter()
+        query = body.get("query", {})
+        multi_match = query.get("bool", {}).get("must", {}).get("multi_match") or query.get("multi_match") or {}
+        knn = body.get("knn", {})
+        size = body.get("size", 10)
+        hits = self.searcher.search(
+            multi_match.get("query", ""), knn["query_vector"], k=size,
+            fusion="rrf" if "rrf" in body.get("rank", {}) else "linear",
+            knn_boost=knn.get("boost", 1.0), text_boost=multi_match.get("boost", 1.0),
+        )
+        return {
+            "took": int((time.perf_counter() - start) * 1000),
+            "timed_out": False,
+            "hits": {"total": {"value": len(hits), "relation": "eq"},
+                     "max_score": hits[0]["_score"] if hits else None,
+                     "hits": [{"_index": "stub", "_id": hit["_source"]["url"], **hit} for hit in hits]},
+        }
+
+    def bulk(self, lines: List[Dict[str, Any]]) -> Dict[str, Any]:
+        items = []
+        for action, source in zip(lines[::2], lines[1::2]):
+            op, meta = next(iter(action.items()))
+            index = self.indices.get(meta["_index"])
+            fields = index["mappings"].get("properties", {}) if index else {}
+            bad = [name for name, field in fields.items()
+                   if field.get("type") == "date" and not _valid_date(source.get(name))]
+            if index is None:
+                item = {"status": 404, "error": {"type": "index_not_found_exception", "reason": meta["_index"]}}
+            elif bad:
+                item = {"status": 400, "error": {"type": "document_parsing_exception",
+                                                 "reason": f"failed to parse field [{bad[0]}] of type [date]"}}
+            else:
+                index["docs"].append(source)
+                item = {"status": 201, "result": "created", "_id": str(len(index["docs"]))}
+            items.append({op: {"_index": meta["_index"], **item}})
+        return {"took": 1, "errors": any(item[next(iter(item))]["status"] >= 300 for item in items), "items": items}
+
+    def update_aliases(self, actions: List[Dict[str, Any]]):
+        for action in actions:  # validated up front, so the update applies atomically or not at all
+            (op, spec), = action.items()
+            if spec["index"] not in self.indices:
+                raise KeyError(spec["index"])
+        for action in actions:
+            (op, spec), = action.items()
+            if op == "add":
+                self.indices[spec["index"]]["aliases"].add(spec["alias"])
+            elif op == "remove":
+                self.indices[spec["index"]]["aliases"].discard(spec["alias"])
+            elif op == "remove_index":
+                del self.indices[spec["index"]]
+
+    def handle(self, method: str, path: str, params: Dict[str, str], body: Any) -> Tuple[int, Any]:
+        """Routes one REST request; returns (status, payload)."""
+        parts = [unquote(part) for part in path.strip("/").split("/") if part]
+        if not parts:  # GET / (info) and HEAD / (ping)
+            return 200, {"version": {"number": "8.4.3"}, "tagline": "You Know, for Search"}
+        if parts[-1] == "_search":
+            if self.searcher is None:
+                return 400, {"error": {"type": "illegal_argument_exception", "reason": "no searcher"}}
+            if _is_filtered(body or {}):
+                return 400, {"error": {"type": "illegal_argument_exception",
+                                       "reason": "filtered searches are not supported by the stand-in"}}
+            return 200, self.search(body or {})
+        with self._lock:  # searches run concurrently; index bookkeeping does not
+            return self._manage(method, parts, params, body)
+
+    def _manage(self, method: str, parts: List[str], params: Dict[str, str], body: Any) -> Tuple[int, Any]:
+        if parts == ["_bulk"]:
+            return 200, self.bulk(body)
+        if parts == ["_aliases"]:
+            self.update_aliases(body["actions"])
+            return 200, {"acknowledged": True}
+        if parts[0] == "_alias" and len(parts) == 2:
+            indices = self.aliases(parts[1])
+            if not indices:
+                return 404, {"error": f"alias [{parts[1]}] missing", "status": 404}
+            return 200, {name: {"aliases": {parts[1]: {}}} for name in indices}
+        name = parts[0]
+        if len(parts) == 2 and parts[1] in ("_settings", "_refresh", "_forcemerge"):
+            if name not in self.indices:
+                return 404, {"error": {"type": "index_not_found_exception"}, "status": 404}
+            if parts[1] == "_settings":
+                self.indices[name]["settings"].update(body.get("settings", body))
+            self.indices[name]["operations"].append(parts[1])
+            return 200, {"acknowledged": True}
+        if len(parts) == 1 and method == "PUT":
+            if name in self.indices:
+                return 400, {"error": {"type": "resource_already_exists_exception"}, "status": 400}
+            body = body or {}
+            self.indices[name] = {"settings": dict(body.get("settings", {})), "mappings": body.get("mappings", {}),
+                                  "aliases": set(), "docs": [], "operations": []}
+            return 200, {"acknowledged": True, "index": name}
+        if len(parts) == 1 and method in ("GET", "HEAD"):
+            matches = sorted(fnmatch.filter(self.indices, name))
+            if not matches and ("*" not in name or params.get("allow_no_indices") == "false"):
+                return 404, {"error": {"type": "index_not_found_exception"}, "status": 404}
+            return 200, {match: {"settings": self.indices[match]["settings"],
+                                 "aliases": {alias: {} for alias in self.indices[match]["aliases"]}}
+                         for match in matches}
+        if len(parts) == 1 and method == "DELETE":
+            if name not in self.indices:
+                if params.get("ignore_unavailable") == "true":
+                    return 200, {"acknowledged": True}
+                return 404, {"error": {"type": "index_not_found_exception"}, "status": 404}
+            del self.indices[name]
+            return 200, {"acknowledged": True}
+        return 404, {"error": f"unsupported request {method} /{'/'.join(parts)}", "status": 404}
+
+    def _make_handler(self):
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def log_message(self, *args):
+                pass
+
+            def _send(self, status: int, payload: Any, head: bool = False):
+                body = json.dumps(payload).encode()
+                self.send_response(status)
+                for name, value in PRODUCT_HEADERS.items():
+                    self.send_header(name, value)
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                if not head:
+                    self.wfile.write(body)
+
+            def _dispatch(self, method: str):
+                url = urlparse(self.path)
+                with stub._lock:
+                    stub.hits[url.path] += 1
+                raw = self.rfile.read(int(self.headers.get("Content-Length", 0)))
+                if stub.latency:
+                    time.sleep(stub.latency)
+                try:
+                    if url.path.rstrip("/").endswith("/_bulk") or url.path == "/_bulk":
+                        body = [json.loads(line) for line in raw.splitlines() if line.strip()]
+                    else:
+                        body = json.loads(raw) if raw else None
+                    params = {key: values[-1] for key, values in parse_qs(url.query).items()}
+                    status, payload = stub.handle(method, url.path, params, body)
+                except (KeyError, TypeError, ValueError) as e:
+                    status, payload = 400, {"error": {"type": "parsing_exception", "reason": str(e)}, "status": 400}
+                self._send(status, payload, head=method == "HEAD")
+
+            def do_GET(self):
+                self._dispatch("GET")
+
+            def do_HEAD(self):
+                self._dispatch("HEAD")
+
+            def do_POST(self):
+                self._dispatch("POST")
+
+            def do_PUT(self):
+                self._dispatch("PUT")
+
+            def do_DELETE(self):
+                self._dispatch("DELETE")
+
+        return Handler
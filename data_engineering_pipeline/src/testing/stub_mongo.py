@@ -0,0 +1,103 @@
+import threading
+from multiprocessing.managers import BaseManager
+from typing import Dict, Tuple
+from src.db.mongo_handler import MongoHandler
+
+COLLECTION_METHODS = ("find", "find_one", "find_one_and_update", "insert_one", "insert_many", "update_one",
+                      "update_many", "replace_one", "count_documents", "aggregate", "create_index", "drop")
+
+Address = Tuple[Tuple[str, int], bytes]
+
+
+class SharedCollection:
+    """A mongomock collection that is safe to call from many threads.
+
+    mongomock is not thread-safe, while a real server applies every single-document
+    operation atomically; serializing calls gives callers the same guarantee. Cursors
+    are returned as lists so results can be sent to other processes.
+    """
+
+    def __init__(self, collection, lock: threading.Lock):
+        self._collection = collection
+        self._lock = lock
+
+    def __getattr__(self, name):
+        attr = getattr(self._collection, name)
+        if not callable(attr):
+            return attr
+
+        def call(*args, **kwargs):
+            with self._lock:
+                result = attr(*args, **kwargs)
+                return list(result) if name in ("find", "aggregate") else result
+        return call
+
+
+_client = None
+_lock = threading.Lock()
+_collections: Dict[Tuple[str, str], SharedCollection] = {}
+
+
+def _shared_collection(database: str, name: str) -> SharedCollection:
+    # Runs in the manager process, which owns the only mongomock client.
+    global _client
+    with _lock:
+        if _client is None:
+            import mongomock  # optional: only needed when no real MongoDB is available
+            _client = mongomock.MongoClient()
+        key = (database, name)
+        if key not in _collections:
+            _collections[key] = SharedCollection(_client[database][name], threading.Lock())
+        return _collections[key]
+
+
+class _StubMongoManager(BaseManager):
+    pass
+
+
+_StubMongoManager.register("collection", _shared_collection, exposed=COLLECTION_METHODS)
+
+
+class StubMongo:
+    """A MongoDB stand-in that several processes can share, for benchmarks without a server.
+
+    A manager process holds one mongomock client. `collection()` returns a proxy to one
+    of its collections; other processes reach it through `connect(stub.address, ...)`.
+    """
+
+    def __init__(self):
+        self.manager = _StubMongoManager(address=("127.0.0.1", 0))
+
+    def start(self) -> "StubMongo":
+        self.manager.start()
+        return self
+
+    def stop(self):
+        self.manager.shutdown()
+
+    @property
+    def address(self) -> Address:
+        return self.manager.address, bytes(self.manager._authkey)
+
+    def collection(self, database: str, name: str):
+        return self.manager.collection(database, name)
+
+
+def connect(address: Address, database: str, name: str):
+    """Returns a proxy to a collection of a StubMongo started by another process."""
+    manager_address, authkey = address
+    manager = _StubMongoManager(address=manager_address, authkey=authkey)
+    manager.connect()
+    return manager.collection(database, name)
+
+
+class StubMongoHandler(MongoHandler):
+    """MongoHandler that writes to a StubMongo collection instead of a server."""
+
+    def __init__(self, collection):
+        self.client = None
+        self.db = None
+        self.collection = collection
+
+    def close_connection(self):
+        pass
@@ -0,0 +1,140 @@
+import gzip
+import threading
+import time
+from collections import Counter
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Callable, Dict, Optional, Tuple
+
+POSTS_PER_PAGE = 5
+
+POST_TEMPLATE = """<html><body>
+<article class="post-{i} category-nutrition tag-salt">
+<h1 class="entry-title">Post {i}</h1>
+<time datetime="2023-01-01T00:00:00+00:00"></time>
+<p class="p1">Body of post {i}.</p>
+</article></body></html>"""
+
+# A fault hook receives (path, hit count for that path) and returns None to serve the page
+# normally or (status, headers) to answer with an error instead.
+FaultHook = Callable[[str, int], Optional[Tuple[int, Dict[str, str]]]]
+
+
+class StubSite:
+    """A local paginated blog served over HTTP, with hooks to inject throttling and failures.
+
+    With `sitemap=True` the site also publishes robots.txt, a sitemap index and a gzipped
+    post sitemap; `latency` adds a fixed delay to every response to mimic the network.
+    """
+
+    def __init__(self, n_posts: int = 12, posts_per_page: int = POSTS_PER_PAGE,
+                 sitemap: bool = False, latency: float = 0.0):
+        self.n_posts = n_posts
+        self.posts_per_page = posts_per_page
+        self.sitemap = sitemap
+        self.latency = latency
+        self.lastmods = {i: "2023-01-01T00:00:00+00:00" for i in range(n_posts)}
+        self.hits = Counter()
+        self.fault: Optional[FaultHook] = None
+        self.extra_routes: Dict[str, Tuple[int, Dict[str, str], bytes]] = {}
+        self._lock = threading.Lock()
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), self._make_handler())
+        self.root = f"http://127.0.0.1:{self.server.server_address[1]}/blog/"
+        self.thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+
+    @property
+    def site(self) -> str:
+        return self.root[:-len("blog/")]
+
+    def start(self) -> "StubSite":
+        self.thread.start()
+        return self
+
+    def stop(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+    @property
+    def post_urls(self):
+        return [f"{self.root}post-{i}/" for i in range(self.n_posts)]
+
+    def listing(self, page: int) -> Optional[bytes]:
+        start = (page - 1) * self.posts_per_page
+        urls = self.post_urls[start:start + self.posts_per_page]
+        if not urls:
+            return None
+        links = "".join(f'<a href="{url}">{url}</a>' for url in urls)
+        return f"<html><body>{links}<a href=\"{self.root}page/{page + 1}/\">next</a></body></html>".encode()
+
+    def sitemap_route(self, path: str) -> Optional[bytes]:
+        if path == "/robots.txt":
+            return f"User-agent: *\nSitemap: {self.site}sitemap_index.xml\n".encode()
+        if path == "/sitemap_index.xml":
+            return (
+                '<?xml version="1.0" encoding="UTF-8"?>'
+                '<sitemapindex xmlns="http://www.sitemaps.org/schemas/sitemap/0.9">'
+                f"<sitemap><loc>{self.site}post-sitemap.xml.gz</loc></sitemap>"
+                f"<sitemap><loc>{self.site}page-sitemap.xml</loc></sitemap>"
+                "</sitemapindex>"
+            ).encode()
+        if path == "/post-sitemap.xml.gz":
+            entries = "".join(f"<url><loc>{url}</loc><lastmod>{self.lastmods[i]}</lastmod></url>"
+                              for i, url in enumerate(self.post_urls))
+            return gzip.compress(
+                ('<?xml version="1.0" encoding="UTF-8"?>'
+                 f'<urlset xmlns="http://www.sitemaps.org/schemas/sitemap/0.9">{entries}</urlset>').encode()
+            )
+        if path == "/page-sitemap.xml":
+            return (
+                '<?xml version="1.0" encoding="UTF-8"?>'
+                '<urlset xmlns="http://www.sitemaps.org/schemas/sitemap/0.9">'
+                f"<url><loc>{self.root}</loc></url><url><loc>{self.site}about/</loc></url>"
+                "</urlset>"
+            ).encode()
+        return None
+
+    def route(self, path: str) -> Tuple[int, Dict[str, str], bytes]:
+        if path in self.extra_routes:
+            return self.extra_routes[path]
+        if self.sitemap:
+            body = self.sitemap_route(path)
+            if body is not None:
+                return 200, {"Content-Type": "application/xml"}, body
+        if path == "/blog/":
+            body = self.listing(1)
+        elif path.startswith("/blog/page/"):
+            body = self.listing(int(path.strip("/").split("/")[-1]))
+        elif path.startswith("/blog/post-"):
+            i = int(path.strip("/").split("-")[-1])
+            body = POST_TEMPLATE.format(i=i).encode() if i < self.n_posts else None
+        else:
+            body = None
+        if body is None:
+            return 404, {}, b"not found"
+        return 200, {"Content-Type": "text/html"}, body
+
+    def _make_handler(self):
+        site = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                with site._lock:
+                    site.hits[self.path] += 1
+                    count = site.hits[self.path]
+                if site.latency:
+                    time.sleep(site.latency)
+                fault = site.fault(self.path, count) if site.fault else None
+                if fault is not None:
+                    status, headers, body = fault[0], fault[1], b"error"
+                else:
+                    status, headers, body = site.route(self.path)
+                self.send_response(status)
+                for key, value in headers.items():
+                    self.send_header(key, value)
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                pass
+
+        return Handler
@@ -0,0 +1,149 @@
+import functools
+import json
+import logging
+import os
+import re
+import sys
+from collections import Counter
+from typing import Dict, Iterable, List, Optional
+from src.config import (
+    EXCLUDE_STARTSWITH,
+    LEARNED_RULES_PATH,
+    LEARN_MIN_DOC_FRACTION,
+    LEARN_MIN_DOCS,
+    LEARN_PREFIX_WORDS,
+)
+from src.utils.helpers import replace_strange_chars
+
+# Paragraph separator for batch replacement; never produced by get_text() on a <p>.
+_BATCH_SEPARATOR = "\x00"
+
+
+def _build_trie(prefixes: Iterable[str]) -> Dict:
+    trie: Dict = {}
+    for prefix in prefixes:
+        node = trie
+        for char in prefix:
+            node = node.setdefault(char, {})
+        node[""] = {}  # end-of-prefix marker
+    return trie
+
+
+def _trie_to_pattern(node: Dict) -> str:
+    """Serialises a trie into a regex whose alternations share common prefixes."""
+    if "" in node:
+        # Any prefix ending here is enough for a startswith match, longer branches are redundant.
+        return ""
+    branches = [re.escape(char) + _trie_to_pattern(child) for char, child in sorted(node.items())]
+    if len(branches) == 1:
+        return branches[0]
+    return "(?:" + "|".join(branches) + ")"
+
+
+def compile_prefix_matcher(prefixes: Iterable[str]) -> Optional["re.Pattern"]:
+    """Compiles exclusion prefixes into a single anchored regex automaton."""
+    prefixes = [p for p in prefixes if p]
+    if not prefixes:
+        return None
+    return re.compile(_trie_to_pattern(_build_trie(prefixes)))
+
+
+def load_learned_rules(path: str = LEARNED_RULES_PATH) -> Dict[str, List[str]]:
+    """Loads the exclusion prefixes and whole paragraphs learned from the corpus, if any."""
+    if not os.path.exists(path):
+        return {"prefixes": [], "paragraphs": []}
+    with open(path, "r", encoding="utf-8") as f:
+        rules = json.load(f)
+    return {"prefixes": rules.get("prefixes", []), "paragraphs": rules.get("paragraphs", [])}
+
+
+class ParagraphCleaner:
+    """Normalises characters and drops excluded paragraphs for a batch at a time.
+
+    `prefixes` drop every paragraph starting with them; `paragraphs` only drop exact
+    matches, so a boilerplate line like "Learn more" does not take real content that
+    happens to begin with the same words along with it.
+    """
+
+    def __init__(self, prefixes: Iterable[str], paragraphs: Iterable[str] = ()):
+        self.prefixes = sorted(set(prefixes))
+        self.paragraphs = frozenset(paragraphs)
+        self.matcher = compile_prefix_matcher(self.prefixes)
+
+    def is_excluded(self, paragraph: str) -> bool:
+        if paragraph in self.paragraphs:
+            return True
+        return self.matcher is not None and self.matcher.match(paragraph) is not None
+
+    def clean(self, paragraphs: List[str]) -> List[str]:
+        """Strips, translates and filters paragraphs, dropping empty and excluded ones."""
+        if not paragraphs:
+            return []
+        # One str.replace pass per rule over the whole batch beats both per-paragraph loops
+        # and str.translate, which falls off its fast path for non-ASCII text.
+        joined = _BATCH_SEPARATOR.join(p.strip() for p in paragraphs)
+        translated = replace_strange_chars(joined).split(_BATCH_SEPARATOR)
+        match = self.matcher.match if self.matcher is not None else None
+        return [p for p in translated
+                if p and p not in self.paragraphs and (match is None or match(p) is None)]
+
+
+@functools.lru_cache(maxsize=None)
+def default_cleaner() -> ParagraphCleaner:
+    """The static exclusion list plus any learned rules, compiled on first use in each process."""
+    rules = load_learned_rules(LEARNED_RULES_PATH)
+    return ParagraphCleaner(EXCLUDE_STARTSWITH + rules["prefixes"], rules["paragraphs"])
+
+
+def learn_boilerplate_rules(documents: List[List[str]],
+                            min_doc_fraction: float = LEARN_MIN_DOC_FRACTION,
+                            min_docs: int = LEARN_MIN_DOCS,
+                            prefix_words: int = LEARN_PREFIX_WORDS) -> Dict[str, List[str]]:
+    """Finds paragraphs and leading phrases that recur across many posts.
+
+    Whole paragraphs are counted first; a leading phrase of `prefix_words` words is
+    only proposed when it is at least as widespread, so ordinary openings like
+    "In a study" do not qualify unless a large share of posts starts a paragraph
+    with them. Recurring paragraphs are returned separately and match exactly.
+    """
+    threshold = max(min_docs, int(min_doc_fraction * len(documents)))
+    paragraph_docs, prefix_docs = Counter(), Counter()
+    for paragraphs in documents:
+        seen = {p.strip() for p in paragraphs if p.strip()}
+        paragraph_docs.update(seen)
+        prefix_docs.update({" ".join(p.split()[:prefix_words]) for p in seen
+                            if len(p.split()) > prefix_words})
+
+    prefixes = sorted(p for p, n in prefix_docs.items() if n >= threshold)
+    paragraphs = sorted(p for p, n in paragraph_docs.items()
+                        if n >= threshold and not any(p.startswith(prefix) for prefix in prefixes))
+    logging.info(f"Learned {len(prefixes)} boilerplate prefixes and {len(paragraphs)} paragraphs "
+                 f"from {len(documents)} posts (threshold {threshold})")
+    return {"prefixes": prefixes, "paragraphs": paragraphs}
+
+
+def save_learned_rules(rules: Dict[str, List[str]], path: str = LEARNED_RULES_PATH):
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(rules, f, indent=2, ensure_ascii=False)
+    logging.info(f"Saved {len(rules['prefixes'])} learned prefixes and {len(rules['paragraphs'])} paragraphs to {path}")
+
+
+def main():
+    """Offline pass: `python -m src.utils.cleaning learn` learns rules from the stored corpus."""
+    from src.db.mongo_handler import MongoHandler
+
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+    if sys.argv[1:] != ["learn"]:
+        print("usage: python -m src.utils.cleaning learn")
+        sys.exit(2)
+    mongo_handler = MongoHandler()
+    documents = [post.get("paragraphs", []) for post in mongo_handler.collection.find({}, {"paragraphs": 1})]
+    mongo_handler.close_connection()
+    save_learned_rules(learn_boilerplate_rules(documents))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,236 @@
+import itertools
+import logging
+import re
+import zlib
+from collections import defaultdict
+from types import SimpleNamespace
+from typing import Dict, List, Tuple
+import numpy as np
+from src.config import DEDUP_THRESHOLD, DEDUP_NUM_PERM, DEDUP_BANDS, DEDUP_SHINGLE_SIZE, BOILERPLATE_MIN_DOCS
+
+_MERSENNE_PRIME = np.uint64((1 << 61) - 1)
+_MAX_HASH = np.uint64((1 << 32) - 1)
+_TOKEN_RE = re.compile(r"\w+")
+
+ParagraphId = Tuple[int, int]  # (document index, paragraph index)
+
+
+def shingle_hashes(text: str, shingle_size: int = DEDUP_SHINGLE_SIZE) -> np.ndarray:
+    """Hashes the word n-grams of a paragraph into 32-bit integers."""
+    tokens = _TOKEN_RE.findall(text.lower())
+    if len(tokens) <= shingle_size:
+        shingles = [" ".join(tokens)]
+    else:
+        shingles = [" ".join(tokens[i:i + shingle_size]) for i in range(len(tokens) - shingle_size + 1)]
+    return np.array(sorted({zlib.crc32(s.encode("utf-8")) for s in shingles}), dtype=np.uint64)
+
+
+class MinHasher:
+    """Computes MinHash signatures with a fixed family of universal hash functions."""
+
+    def __init__(self, num_perm: int = DEDUP_NUM_PERM, seed: int = 1):
+        rng = np.random.RandomState(seed)
+        # Coefficients stay below 2**29 so a * hash + b never overflows uint64 before the modulo.
+        self.a = rng.randint(1, 1 << 29, size=num_perm, dtype=np.uint64)
+        self.b = rng.randint(0, 1 << 29, size=num_perm, dtype=np.uint64)
+        self.num_perm = num_perm
+
+    def signature(self, hashes: np.ndarray) -> np.ndarray:
+        if hashes.size == 0:
+            return np.full(self.num_perm, _MAX_HASH, dtype=np.uint64)
+        permuted = (np.outer(self.a, hashes) + self.b[:, None]) % _MERSENNE_PRIME & _MAX_HASH
+        return permuted.min(axis=1)
+
+
+class _UnionFind:
+    def __init__(self, n: int):
+        self.parent = list(range(n))
+
+    def find(self, i: int) -> int:
+        while self.parent[i] != i:
+            self.parent[i] = self.parent[self.parent[i]]
+            i = self.parent[i]
+        return i
+
+    def union(self, i: int, j: int):
+        root_i, root_j = self.find(i), self.find(j)
+        if root_i != root_j:
+            # The lowest id (first occurrence in the corpus) stays the canonical paragraph.
+            self.parent[max(root_i, root_j)] = min(root_i, root_j)
+
+
+class ParagraphDeduplicator:
+    """Clusters near-duplicate paragraphs across a corpus with MinHash + LSH.
+
+    Signatures are split into bands and only paragraphs that collide in at least one
+    band are compared, so the work grows with the number of true candidates rather
+    than quadratically with the corpus.
+    """
+
+    def __init__(self, threshold: float = DEDUP_THRESHOLD, num_perm: int = DEDUP_NUM_PERM,
+                 bands: int = DEDUP_BANDS, shingle_size: int = DEDUP_SHINGLE_SIZE):
+        if num_perm % bands != 0:
+            raise ValueError("num_perm must be divisible by bands")
+        self.threshold = threshold
+        self.bands = bands
+        self.rows = num_perm // bands
+        self.shingle_size = shingle_size
+        self.hasher = MinHasher(num_perm)
+        self.ids: List[ParagraphId] = []
+        self.canonical: Dict[ParagraphId, ParagraphId] = {}
+        self.cluster_docs: Dict[ParagraphId, set] = {}
+
+    def fit(self, documents: List[List[str]]) -> "ParagraphDeduplicator":
+        """Computes duplicate clusters for a corpus given as paragraphs per document."""
+        self.ids = [(d, p) for d, paragraphs in enumerate(documents) for p in range(len(paragraphs))]
+        texts = [documents[d][p] for d, p in self.ids]
+        if not texts:
+            return self
+        signatures = np.vstack([self.hasher.signature(shingle_hashes(t, self.shingle_size)) for t in texts])
+
+        union_find = self._cluster(signatures)
+        self.canonical = {}
+        self.cluster_docs = defaultdict(set)
+        for i, paragraph_id in enumerate(self.ids):
+            root = self.ids[union_find.find(i)]
+            self.canonical[paragraph_id] = root
+            self.cluster_docs[root].add(paragraph_id[0])
+        return self
+
+    def _cluster(self, signatures: np.ndarray) -> _UnionFind:
+        """Unions every pair of paragraphs that collide in a band and pass the threshold."""
+        buckets = defaultdict(list)
+        for band in range(self.bands):
+            band_rows = signatures[:, band * self.rows:(band + 1) * self.rows]
+            for i, row in enumerate(band_rows):
+                buckets[(band, row.tobytes())].append(i)
+
+        union_find = _UnionFind(len(signatures))
+        keys = [signature.tobytes() for signature in signatures]
+        compared = set()
+        for members in buckets.values():
+            if len(members) < 2:
+                continue
+            # Identical signatures (typically boilerplate) are merged directly, so only
+            # distinct ones need pairwise comparisons.
+            representatives = {}
+            for i in members:
+                if keys[i] in representatives:
+                    union_find.union(representatives[keys[i]], i)
+                else:
+                    representatives[keys[i]] = i
+            for first, other in itertools.combinations(representatives.values(), 2):
+                if (first, other) in compared or union_find.find(first) == union_find.find(other):
+                    continue
+                compared.add((first, other))
+                similarity = np.mean(signatures[first] == signatures[other])
+                if similarity >= self.threshold:
+                    union_find.union(first, other)
+        logging.info(f"Compared {len(compared)} candidate pairs for {len(signatures)} paragraphs")
+        return union_find
+
+    def is_duplicate(self, paragraph_id: ParagraphId) -> bool:
+        """True if an earlier paragraph in the corpus is a near-duplicate of this one."""
+        return self.canonical.get(paragraph_id, paragraph_id) != paragraph_id
+
+    def is_boilerplate(self, paragraph_id: ParagraphId, min_docs: int = BOILERPLATE_MIN_DOCS) -> bool:
+        """True if the paragraph's cluster recurs in at least `min_docs` documents."""
+        root = self.canonical.get(paragraph_id, paragraph_id)
+        return len(self.cluster_docs.get(root, ())) >= min_docs
+
+
+def deduplicate_corpus(documents: List[List[str]],
+                       min_docs: int = BOILERPLATE_MIN_DOCS) -> Tuple[List[List[str]], Dict[str, int]]:
+    """Drops cross-post boilerplate and repeated passages within a post before embedding.
+
+    Near-duplicates shared by fewer than `min_docs` posts are genuine content (e.g. a
+    quoted study) and are kept in every post that contains them.
+    """
+    deduplicator = ParagraphDeduplicator().fit(documents)
+    cleaned = []
+    stats = {"paragraphs": 0, "boilerplate_removed": 0, "repeats_removed": 0}
+    for d, paragraphs in enumerate(documents):
+        kept, seen_roots = [], set()
+        for p, paragraph in enumerate(paragraphs):
+            stats["paragraphs"] += 1
+            root = deduplicator.canonical.get((d, p), (d, p))
+            if deduplicator.is_boilerplate((d, p), min_docs):
+                stats["boilerplate_removed"] += 1
+            elif root in seen_roots:
+                stats["repeats_removed"] += 1
+            else:
+                seen_roots.add(root)
+                kept.append(paragraph)
+        cleaned.append(kept)
+    logging.info(
+        f"Deduplication kept {stats['paragraphs'] - stats['boilerplate_removed'] - stats['repeats_removed']}"
+        f" of {stats['paragraphs']} paragraphs ({stats['boilerplate_removed']} boilerplate,"
+        f" {stats['repeats_removed']} repeated)"
+    )
+    return cleaned, stats
+
+
+class CachedEncoder:
+    """Wraps an embedding model so identical texts are only encoded once."""
+
+    def __init__(self, model):
+        self.model = model
+        self._cache: Dict[str, np.ndarray] = {}
+        self.requests = 0
+        self.calls = 0
+
+    def encode(self, text: str) -> np.ndarray:
+        self.requests += 1
+        if text not in self._cache:
+            self.calls += 1
+            self._cache[text] = self.model.encode(text)
+        return self._cache[text]
+
+    @property
+    def calls_saved(self) -> int:
+        return self.requests - self.calls
+
+
+def embedding_savings(posts: List[Dict], min_docs: int = BOILERPLATE_MIN_DOCS) -> Dict[str, int]:
+    """Counts what deduplication saves when the posts are embedded as hybrid_search.py does.
+
+    Each post is embedded as its title and its joined paragraphs plus key takeaways, through
+    a CachedEncoder, so an encoder call is only saved when a whole text is identical.
+    """
+    documents = [post.get("paragraphs", []) for post in posts]
+    cleaned, stats = deduplicate_corpus(documents, min_docs)
+    savings = {"paragraphs": stats["paragraphs"],
+               "paragraphs_removed": stats["boilerplate_removed"] + stats["repeats_removed"]}
+    for label, corpus in (("before", documents), ("after", cleaned)):
+        encoder = CachedEncoder(SimpleNamespace(encode=len))
+        texts = set()
+        for post, paragraphs in zip(posts, corpus):
+            for text in (post.get("title", ""), " ".join(paragraphs + post.get("key_takeaways", []))):
+                encoder.encode(text)
+                texts.add(text)
+        savings[f"encoder_calls_{label}"] = encoder.calls
+        savings[f"cache_hits_{label}"] = encoder.calls_saved
+        savings[f"characters_embedded_{label}"] = sum(len(text) for text in texts)
+    return savings
+
+
+def main():
+    """Reports how much of the stored corpus is boilerplate or repeated, and what that saves."""
+    from src.db.mongo_handler import MongoHandler
+
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+    mongo_handler = MongoHandler()
+    posts = list(mongo_handler.collection.find({}, {"title": 1, "paragraphs": 1, "key_takeaways": 1}))
+    mongo_handler.close_connection()
+
+    savings = embedding_savings(posts)
+    removed, total = savings["paragraphs_removed"], savings["paragraphs"]
+    print(f"Posts: {len(posts)}")
+    print(f"Paragraphs removed: {removed} of {total} ({removed / max(total, 1):.1%})")
+    print(f"Characters embedded: {savings['characters_embedded_before']} -> {savings['characters_embedded_after']}")
+    print(f"Encoder calls: {savings['encoder_calls_before']} -> {savings['encoder_calls_after']}"
+          f" (cache hits on identical texts: {savings['cache_hits_before']} -> {savings['cache_hits_after']})")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,5 +1,6 @@
 import re
 from typing import Dict
+from bson import ObjectId
 from src.config import REPLACEMENTS
 import json
 
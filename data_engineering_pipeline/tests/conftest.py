@@ -0,0 +1,28 @@
+import pytest
+from src.scraper.rate_limiter import Fetcher
+from src.testing.stub_site import StubSite
+
+
+@pytest.fixture
+def stub_site():
+    site = StubSite().start()
+    yield site
+    site.stop()
+
+
+@pytest.fixture
+def sitemap_site():
+    site = StubSite(sitemap=True).start()
+    yield site
+    site.stop()
+
+
+@pytest.fixture
+def fast_fetcher():
+    """Factory for fetchers with millisecond pacing and backoff so tests stay quick."""
+    def make(**kwargs) -> Fetcher:
+        kwargs.setdefault("max_retries", 4)
+        kwargs.setdefault("breaker_kwargs", {"failure_threshold": 3, "cooldown": 0.2})
+        return Fetcher(backoff_base=0.01, backoff_max=0.05, timeout=2,
+                       limiter_kwargs={"initial_interval": 0.01, "min_interval": 0.001}, **kwargs)
+    return make
@@ -0,0 +1,66 @@
+import math
+import numpy as np
+import pandas as pd
+import pytest
+from src.db.snapshot import dataframe_to_table
+from src.search.bm25_index import BM25Index, tokenize
+from src.search.local_hybrid import LocalHybridSearcher
+
+DOCS = [
+    {"url": "a", "title": "Salt substitutes", "combined_text": "Potassium salt is a salt substitute.", "blog_tags": ["salt"]},
+    {"url": "b", "title": "Sugar", "combined_text": "Sugar and sweeteners in everyday food.", "blog_tags": ["sugar"]},
+    {"url": "c", "title": "Blood pressure", "combined_text": "Too much sodium raises blood pressure.", "blog_tags": []},
+]
+
+
+def test_tokenize():
+    assert tokenize("Healthier SALT-substitutes, 2023!") == ["healthier", "salt", "substitutes", "2023"]
+
+
+def test_scores_match_bm25_formula():
+    index = BM25Index.build(DOCS, boosts={"combined_text": 1.0})
+    lengths = [len(tokenize(doc["combined_text"])) for doc in DOCS]
+    avgdl = sum(lengths) / len(lengths)
+    idf = math.log(1 + (3 - 1 + 0.5) / (1 + 0.5))
+    expected = idf * 2 / (2 + 1.2 * (1 - 0.75 + 0.75 * lengths[0] / avgdl))
+    scores = index.scores("salt")
+    assert scores[0] == pytest.approx(expected, rel=1e-5)
+    assert scores[1] == 0 and scores[2] == 0
+
+
+def test_best_field_with_boosts():
+    index = BM25Index.build(DOCS)
+    assert [url for url, _ in index.search("salt")] == ["a"]
+    assert {url for url, _ in index.search("sodium sugar", k=5)} == {"b", "c"}
+    text_only = BM25Index.build(DOCS, boosts={"combined_text": 3.0})
+    title_only = BM25Index.build(DOCS, boosts={"title": 1.0})
+    both = BM25Index.build(DOCS, boosts={"combined_text": 3.0, "title": 1.0})
+    assert both.scores("sugar")[1] == pytest.approx(max(text_only.scores("sugar")[1], title_only.scores("sugar")[1]))
+
+
+def test_save_and_load_memory_mapped(tmp_path):
+    index = BM25Index.build(DOCS)
+    index.save(str(tmp_path))
+    loaded = BM25Index.load(str(tmp_path))
+    assert isinstance(loaded.fields["combined_text"]["docs"], np.memmap)
+    assert loaded.doc_ids == index.doc_ids
+    np.testing.assert_allclose(loaded.scores("salt blood pressure"), index.scores("salt blood pressure"))
+
+
+def test_local_hybrid_search():
+    vectors = np.eye(3, 768, dtype=np.float32)
+    table = dataframe_to_table(pd.DataFrame({
+        "url": ["c", "b", "a"],  # a different row order than the BM25 index
+        "title": ["Blood pressure", "Sugar", "Salt substitutes"],
+        "combined_text": [doc["combined_text"] for doc in reversed(DOCS)],
+        "title_vector": list(vectors),
+        "combined_text_vector": list(vectors),
+    }))
+    searcher = LocalHybridSearcher(BM25Index.build(DOCS), table)
+    for fusion in ("linear", "rrf"):
+        hits = searcher.search("salt", vectors[2], k=2, fusion=fusion)
+        assert hits[0]["_source"]["url"] == "a"
+        assert "combined_text_vector" not in hits[0]["_source"]
+    # The vector alone still finds a post without any keyword match
+    hits = searcher.search("unrelated words", vectors[0], k=1)
+    assert hits[0]["_source"]["url"] == "c"
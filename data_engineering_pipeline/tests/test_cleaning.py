@@ -0,0 +1,74 @@
+from src.utils import cleaning
+from src.utils.cleaning import (
+    ParagraphCleaner,
+    compile_prefix_matcher,
+    learn_boilerplate_rules,
+    load_learned_rules,
+    save_learned_rules,
+)
+
+FOOTER = "Subscribe to our free newsletter for the latest videos"
+
+
+def test_prefix_matcher_matches_any_prefix_at_the_start_only():
+    matcher = compile_prefix_matcher(["Image credit", "Image", "Doctor's Note", ""])
+    assert matcher.match("Image credit: Pixabay")
+    assert matcher.match("Images of salt")
+    assert matcher.match("Doctor's Note: see also")
+    assert not matcher.match("An Image credit")
+    assert compile_prefix_matcher([]) is None
+
+
+def test_clean_strips_translates_and_excludes_prefixes():
+    cleaner = ParagraphCleaner(["Image credit", "Please consider"])
+    paragraphs = ["  Salt “matters”  ", "Image credit: Pixabay", "", "   ", "Please consider donating"]
+    assert cleaner.clean(paragraphs) == [cleaning.replace_strange_chars("Salt “matters” ").strip()]
+    assert cleaner.clean([]) == []
+    assert cleaner.is_excluded("Image credit: x") and not cleaner.is_excluded("Salt")
+
+
+def test_learned_paragraph_only_excludes_exact_matches():
+    cleaner = ParagraphCleaner([], paragraphs=["Learn more"])
+    assert cleaner.clean(["Learn more", "Learn more about how fiber feeds gut bacteria."]) == [
+        "Learn more about how fiber feeds gut bacteria."]
+    assert cleaner.is_excluded("Learn more")
+    assert not cleaner.is_excluded("Learn more about fiber")
+
+
+def test_learn_boilerplate_rules():
+    documents = [[f"Post {i} is about salt.", FOOTER, "Learn more",
+                  f"Learn more about topic {i} in this video and the sources cited."] for i in range(10)]
+    documents += [[f"Post {i} has no footer."] for i in range(10, 12)]
+    rules = learn_boilerplate_rules(documents, min_doc_fraction=0.5, min_docs=3, prefix_words=4)
+    # The footer is covered by its learned prefix; "Learn more" is kept as an exact paragraph.
+    assert rules == {"prefixes": ["Learn more about topic", "Subscribe to our free"], "paragraphs": ["Learn more"]}
+
+    cleaner = ParagraphCleaner(rules["prefixes"], rules["paragraphs"])
+    kept = cleaner.clean(["Learn more", FOOTER, "Learn more about why salt raises blood pressure."])
+    assert kept == ["Learn more about why salt raises blood pressure."]
+
+
+def test_rare_paragraphs_are_not_learned():
+    documents = [[f"Unique paragraph number {i} with several words in it."] for i in range(20)]
+    assert learn_boilerplate_rules(documents, min_doc_fraction=0.5, min_docs=3) == {"prefixes": [], "paragraphs": []}
+
+
+def test_rules_round_trip_and_missing_file(tmp_path):
+    path = str(tmp_path / "rules" / "learned.json")
+    assert load_learned_rules(path) == {"prefixes": [], "paragraphs": []}
+    save_learned_rules({"prefixes": ["Subscribe to our"], "paragraphs": ["Learn more"]}, path)
+    assert load_learned_rules(path) == {"prefixes": ["Subscribe to our"], "paragraphs": ["Learn more"]}
+
+
+def test_default_cleaner_is_built_lazily_from_the_rules_file(tmp_path, monkeypatch):
+    path = str(tmp_path / "learned.json")
+    save_learned_rules({"prefixes": ["Subscribe to our"], "paragraphs": ["Learn more"]}, path)
+    monkeypatch.setattr(cleaning, "LEARNED_RULES_PATH", path)
+    cleaning.default_cleaner.cache_clear()
+    try:
+        cleaner = cleaning.default_cleaner()
+        assert cleaning.default_cleaner() is cleaner
+        assert cleaner.clean(["Subscribe to our newsletter", "Learn more", "Learn more about salt"]) == [
+            "Learn more about salt"]
+    finally:
+        cleaning.default_cleaner.cache_clear()
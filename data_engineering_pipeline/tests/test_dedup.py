@@ -0,0 +1,75 @@
+import numpy as np
+from src.utils.dedup import CachedEncoder, ParagraphDeduplicator, deduplicate_corpus, embedding_savings
+
+WORDS = ("salt sugar fiber protein sodium potassium beans greens fruit coffee heart blood pressure "
+         "cholesterol eggs meat cancer vitamin vegans gut bacteria study diet risk daily intake").split()
+
+
+def paragraph(seed, length=40):
+    rng = np.random.default_rng(seed)
+    return " ".join(rng.choice(WORDS, size=length))
+
+
+def test_near_duplicates_behind_the_first_bucket_member_are_clustered():
+    # Two bands of two rows. All three collide in band 0 with A first; B and C share
+    # nothing else, so they are only found if non-first members are compared too.
+    deduplicator = ParagraphDeduplicator(threshold=0.7, num_perm=4, bands=2)
+    signatures = np.array([[1, 1, 5, 5],   # A: 0.5 similar to B and C
+                           [1, 1, 2, 3],   # B
+                           [1, 1, 2, 4]],  # C: 0.75 similar to B
+                          dtype=np.uint64)
+    union_find = deduplicator._cluster(signatures)
+    assert union_find.find(1) == union_find.find(2) == 1
+    assert union_find.find(0) == 0
+
+
+def test_identical_signatures_are_merged_without_comparisons():
+    deduplicator = ParagraphDeduplicator(threshold=0.99, num_perm=4, bands=2)
+    union_find = deduplicator._cluster(np.array([[7, 7, 7, 7]] * 5, dtype=np.uint64))
+    assert {union_find.find(i) for i in range(5)} == {0}
+
+
+def test_fit_clusters_near_duplicate_paragraphs():
+    base = paragraph(0)
+    edited = base.replace(base.split()[20], "edited", 1)
+    documents = [[paragraph(1), base], [edited, paragraph(2)], [paragraph(3)]]
+    deduplicator = ParagraphDeduplicator().fit(documents)
+    assert deduplicator.canonical[(1, 0)] == (0, 1)
+    assert deduplicator.is_duplicate((1, 0))
+    assert not deduplicator.is_duplicate((0, 1))
+    assert not deduplicator.is_duplicate((2, 0))
+
+
+def test_deduplicate_corpus_drops_boilerplate_and_repeats():
+    footer = "Subscribe to our free newsletter to get the latest nutrition videos every week"
+    documents = [[paragraph(i), footer] for i in range(4)]
+    documents[0].append(documents[0][0])  # a passage repeated within one post
+    cleaned, stats = deduplicate_corpus(documents, min_docs=3)
+    assert cleaned == [[paragraph(i)] for i in range(4)]
+    assert stats == {"paragraphs": 9, "boilerplate_removed": 4, "repeats_removed": 1}
+
+
+def test_cached_encoder_encodes_each_text_once():
+    class CountingModel:
+        calls = 0
+
+        def encode(self, text):
+            self.calls += 1
+            return np.array([len(text)])
+
+    encoder = CachedEncoder(CountingModel())
+    for text in ["a", "bb", "a", "a"]:
+        encoder.encode(text)
+    assert encoder.calls == 2 and encoder.calls_saved == 2
+
+
+def test_embedding_savings_counts_real_encoder_calls():
+    footer = "Subscribe to our free newsletter to get the latest nutrition videos every week"
+    posts = [{"title": f"Post {i}", "paragraphs": [paragraph(i), footer]} for i in range(3)]
+    posts.append({"title": "Post 0", "paragraphs": [paragraph(0), footer]})  # republished post
+    savings = embedding_savings(posts, min_docs=3)
+    assert savings["paragraphs"] == 8 and savings["paragraphs_removed"] == 4
+    # Titles and texts of the republished post are identical before and after.
+    assert savings["encoder_calls_before"] == savings["encoder_calls_after"] == 6
+    assert savings["cache_hits_before"] == savings["cache_hits_after"] == 2
+    assert savings["characters_embedded_before"] - savings["characters_embedded_after"] == 3 * (len(footer) + 1)
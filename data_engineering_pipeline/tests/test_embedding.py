@@ -0,0 +1,58 @@
+import json
+import numpy as np
+import pytest
+from src.search.embedding import FP32_FILE, INT8_FILE, SETTINGS_FILE, TOKENIZER_FILE, OnnxEncoder, mean_pooling
+
+onnx = pytest.importorskip("onnx")
+pytest.importorskip("onnxruntime")
+tokenizers = pytest.importorskip("tokenizers")
+
+VOCAB = {"<pad>": 0, "<unk>": 1, "salt": 2, "sugar": 3, "blood": 4, "pressure": 5}
+
+
+@pytest.fixture
+def model_dir(tmp_path):
+    """A stand-in 'transformer' that looks up a fixed embedding per token id."""
+    from onnx import TensorProto, helper, numpy_helper
+    table = np.random.default_rng(0).standard_normal((len(VOCAB), 4)).astype(np.float32)
+    graph = helper.make_graph(
+        [helper.make_node("Gather", ["table", "input_ids"], ["token_embeddings"], axis=0)],
+        "lookup",
+        [helper.make_tensor_value_info("input_ids", TensorProto.INT64, ["batch", "sequence"]),
+         helper.make_tensor_value_info("attention_mask", TensorProto.INT64, ["batch", "sequence"])],
+        [helper.make_tensor_value_info("token_embeddings", TensorProto.FLOAT, ["batch", "sequence", 4])],
+        [numpy_helper.from_array(table, "table")],
+    )
+    model = helper.make_model(graph, opset_imports=[helper.make_opsetid("", 17)])
+    model.ir_version = 8
+    for name in (FP32_FILE, INT8_FILE):
+        onnx.save(model, str(tmp_path / name))
+    tokenizer = tokenizers.Tokenizer(tokenizers.models.WordLevel(VOCAB, unk_token="<unk>"))
+    tokenizer.pre_tokenizer = tokenizers.pre_tokenizers.Whitespace()
+    tokenizer.save(str(tmp_path / TOKENIZER_FILE))
+    settings = {"dimension": 4, "max_seq_length": 3, "normalize": True, "pad_token": "<pad>", "pad_token_id": 0}
+    (tmp_path / SETTINGS_FILE).write_text(json.dumps(settings))
+    return str(tmp_path), table
+
+
+def expected(table, token_ids):
+    vector = table[token_ids].mean(axis=0)
+    return vector / np.linalg.norm(vector)
+
+
+def test_mean_pooling_ignores_padding():
+    tokens = np.array([[[1.0, 1.0], [3.0, 3.0], [100.0, 100.0]]])
+    np.testing.assert_allclose(mean_pooling(tokens, np.array([[1, 1, 0]])), [[2.0, 2.0]])
+
+
+def test_onnx_encoder_pools_normalises_and_keeps_order(model_dir):
+    path, table = model_dir
+    encoder = OnnxEncoder(path)
+    texts = ["salt", "blood pressure salt sugar", "sugar blood"]  # the second is truncated to 3 tokens
+    vectors = encoder.encode(texts, batch_size=2)
+    assert vectors.shape == (3, 4) and vectors.dtype == np.float32
+    np.testing.assert_allclose(vectors[0], expected(table, [2]), rtol=1e-5)
+    np.testing.assert_allclose(vectors[1], expected(table, [4, 5, 2]), rtol=1e-5)
+    np.testing.assert_allclose(vectors[2], expected(table, [3, 4]), rtol=1e-5)
+    # A single string gives a single vector, as with SentenceTransformer.encode
+    np.testing.assert_allclose(encoder.encode("sugar blood"), vectors[2], rtol=1e-5)
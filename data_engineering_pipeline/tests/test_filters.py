@@ -0,0 +1,32 @@
+import pytest
+from src.search.filters import build_filter_clauses
+
+
+def test_keyword_and_date_filters():
+    clauses = build_filter_clauses({
+        "category": "Nutrition",
+        "blog_tags": ["salt", "Sodium Intake "],
+        "created": {"gte": "2022-01-01", "lt": "2023-01-01"},
+    })
+    assert clauses == [
+        {"terms": {"category": ["nutrition"]}},
+        {"terms": {"blog_tags": ["salt", "sodium intake"]}},
+        {"range": {"created": {"gte": "2022-01-01", "lt": "2023-01-01"}}},
+    ]
+
+
+def test_url_filter_keeps_case():
+    assert build_filter_clauses({"url": "https://example.org/Blog/"}) == [
+        {"terms": {"url": ["https://example.org/Blog/"]}}]
+
+
+def test_empty_filters_are_ignored():
+    assert build_filter_clauses(None) == []
+    assert build_filter_clauses({"category": None, "blog_tags": [], "created": {}}) == []
+
+
+def test_invalid_filters_raise():
+    with pytest.raises(ValueError):
+        build_filter_clauses({"author": "someone"})
+    with pytest.raises(ValueError):
+        build_filter_clauses({"created": {"after": "2022-01-01"}})
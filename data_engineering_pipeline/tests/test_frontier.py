@@ -0,0 +1,96 @@
+import json
+import multiprocessing
+import os
+import signal
+import time
+from typing import Dict
+import pytest
+from src.main import crawl
+from src.scraper.frontier import CrawlFrontier, DONE, FAILED
+from src.scraper.html_archive import HtmlArchive
+
+CHECKPOINT_EVERY = 3
+
+
+class JsonLinesHandler:
+    """Stands in for MongoHandler, upserting documents into a JSON-lines file by URL."""
+
+    def __init__(self, path: str):
+        self.path = path
+
+    def upsert_blog_post(self, blog_content: Dict):
+        with open(self.path, "a") as f:
+            f.write(json.dumps(blog_content) + "\n")
+
+    def urls(self):
+        with open(self.path) as f:
+            return {json.loads(line)["url"] for line in f}
+
+
+def run_crawl(tmp_path, root, fetcher):
+    frontier = CrawlFrontier(str(tmp_path / "frontier.sqlite3"), checkpoint_every=CHECKPOINT_EVERY)
+    crawl(JsonLinesHandler(str(tmp_path / "posts.jsonl")), HtmlArchive(str(tmp_path / "archive")),
+          frontier, root=root, fetcher=fetcher)
+    return frontier
+
+
+def post_hits(site):
+    return sum(n for path, n in site.hits.items() if path.startswith("/blog/post-"))
+
+
+@pytest.mark.skipif(not hasattr(os, "fork"), reason="needs fork to kill a crawl mid-flight")
+def test_crawl_resumes_after_kill(tmp_path, stub_site, fast_fetcher):
+    def slow_posts(path, count):
+        # Slow the posts down so the crawl is reliably killed half way.
+        if path.startswith("/blog/post-"):
+            time.sleep(0.05)
+        return None
+
+    stub_site.fault = slow_posts
+    context = multiprocessing.get_context("fork")
+    child = context.Process(target=run_crawl, args=(tmp_path, stub_site.root, fast_fetcher()))
+    child.start()
+    deadline = time.monotonic() + 20
+    while post_hits(stub_site) < stub_site.n_posts // 2 and time.monotonic() < deadline:
+        time.sleep(0.01)
+    os.kill(child.pid, signal.SIGKILL)
+    child.join()
+    fetched_before_kill = post_hits(stub_site)
+    assert 0 < fetched_before_kill < stub_site.n_posts
+
+    listing_hits = stub_site.hits["/blog/"]
+    frontier = run_crawl(tmp_path, stub_site.root, fast_fetcher())
+
+    assert frontier.counts() == {DONE: stub_site.n_posts}
+    assert stub_site.hits["/blog/"] == listing_hits  # discovery is not repeated
+    # At most the unflushed batch plus the in-flight URL is fetched a second time.
+    assert post_hits(stub_site) <= stub_site.n_posts + CHECKPOINT_EVERY + 1
+    handler = JsonLinesHandler(str(tmp_path / "posts.jsonl"))
+    assert handler.urls() == set(stub_site.post_urls)
+    frontier.close()
+
+
+def test_failed_urls_are_retried_on_next_run(tmp_path, stub_site, fast_fetcher):
+    stub_site.fault = lambda path, count: (500, {}) if path == "/blog/post-3/" and count <= 2 else None
+    fetcher = fast_fetcher(max_retries=1, breaker_kwargs={"failure_threshold": 100})
+
+    frontier = run_crawl(tmp_path, stub_site.root, fetcher)
+    assert frontier.counts() == {DONE: stub_site.n_posts - 1, FAILED: 1}
+    frontier.close()
+
+    frontier = run_crawl(tmp_path, stub_site.root, fetcher)
+    assert frontier.counts() == {DONE: stub_site.n_posts}
+    assert stub_site.hits["/blog/post-0/"] == 1
+    assert stub_site.hits["/blog/post-3/"] == 3
+    frontier.close()
+
+
+def test_failed_urls_give_up_after_max_attempts(tmp_path):
+    frontier = CrawlFrontier(str(tmp_path / "frontier.sqlite3"), checkpoint_every=1, max_attempts=2)
+    frontier.add_urls(["https://example.org/a/"])
+    for _ in range(2):
+        assert frontier.pending() == ["https://example.org/a/"]
+        frontier.mark_in_flight("https://example.org/a/")
+        frontier.mark_failed("https://example.org/a/", "boom")
+    assert frontier.pending() == []
+    frontier.close()
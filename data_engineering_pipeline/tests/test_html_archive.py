@@ -0,0 +1,80 @@
+import json
+from concurrent.futures import ThreadPoolExecutor
+import pytest
+from src.main import parallel_parse, parse_page
+from src.scraper import html_archive
+from src.scraper.html_archive import HtmlArchive
+from src.testing.stub_site import POST_TEMPLATE
+
+
+def test_round_trip_and_reopen(tmp_path):
+    archive = HtmlArchive(str(tmp_path))
+    archive.append("https://example.org/a/", b"<html>a</html>")
+    archive.append("https://example.org/b/", b"<html>b</html>", status=404)
+    archive.append("https://example.org/a/", b"<html>a, updated</html>")
+    assert archive.get("https://example.org/a/") == b"<html>a, updated</html>"
+    assert archive.get("https://example.org/missing/") is None
+
+    reopened = HtmlArchive(str(tmp_path))
+    assert len(reopened) == 2 and "https://example.org/b/" in reopened
+    assert reopened.get("https://example.org/a/") == b"<html>a, updated</html>"
+
+
+def test_iter_records_yields_latest_record_in_file_order(tmp_path):
+    archive = HtmlArchive(str(tmp_path))
+    for url, content in [("a", b"1"), ("b", b"2"), ("a", b"3"), ("c", b"4")]:
+        archive.append(url, content)
+    assert list(HtmlArchive(str(tmp_path)).iter_records()) == [("b", b"2"), ("a", b"3"), ("c", b"4")]
+    assert list(HtmlArchive(str(tmp_path / "empty")).iter_records()) == []
+
+
+def test_truncated_index_line_is_skipped(tmp_path):
+    archive = HtmlArchive(str(tmp_path))
+    archive.append("a", b"kept")
+    with open(archive.index_path, "a", encoding="utf-8") as f:
+        f.write('{"url": "b", "off')
+    reopened = HtmlArchive(str(tmp_path))
+    assert len(reopened) == 1 and reopened.get("a") == b"kept"
+
+
+def test_zstd_falls_back_to_gzip_without_zstandard(tmp_path, monkeypatch):
+    monkeypatch.setattr(html_archive, "zstandard", None)
+    archive = HtmlArchive(str(tmp_path), codec="zstd")
+    assert archive.codec == "gzip"
+    assert archive.append("a", b"content")["codec"] == "gzip"
+    with pytest.raises(ValueError):
+        HtmlArchive(str(tmp_path), codec="brotli")
+
+
+def test_zstd_record_without_zstandard_raises_clear_error(tmp_path, monkeypatch):
+    archive = HtmlArchive(str(tmp_path))
+    entry = archive.append("a", b"content")
+    with open(archive.index_path, "a", encoding="utf-8") as f:
+        f.write(json.dumps({**entry, "url": "z", "codec": "zstd"}) + "\n")
+    monkeypatch.setattr(html_archive, "zstandard", None)
+    with pytest.raises(ImportError, match="zstandard"):
+        HtmlArchive(str(tmp_path)).get("z")
+
+
+def test_zstd_round_trip(tmp_path):
+    pytest.importorskip("zstandard")
+    archive = HtmlArchive(str(tmp_path), codec="zstd")
+    archive.append("a", b"<html>zstd</html>")
+    assert HtmlArchive(str(tmp_path)).get("a") == b"<html>zstd</html>"
+
+
+def test_parallel_parse_streams_in_bounded_batches():
+    consumed = []
+
+    def records():
+        for i in range(200):
+            consumed.append(i)
+            yield f"https://example.org/blog/post-{i}/", POST_TEMPLATE.format(i=i).encode()
+
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        parsed = parallel_parse(executor, records(), workers=2, batch_size=5)
+        first = next(parsed)
+        assert len(consumed) <= (2 * 2 + 1) * 5  # not the whole archive
+        rest = list(parsed)
+    assert [post["url"] for post in [first] + rest] == [f"https://example.org/blog/post-{i}/" for i in range(200)]
+    assert first == parse_page(("https://example.org/blog/post-0/", POST_TEMPLATE.format(i=0).encode()))
@@ -0,0 +1,82 @@
+import pytest
+from elasticsearch import Elasticsearch, helpers
+from src.search.index_manager import (
+    BULK_LOAD_SETTINGS,
+    bulk_index,
+    create_versioned_index,
+    garbage_collect_indices,
+    get_alias_indices,
+    list_versioned_indices,
+    rebuild_index,
+    swap_alias,
+)
+from src.testing.stub_elasticsearch import StubElasticsearch
+
+ALIAS = "blog_posts_index"
+MAPPINGS = {"properties": {"url": {"type": "keyword"}, "created": {"type": "date"}}}
+
+
+@pytest.fixture
+def es():
+    stub = StubElasticsearch().start()
+    yield stub, Elasticsearch(stub.url)
+    stub.stop()
+
+
+def documents(n, bad=()):
+    return [{"url": f"https://example.org/blog/post-{i}/",
+             "created": "Unknown" if i in bad else "2023-01-01T00:00:00+00:00"} for i in range(n)]
+
+
+def test_create_and_bulk_index(es):
+    stub, client = es
+    name = create_versioned_index(client, ALIAS, MAPPINGS)
+    assert name.startswith(f"{ALIAS}_v")
+    assert stub.indices[name]["settings"]["refresh_interval"] == BULK_LOAD_SETTINGS["refresh_interval"]
+    assert bulk_index(client, name, documents(25), chunk_size=10, thread_count=2) == 25
+    assert len(stub.indices[name]["docs"]) == 25
+
+
+def test_bulk_index_raises_on_rejected_documents(es):
+    _, client = es
+    name = create_versioned_index(client, ALIAS, MAPPINGS)
+    with pytest.raises(helpers.BulkIndexError):
+        bulk_index(client, name, documents(10, bad={3}), chunk_size=5)
+    assert bulk_index(client, name, documents(10, bad={3, 7}), chunk_size=5, max_failures=2) == 8
+
+
+def test_rebuild_swaps_alias_and_collects_garbage(es):
+    stub, client = es
+    first = rebuild_index(client, ALIAS, MAPPINGS, documents(5), keep=2)
+    assert get_alias_indices(client, ALIAS) == [first]
+    assert stub.indices[first]["operations"] == ["_settings", "_refresh", "_forcemerge"]
+    second = rebuild_index(client, ALIAS, MAPPINGS, documents(5), keep=2)
+    third = rebuild_index(client, ALIAS, MAPPINGS, documents(5), keep=2)
+    assert get_alias_indices(client, ALIAS) == [third]
+    assert list_versioned_indices(client, ALIAS) == [second, third]
+
+
+def test_failed_rebuild_keeps_the_live_index(es):
+    stub, client = es
+    live = rebuild_index(client, ALIAS, MAPPINGS, documents(5))
+    with pytest.raises(helpers.BulkIndexError):
+        rebuild_index(client, ALIAS, MAPPINGS, documents(5, bad={2}))
+    assert get_alias_indices(client, ALIAS) == [live]
+    assert list_versioned_indices(client, ALIAS) == [live]
+
+
+def test_swap_alias_replaces_legacy_concrete_index(es):
+    stub, client = es
+    client.indices.create(index=ALIAS, mappings=MAPPINGS)
+    name = create_versioned_index(client, ALIAS, MAPPINGS)
+    swap_alias(client, ALIAS, name)
+    assert ALIAS not in stub.indices
+    assert get_alias_indices(client, ALIAS) == [name]
+
+
+def test_garbage_collection_never_deletes_the_live_index(es):
+    _, client = es
+    names = [create_versioned_index(client, ALIAS, MAPPINGS) for _ in range(3)]
+    swap_alias(client, ALIAS, names[0])
+    assert garbage_collect_indices(client, ALIAS, keep=1) == [names[1]]
+    assert list_versioned_indices(client, ALIAS) == [names[0], names[2]]
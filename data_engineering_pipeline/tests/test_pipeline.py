@@ -0,0 +1,102 @@
+import os
+import re
+import threading
+import pytest
+from src.config import PROJECT_DIR
+from src.pipeline import (
+    BLOCKED, FAILED, RAN, SKIPPED, WOULD_RUN, Artifact, FileArtifact, MongoCollectionArtifact, Pipeline, Stage,
+    default_stages,
+)
+
+
+def write(path, text):
+    with open(path, "w") as f:
+        f.write(text)
+
+
+def copy_stage(name, source, target, calls):
+    def action():
+        calls.append(name)
+        with open(source) as f:
+            write(target, f.read().upper())
+    return Stage(name, action, inputs=[FileArtifact(source)], outputs=[FileArtifact(target)])
+
+
+def statuses(results):
+    return {result.name: result.status for result in results}
+
+
+def test_skips_unchanged_stages_and_reruns_downstream(tmp_path):
+    raw, clean, final = (str(tmp_path / name) for name in ("raw.txt", "clean.txt", "final.txt"))
+    write(raw, "posts")
+    calls = []
+
+    def build():
+        return Pipeline([copy_stage("clean", raw, clean, calls), copy_stage("final", clean, final, calls)],
+                        state_path=str(tmp_path / "state.json"))
+
+    assert statuses(build().run()) == {"clean": RAN, "final": RAN}
+    assert statuses(build().run()) == {"clean": SKIPPED, "final": SKIPPED}
+    write(raw, "more posts")
+    assert statuses(build().run(dry_run=True)) == {"clean": WOULD_RUN, "final": WOULD_RUN}
+    assert calls == ["clean", "final"]
+    assert statuses(build().run()) == {"clean": RAN, "final": RAN}
+    # A deleted output makes its stage out of date
+    (tmp_path / "final.txt").unlink()
+    assert statuses(build().run(["final"])) == {"clean": SKIPPED, "final": RAN}
+    assert statuses(build().run(["final"], force=True)) == {"clean": RAN, "final": RAN}
+
+
+def test_independent_stages_run_concurrently(tmp_path):
+    write(str(tmp_path / "in.txt"), "x")
+    barrier = threading.Barrier(2, timeout=5)  # only passes if both stages run at the same time
+    stages = [Stage(name, barrier.wait, inputs=[FileArtifact(str(tmp_path / "in.txt"))]) for name in ("a", "b")]
+    results = Pipeline(stages, state_path=str(tmp_path / "state.json"), jobs=2).run()
+    assert statuses(results) == {"a": RAN, "b": RAN}
+
+
+def test_failure_blocks_dependent_stages(tmp_path):
+    write(str(tmp_path / "in.txt"), "x")
+
+    def fail():
+        raise RuntimeError("boom")
+
+    out = FileArtifact(str(tmp_path / "out.txt"))
+    stages = [Stage("first", fail, inputs=[FileArtifact(str(tmp_path / "in.txt"))], outputs=[out]),
+              Stage("second", lambda: None, inputs=[out])]
+    pipeline = Pipeline(stages, state_path=str(tmp_path / "state.json"))
+    results = pipeline.run()
+    assert statuses(results) == {"first": FAILED, "second": BLOCKED}
+    assert results[0].error == "boom"
+    assert pipeline.state == {}
+
+
+def test_artifact_subclasses_must_define_fingerprint():
+    class Unfinished(Artifact):
+        pass
+
+    with pytest.raises(TypeError):
+        Unfinished("unfinished")
+
+
+def test_mongo_collection_fingerprint_follows_content():
+    mongomock = pytest.importorskip("mongomock")
+    collection = mongomock.MongoClient()["web_scraper_db"]["blog_posts"]
+    artifact = MongoCollectionArtifact(collection=collection)
+    empty = artifact.fingerprint()
+    collection.insert_one({"url": "https://example.org/a/", "title": "A"})
+    first = artifact.fingerprint()
+    assert first != empty and artifact.fingerprint() == first
+    collection.update_one({"url": "https://example.org/a/"}, {"$set": {"title": "B"}})
+    assert artifact.fingerprint() != first
+
+
+def test_index_stage_fingerprints_every_module_hybrid_search_imports():
+    index = next(stage for stage in default_stages() if stage.name == "index")
+    covered = [artifact.path for artifact in index.inputs if isinstance(artifact, FileArtifact)]
+    with open(os.path.join(PROJECT_DIR, "hybrid_search.py")) as f:
+        modules = re.findall(r"^from (src\.[\w.]+) import", f.read(), re.MULTILINE)
+    assert modules
+    for module in modules:
+        path = os.path.join(PROJECT_DIR, *module.split(".")) + ".py"
+        assert any(path == c or path.startswith(c + os.sep) for c in covered), module
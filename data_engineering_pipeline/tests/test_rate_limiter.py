@@ -0,0 +1,106 @@
+import time
+from src.scraper.rate_limiter import AdaptiveRateLimiter, CircuitBreaker, parse_retry_after
+
+
+def test_parse_retry_after():
+    assert parse_retry_after("3") == 3.0
+    assert parse_retry_after(None) is None
+    assert parse_retry_after("garbage") is None
+    assert parse_retry_after("Wed, 21 Oct 2015 07:28:00 GMT") == 0.0  # in the past
+
+
+def test_limiter_aimd():
+    limiter = AdaptiveRateLimiter(initial_interval=0.5, min_interval=0.1, max_interval=10,
+                                  increase=1.0, decrease_factor=0.5, target_latency=1.0)
+    assert limiter.rate == 2.0
+    limiter.on_success(latency=0.1)
+    assert limiter.rate == 3.0
+    limiter.on_success(latency=5.0)  # slow responses count as back-pressure
+    assert limiter.rate == 1.5
+    limiter.on_throttle()
+    assert limiter.rate == 0.75
+    for _ in range(100):
+        limiter.on_success(latency=0.1)
+    assert limiter.rate == 10.0  # capped by min_interval
+
+
+def test_limiter_honours_retry_after():
+    limiter = AdaptiveRateLimiter(initial_interval=0.001, min_interval=0.001)
+    limiter.on_throttle(retry_after=0.3)
+    start = time.monotonic()
+    limiter.acquire()
+    assert time.monotonic() - start >= 0.25
+
+
+def test_circuit_breaker_opens_and_probes():
+    breaker = CircuitBreaker(failure_threshold=2, cooldown=0.1)
+    breaker.record_failure()
+    assert breaker.allow()
+    breaker.record_failure()
+    assert not breaker.allow()
+    time.sleep(0.15)
+    assert breaker.allow()  # half-open probe
+    assert not breaker.allow()
+    breaker.record_success()
+    assert breaker.allow()
+
+
+def test_throttled_probe_reopens_circuit():
+    breaker = CircuitBreaker(failure_threshold=1, cooldown=0.1)
+    breaker.record_throttle()
+    assert breaker.state == CircuitBreaker.CLOSED  # 429s alone do not open the circuit
+    breaker.record_failure()
+    time.sleep(0.15)
+    assert breaker.allow()
+    breaker.record_throttle()
+    assert breaker.state == CircuitBreaker.OPEN
+    time.sleep(0.15)
+    assert breaker.allow()  # probed again after another cooldown
+    breaker.record_success()
+    assert breaker.state == CircuitBreaker.CLOSED
+
+
+def test_fetch_recovers_after_throttled_probe(stub_site, fast_fetcher):
+    fetcher = fast_fetcher(max_retries=0, breaker_kwargs={"failure_threshold": 1, "cooldown": 0.1})
+    stub_site.fault = lambda path, count: (500, {})
+    fetcher.fetch(stub_site.post_urls[0])
+    time.sleep(0.15)
+    stub_site.fault = lambda path, count: (429, {})
+    assert fetcher.fetch(stub_site.post_urls[1]).status_code == 429  # the probe
+    stub_site.fault = None
+    time.sleep(0.15)
+    assert fetcher.fetch(stub_site.post_urls[2]).status_code == 200
+
+
+def test_fetch_retries_server_errors(stub_site, fast_fetcher):
+    # The first two requests for each path fail with 503.
+    stub_site.fault = lambda path, count: (503, {}) if count <= 2 else None
+    response = fast_fetcher().fetch(stub_site.post_urls[0])
+    assert response.status_code == 200
+    assert stub_site.hits["/blog/post-0/"] == 3
+
+
+def test_fetch_honours_retry_after_and_slows_down(stub_site, fast_fetcher):
+    stub_site.fault = lambda path, count: (429, {"Retry-After": "0.3"}) if count == 1 else None
+    fetcher = fast_fetcher()
+    start = time.monotonic()
+    response = fetcher.fetch(stub_site.post_urls[0])
+    assert response.status_code == 200
+    assert time.monotonic() - start >= 0.25
+    limiter = next(iter(fetcher.limiters.values()))
+    assert limiter.rate < 100  # halved from the initial 1 / 0.01 before recovering by one step
+
+
+def test_fetch_does_not_retry_client_errors(stub_site, fast_fetcher):
+    response = fast_fetcher().fetch(stub_site.root + "missing/")
+    assert response.status_code == 404
+    assert stub_site.hits["/blog/missing/"] == 1
+
+
+def test_circuit_breaker_stops_hammering_failing_host(stub_site, fast_fetcher):
+    stub_site.fault = lambda path, count: (500, {})
+    fetcher = fast_fetcher(max_retries=1)
+    for url in stub_site.post_urls:
+        fetcher.fetch(url)
+    # Three consecutive failures open the circuit; later URLs are skipped without a request.
+    assert sum(stub_site.hits.values()) == 3
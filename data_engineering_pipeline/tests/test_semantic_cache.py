@@ -0,0 +1,56 @@
+import time
+import numpy as np
+from src.search.semantic_cache import SemanticQueryCache, cache_context
+
+
+def unit(*values):
+    vector = np.zeros(8, dtype=np.float32)
+    vector[:len(values)] = values
+    return vector / np.linalg.norm(vector)
+
+
+def test_similar_query_hits_and_dissimilar_misses():
+    cache = SemanticQueryCache(threshold=0.95, max_entries=4, dim=8)
+    cache.put(unit(1, 0.1), ["salt substitutes"])
+    assert cache.get(unit(1, 0.15)) == ["salt substitutes"]
+    assert cache.get(unit(0, 1)) is None
+    assert cache.hits == 1 and cache.misses == 1
+
+
+def test_context_must_match():
+    cache = SemanticQueryCache(threshold=0.95, max_entries=4, dim=8)
+    cache.put(unit(1), ["k=5"], cache_context("blog_posts_index", 5))
+    assert cache.get(unit(1), cache_context("blog_posts_index", 10)) is None
+    assert cache.get(unit(1), cache_context("blog_posts_index", 5, {"category": ["Nutrition"]})) is None
+    assert cache.get(unit(1), cache_context("blog_posts_index", 5)) == ["k=5"]
+
+
+def test_lru_eviction():
+    cache = SemanticQueryCache(threshold=0.99, max_entries=2, dim=8)
+    cache.put(unit(1), "a")
+    cache.put(unit(0, 1), "b")
+    assert cache.get(unit(1)) == "a"  # "b" is now least recently used
+    cache.put(unit(0, 0, 1), "c")
+    assert len(cache) == 2
+    assert cache.get(unit(0, 1)) is None
+    assert cache.get(unit(1)) == "a"
+    assert cache.get(unit(0, 0, 1)) == "c"
+
+
+def test_ttl_expiry():
+    cache = SemanticQueryCache(threshold=0.99, max_entries=2, ttl=0.05, dim=8)
+    cache.put(unit(1), "a")
+    time.sleep(0.1)
+    assert cache.get(unit(1)) is None
+    assert len(cache) == 0
+
+
+def test_index_version_change_clears_cache():
+    version = {"current": "blog_posts_index_v1"}
+    cache = SemanticQueryCache(threshold=0.99, max_entries=2, dim=8,
+                               version_fn=lambda: version["current"], version_check_interval=0)
+    cache.get(unit(1))
+    cache.put(unit(1), "old")
+    assert cache.get(unit(1)) == "old"
+    version["current"] = "blog_posts_index_v2"
+    assert cache.get(unit(1)) is None
@@ -0,0 +1,76 @@
+import gzip
+from src.main import crawl
+from src.scraper.frontier import CrawlFrontier, DONE
+from src.scraper.html_archive import HtmlArchive
+from src.scraper.sitemap import extract_sitemap_urls, iter_sitemap_entries
+from src.scraper.url_extractor import extract_all_urls
+
+
+class ListHandler:
+    def __init__(self):
+        self.urls = []
+
+    def upsert_blog_post(self, blog_content):
+        self.urls.append(blog_content["url"])
+
+
+def test_iter_sitemap_entries_handles_gzip_and_namespaces():
+    xml = (b'<?xml version="1.0"?><urlset xmlns="http://www.sitemaps.org/schemas/sitemap/0.9">'
+           b"<url><loc>https://example.org/a/</loc><lastmod>2024-01-01</lastmod></url>"
+           b"<url><loc>https://example.org/b/</loc></url></urlset>")
+    expected = [("url", "https://example.org/a/", "2024-01-01"), ("url", "https://example.org/b/", None)]
+    assert list(iter_sitemap_entries(xml)) == expected
+    assert list(iter_sitemap_entries(gzip.compress(xml))) == expected
+
+
+def test_iter_sitemap_entries_ignores_image_locs():
+    xml = (b'<?xml version="1.0"?><urlset xmlns="http://www.sitemaps.org/schemas/sitemap/0.9" '
+           b'xmlns:image="http://www.google.com/schemas/sitemap-image/1.1">'
+           b"<url><loc>https://example.org/a/</loc><lastmod>2024-01-01</lastmod>"
+           b"<image:image><image:loc>https://example.org/wp-content/a.jpg</image:loc></image:image></url>"
+           b"<url><image:image><image:loc>https://example.org/wp-content/b.jpg</image:loc></image:image>"
+           b"<loc>https://example.org/b/</loc></url></urlset>")
+    assert list(iter_sitemap_entries(xml)) == [("url", "https://example.org/a/", "2024-01-01"),
+                                               ("url", "https://example.org/b/", None)]
+
+
+def test_extract_sitemap_urls(sitemap_site, fast_fetcher):
+    lastmods = extract_sitemap_urls(root=sitemap_site.root, fetcher=fast_fetcher())
+    assert sorted(lastmods) == sorted(sitemap_site.post_urls)
+    assert set(lastmods.values()) == {"2023-01-01T00:00:00+00:00"}
+    # robots.txt, the index and two child sitemaps; no listing pages.
+    assert sum(sitemap_site.hits.values()) == 4
+
+
+def test_extract_sitemap_urls_returns_none_without_sitemap(stub_site, fast_fetcher):
+    assert extract_sitemap_urls(root=stub_site.root, fetcher=fast_fetcher()) is None
+
+
+def test_sitemap_matches_pagination(sitemap_site, fast_fetcher):
+    from_sitemap = extract_sitemap_urls(root=sitemap_site.root, fetcher=fast_fetcher())
+    from_pages = extract_all_urls(root=sitemap_site.root, fetcher=fast_fetcher())
+    assert sorted(from_sitemap) == sorted(from_pages)
+
+
+def test_crawl_skips_unchanged_posts(tmp_path, sitemap_site, fast_fetcher):
+    frontier = CrawlFrontier(str(tmp_path / "frontier.sqlite3"))
+    archive = HtmlArchive(str(tmp_path / "archive"))
+    handler = ListHandler()
+    crawl(handler, archive, frontier, root=sitemap_site.root, fetcher=fast_fetcher())
+    assert sorted(handler.urls) == sorted(sitemap_site.post_urls)
+
+    sitemap_site.lastmods[2] = "2024-06-01T00:00:00+00:00"
+    handler.urls.clear()
+    crawl(handler, archive, frontier, root=sitemap_site.root, fetcher=fast_fetcher())
+    assert handler.urls == [sitemap_site.post_urls[2]]
+    assert frontier.counts() == {DONE: sitemap_site.n_posts}
+    frontier.close()
+
+
+def test_crawl_falls_back_to_pagination(tmp_path, stub_site, fast_fetcher):
+    frontier = CrawlFrontier(str(tmp_path / "frontier.sqlite3"))
+    handler = ListHandler()
+    crawl(handler, HtmlArchive(str(tmp_path / "archive")), frontier,
+          root=stub_site.root, fetcher=fast_fetcher(), discovery="sitemap")
+    assert sorted(handler.urls) == sorted(stub_site.post_urls)
+    frontier.close()
@@ -0,0 +1,57 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+pytest.importorskip("pyarrow")
+
+from src.db.snapshot import iter_documents, read_snapshot, table_to_dataframe, vector_matrix, write_snapshot
+
+
+def corpus(n: int = 5, dim: int = 768) -> pd.DataFrame:
+    rng = np.random.default_rng(0)
+    return pd.DataFrame({
+        "url": [f"https://example.org/post-{i}/" for i in range(n)],
+        "title": [f"Post {i}" for i in range(n)],
+        "title_vector": [rng.standard_normal(dim).tolist() for _ in range(n)],
+        "combined_text_vector": [rng.standard_normal(dim).tolist() for _ in range(n)],
+        "blog_tags": [["salt", "sodium"]] * n,
+    })
+
+
+@pytest.mark.parametrize("filename", ["corpus.arrow", "corpus.parquet"])
+def test_snapshot_round_trip(tmp_path, filename):
+    df = corpus()
+    path = str(tmp_path / filename)
+    write_snapshot(df, path)
+    table = read_snapshot(path)
+
+    matrix = vector_matrix(table, "combined_text_vector")
+    assert matrix.dtype == np.float32 and matrix.shape == (5, 768)
+    np.testing.assert_allclose(matrix, np.array(df["combined_text_vector"].tolist()), rtol=1e-6)
+    assert table_to_dataframe(table)["blog_tags"].tolist() == df["blog_tags"].tolist()
+
+
+def test_iter_documents_across_batches(tmp_path):
+    df = corpus(n=7)
+    path = str(tmp_path / "corpus.arrow")
+    write_snapshot(df, path)
+    docs = list(iter_documents(read_snapshot(path), batch_size=3))
+    assert [d["url"] for d in docs] == df["url"].tolist()
+    np.testing.assert_allclose(docs[5]["title_vector"], df["title_vector"][5], rtol=1e-6)
+
+
+def test_memory_mapped_vectors_are_not_copied(tmp_path):
+    path = str(tmp_path / "corpus.arrow")
+    write_snapshot(corpus(), path)
+    assert not vector_matrix(read_snapshot(path), "title_vector").flags.owndata
+
+
+def test_empty_corpus_round_trip(tmp_path):
+    path = str(tmp_path / "corpus.arrow")
+    write_snapshot(corpus(n=0), path)
+    table = read_snapshot(path)
+    assert table.num_rows == 0
+    assert table.schema.field("title_vector").type.list_size == 768
+    matrix = vector_matrix(table, "title_vector")
+    assert matrix.dtype == np.float32 and matrix.shape == (0, 768)
+    assert list(iter_documents(table)) == []
@@ -0,0 +1,75 @@
+import numpy as np
+import pytest
+from elasticsearch import BadRequestError, Elasticsearch
+from src.testing.stub_elasticsearch import StubElasticsearch, synthetic_searcher
+
+DIM = 8
+
+
+@pytest.fixture(scope="module")
+def es():
+    stub = StubElasticsearch(synthetic_searcher(50, DIM, ["salt", "sugar"], words_per_doc=20)).start()
+    yield stub, Elasticsearch(stub.url)
+    stub.stop()
+
+
+def query_vector():
+    return np.random.default_rng(1).standard_normal(DIM).tolist()
+
+
+def test_linear_combination_body(es):
+    stub, client = es
+    response = client.search(index="blog_posts_index", body={
+        "query": {"bool": {"must": {"multi_match": {"query": "salt", "fields": ["combined_text"], "boost": 0.5}},
+                           "filter": []}},
+        "knn": {"field": "combined_text_vector", "query_vector": query_vector(), "k": 5,
+                "num_candidates": 50, "boost": 0.5},
+        "size": 5,
+    })
+    hits = response["hits"]["hits"]
+    assert len(hits) == 5
+    assert {"url", "title", "combined_text"} <= set(hits[0]["_source"])
+    assert [hit["_score"] for hit in hits] == sorted((hit["_score"] for hit in hits), reverse=True)
+    assert stub.hits["/blog_posts_index/_search"] == 1
+
+
+def test_rrf_body(es):
+    _, client = es
+    response = client.search(index="blog_posts_index", body={
+        "query": {"multi_match": {"query": "sugar", "fields": ["combined_text"]}},
+        "knn": {"field": "combined_text_vector", "query_vector": query_vector(), "k": 3, "num_candidates": 50},
+        "rank": {"rrf": {"window_size": 50, "rank_constant": 20}},
+        "size": 3,
+    })
+    assert len(response["hits"]["hits"]) == 3
+
+
+def test_malformed_body_is_rejected(es):
+    _, client = es
+    with pytest.raises(BadRequestError):
+        client.search(index="blog_posts_index", body={"query": {"match_all": {}}})
+
+
+CATEGORY_FILTER = [{"terms": {"category": ["nutrition"]}}]
+
+
+@pytest.mark.parametrize("query_filter, knn_filter", [(CATEGORY_FILTER, []), ([], CATEGORY_FILTER)])
+def test_filtered_body_is_rejected(es, query_filter, knn_filter):
+    _, client = es
+    with pytest.raises(BadRequestError) as error:
+        client.search(index="blog_posts_index", body={
+            "query": {"bool": {"must": {"multi_match": {"query": "salt", "fields": ["combined_text"]}},
+                               "filter": query_filter}},
+            "knn": {"field": "combined_text_vector", "query_vector": query_vector(), "k": 3,
+                    "num_candidates": 50, "filter": knn_filter},
+            "size": 3,
+        })
+    assert "filtered searches" in error.value.body["error"]["reason"]
+
+
+def test_root_and_unsupported_routes(es):
+    stub, client = es
+    assert client.ping()
+    assert stub.handle("POST", "/", {}, None)[0] == 200
+    status, payload = stub.handle("PATCH", "/x/y/z/w", {}, None)
+    assert status == 404 and payload["error"] == "unsupported request PATCH /x/y/z/w"
@@ -0,0 +1,37 @@
+from src.scraper.url_extractor import extract_all_urls, filter_links, get_webpage_content
+
+
+def test_filter_links_drops_pagination_and_foreign_links():
+    root = "https://example.org/blog/"
+    links = [root + "post-1/", root + "page/2/", "https://other.org/post/"]
+    assert filter_links(links, root) == [root + "post-1/"]
+
+
+def test_extract_all_urls(stub_site, fast_fetcher):
+    urls = extract_all_urls(root=stub_site.root, fetcher=fast_fetcher())
+    assert sorted(urls) == sorted(stub_site.post_urls)
+
+
+def test_extract_all_urls_survives_throttling_and_failures(stub_site, fast_fetcher):
+    def fault(path, count):
+        if path == "/blog/page/2/" and count == 1:
+            return 429, {"Retry-After": "0.1"}
+        if count == 1:
+            return 503, {}
+        return None
+
+    stub_site.fault = fault
+    urls = extract_all_urls(root=stub_site.root, fetcher=fast_fetcher())
+    assert sorted(urls) == sorted(stub_site.post_urls)
+
+
+def test_extract_all_urls_skips_a_page_that_keeps_failing(stub_site, fast_fetcher):
+    stub_site.fault = lambda path, count: (500, {}) if path == "/blog/page/2/" else None
+    fetcher = fast_fetcher(max_retries=1, breaker_kwargs={"failure_threshold": 100})
+    urls = extract_all_urls(root=stub_site.root, fetcher=fetcher)
+    assert sorted(urls) == sorted(stub_site.post_urls[:5] + stub_site.post_urls[10:])
+
+
+def test_get_webpage_content_returns_none_on_http_error(stub_site, fast_fetcher):
+    assert get_webpage_content(stub_site.root + "missing/", fetcher=fast_fetcher()) is None
+    assert get_webpage_content(stub_site.post_urls[0], fetcher=fast_fetcher()).status_code == 200
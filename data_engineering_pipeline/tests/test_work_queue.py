@@ -0,0 +1,109 @@
+import threading
+import time
+from collections import Counter
+import pytest
+from src.db.work_queue import WorkQueue, DONE, FAILED, PENDING
+from src.main import run_worker
+from src.scraper.html_archive import HtmlArchive
+from src.testing.stub_mongo import SharedCollection
+
+mongomock = pytest.importorskip("mongomock")
+
+
+class CountingHandler:
+    """Stands in for MongoHandler and counts how often each post is written."""
+
+    def __init__(self):
+        self.writes = Counter()
+        self._lock = threading.Lock()
+
+    def upsert_blog_post(self, blog_content):
+        with self._lock:
+            self.writes[blog_content["url"]] += 1
+
+
+@pytest.fixture
+def queue():
+    return WorkQueue(SharedCollection(mongomock.MongoClient().db.crawl_queue, threading.Lock()))
+
+
+def test_enqueue_is_idempotent_and_requeues_changed_posts(queue):
+    lastmods = {"https://example.org/a/": "2023-01-01", "https://example.org/b/": "2023-01-01"}
+    assert queue.enqueue(lastmods) == 2
+    for _ in range(2):
+        queue.complete(queue.claim("w1")["_id"], "w1")
+    assert queue.enqueue(lastmods) == 0
+    assert queue.counts() == {DONE: 2}
+    assert queue.enqueue({**lastmods, "https://example.org/a/": "2024-01-01"}) == 0
+    assert queue.counts() == {DONE: 1, PENDING: 1}
+    assert queue.claim("w1")["_id"] == "https://example.org/a/"
+
+
+def test_each_url_is_claimed_once(queue):
+    urls = [f"https://example.org/post-{i}/" for i in range(50)]
+    queue.enqueue(dict.fromkeys(urls))
+    claimed, lock = [], threading.Lock()
+
+    def claim_all(worker_id):
+        while True:
+            job = queue.claim(worker_id)
+            if job is None:
+                return
+            with lock:
+                claimed.append(job["_id"])
+
+    threads = [threading.Thread(target=claim_all, args=(f"w{i}",)) for i in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert sorted(claimed) == sorted(urls)
+
+
+def test_expired_lease_is_reclaimed_and_stale_owner_cannot_finish(queue):
+    queue.enqueue({"https://example.org/a/": None})
+    job = queue.claim("crashed", lease_seconds=0.05)
+    assert queue.claim("w2") is None  # still leased
+    time.sleep(0.1)
+    reclaimed = queue.claim("w2")
+    assert reclaimed["_id"] == job["_id"] and reclaimed["attempts"] == 2
+    assert not queue.complete(job["_id"], "crashed")
+    assert queue.complete(job["_id"], "w2")
+    assert not queue.has_outstanding()
+
+
+def test_expired_lease_is_not_reclaimed_after_max_attempts(queue):
+    queue.enqueue({"https://example.org/poison/": None})
+    for attempt in range(queue.max_attempts):
+        assert queue.claim(f"w{attempt}", lease_seconds=0.02)["attempts"] == attempt + 1
+        time.sleep(0.05)  # the worker hangs or dies and its lease runs out
+    assert queue.claim("w-last") is None
+    assert not queue.has_outstanding()
+    assert queue.counts() == {FAILED: 1}
+
+
+def test_workers_drain_queue_against_stub_site(tmp_path, stub_site, fast_fetcher, queue):
+    queue.enqueue(dict.fromkeys(stub_site.post_urls))
+    handler = CountingHandler()
+    archive = HtmlArchive(str(tmp_path / "archive"))
+    threads = [
+        threading.Thread(target=run_worker, args=(handler, archive, queue, f"w{i}", fast_fetcher()),
+                         kwargs={"poll_interval": 0.01})
+        for i in range(3)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert handler.writes == Counter(dict.fromkeys(stub_site.post_urls, 1))
+    assert queue.counts() == {DONE: stub_site.n_posts}
+    assert len(HtmlArchive(str(tmp_path / "archive"))) == stub_site.n_posts
+
+
+def test_worker_waits_for_leases_held_by_others(tmp_path, stub_site, fast_fetcher, queue):
+    queue.enqueue({stub_site.post_urls[0]: None})
+    queue.claim("crashed", lease_seconds=0.2)
+    handler = CountingHandler()
+    run_worker(handler, HtmlArchive(str(tmp_path / "archive")), queue, "w1", fast_fetcher(), poll_interval=0.05)
+    assert handler.writes == Counter({stub_site.post_urls[0]: 1})
+    assert queue.counts() == {DONE: 1}